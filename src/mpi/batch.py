@@ -0,0 +1,265 @@
+"""
+Evaluate many left Riemann sums in one MPI job.
+
+A jobs file holds one integral per line, "expression, a, b, n", e.g.
+
+    x**2, 0, 1, 1000
+    atan2(x, 1), -1, 1, 50000
+    # blank lines and lines starting with # are skipped
+
+The expression is everything before the last three commas, so it may contain commas
+itself. Root reads the file and broadcasts the jobs once. The partitions of all jobs
+are laid end to end and split into one contiguous block per process, so every
+process gets the same number of function evaluations however unequal the jobs are.
+A process evaluates its share expression by expression, packing the pieces of many
+small jobs into one array so f is called once per chunk rather than once per job,
+and a single `comm.Reduce` of the per-job partial sums yields every integral.
+
+With a `vhpc.mpi.cache.ResultCache`, `integrate_jobs_cached` lets root answer the
+jobs computed by earlier runs and only broadcasts the others.
+
+Example:
+    >>> jobs = [Job("x**2", 0.0, 1.0, 1000), Job("2 * x", 0.0, 1.0, 10)]
+    >>> integrate_jobs(jobs, MPI.COMM_SELF).round(10).tolist()
+    [0.3328335, 0.9]
+
+Date: 10/18/2026
+Author: Djamil Lakhdar-Hamina
+
+"""
+
+from collections import defaultdict
+from pathlib import Path
+from typing import Callable, Iterable, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+from mpi4py import MPI
+
+from vhpc.mpi.cache import (
+    ResultCache,
+    cached_function_on_process,
+    integral_key,
+    normalized_expression,
+    riemann_rule,
+)
+from vhpc.mpi.partition import block_range
+from vhpc.mpi.riemann import BLOCK_SIZE, riemann_sum_left
+
+# how the partial sums are added, locally by riemann_sum_left and across processes
+# by a plain MPI.SUM, named in the cache keys
+SUMMATION = "naive"
+
+
+class Job(NamedTuple):
+    """
+    One integral: the left Riemann sum of expression over n partitions of [a, b].
+    """
+
+    expression: str
+    a: float
+    b: float
+    n: int
+
+
+def parse_job(line: str) -> Job:
+    """
+    Parses a line of a jobs file.
+
+    Parameters:
+    - line: "expression, a, b, n"
+
+    Returns:
+    The job
+    """
+    try:
+        expression, a, b, n = line.rsplit(",", 3)
+        job = Job(expression.strip(), float(a), float(b), int(n))
+    except ValueError as e:
+        raise ValueError(f"expected 'expression, a, b, n', got {line!r}") from e
+    if job.n < 1:
+        raise ValueError(f"partition number must be positive in {line!r}")
+    return job
+
+
+def read_jobs(path: "str | Path") -> List[Job]:
+    """
+    Reads a jobs file.
+
+    Parameters:
+    - path: the file, one "expression, a, b, n" per line
+
+    Returns:
+    The jobs in file order
+    """
+    with open(path) as file:
+        lines = (line.strip() for line in file)
+        return [parse_job(line) for line in lines if line and not line.startswith("#")]
+
+
+def write_results(
+    path: "str | Path", jobs: Iterable[Job], integrals: Iterable[float]
+) -> None:
+    """
+    Writes one "expression, a, b, n, integral" line per job.
+
+    Parameters:
+    - path: the output file
+    - jobs: the jobs
+    - integrals: their results, in the same order
+    """
+    with open(path, "w") as file:
+        for job, integral in zip(jobs, integrals, strict=True):
+            line = f"{job.expression}, {job.a!r}, {job.b!r}, {job.n}"
+            file.write(f"{line}, {float(integral)!r}\n")
+
+
+def job_segments(
+    counts: np.ndarray, offset: int, count: int
+) -> Iterable[Tuple[int, int, int]]:
+    """
+    Splits a range of the concatenated partitions of all jobs at job boundaries.
+
+    Parameters:
+    - counts: the partition number of every job
+    - offset: the first global partition of the range
+    - count: the length of the range
+
+    Returns:
+    A generator of (job index, first partition within the job, number of partitions)
+    """
+    ends = np.cumsum(counts)
+    job = int(np.searchsorted(ends, offset, side="right"))
+    stop = offset + count
+    while offset < stop:
+        job_start = int(ends[job] - counts[job])
+        end = min(stop, int(ends[job]))
+        yield job, offset - job_start, end - offset
+        offset = end
+        job += 1
+
+
+def left_sums(
+    f: Callable[[np.ndarray], np.ndarray],
+    start: np.ndarray,
+    delta_x: np.ndarray,
+    first: np.ndarray,
+    count: np.ndarray,
+    chunk_size: int = BLOCK_SIZE,
+) -> np.ndarray:
+    """
+    Left Riemann sums of one function over many pieces at once. Piece k covers the
+    points start[k] + i * delta_x[k] for first[k] <= i < first[k] + count[k]. Pieces
+    longer than chunk_size are streamed on their own; the others are packed together
+    into arrays of at most chunk_size points and f is called once per array.
+
+    Parameters:
+    - f: a function evaluated on whole arrays (see vhpc.mpi.integrand)
+    - start, delta_x, first, count: arrays describing the pieces
+    - chunk_size: the most points evaluated at a time
+
+    Returns:
+    The sum of each piece, times its delta_x
+    """
+    sums = np.zeros(len(count))
+    small = []
+    for k in range(len(count)):
+        if count[k] > chunk_size:
+            origin = start[k] + first[k] * delta_x[k]
+            sums[k] = riemann_sum_left(f, origin, delta_x[k], int(count[k]), chunk_size)
+        elif count[k] > 0:
+            small.append(k)
+
+    chunk: List[int] = []
+    points = 0
+    for k in small + [None]:
+        if k is None or points + count[k] > chunk_size:
+            if chunk:
+                piece = np.array(chunk)
+                c = count[piece]
+                owner = np.repeat(np.arange(len(piece)), c)
+                offsets = np.cumsum(c) - c
+                i = np.arange(points) - offsets[owner] + first[piece][owner]
+                x = start[piece][owner] + i * delta_x[piece][owner]
+                fx = np.asarray(f(x), dtype=float)
+                sums[piece] = np.add.reduceat(fx, offsets) * delta_x[piece]
+            chunk, points = [], 0
+        if k is not None:
+            chunk.append(k)
+            points += int(count[k])
+    return sums
+
+
+def integrate_jobs(
+    jobs: List[Job],
+    comm: "MPI.Comm",
+    root: int = 0,
+) -> Optional[np.ndarray]:
+    """
+    Computes the left Riemann sums of all jobs on the processes of comm. Every
+    process has to pass the same jobs, e.g. as broadcast from root.
+
+    Parameters:
+    - jobs: the integrals to compute
+    - comm: the communicator
+    - root: the process that receives the results
+
+    Returns:
+    On root, the integrals in job order; None elsewhere
+    """
+    counts = np.array([job.n for job in jobs], dtype=np.int64)
+    offset, count = block_range(int(counts.sum()), comm.Get_size(), comm.Get_rank())
+
+    # group this process's share by expression, so each integrand is compiled once
+    # (see vhpc.mpi.cache) and called for all of its pieces together
+    pieces = defaultdict(list)
+    for k, first, length in job_segments(counts, offset, count):
+        pieces[normalized_expression(jobs[k].expression)].append((k, first, length))
+
+    partial = np.zeros(len(jobs))
+    for expression, group in pieces.items():
+        f = cached_function_on_process(expression)
+        k, first, length = (np.array(column) for column in zip(*group))
+        a = np.array([jobs[j].a for j in k])
+        b = np.array([jobs[j].b for j in k])
+        delta_x = (b - a) / counts[k]
+        partial[k] = left_sums(f, a, delta_x, first, length)
+
+    integrals = np.empty(len(jobs)) if comm.Get_rank() == root else None
+    comm.Reduce(partial, integrals, op=MPI.SUM, root=root)
+    return integrals
+
+
+def integrate_jobs_cached(
+    jobs: Optional[List[Job]],
+    comm: "MPI.Comm",
+    cache: ResultCache,
+    root: int = 0,
+) -> Optional[np.ndarray]:
+    """
+    `integrate_jobs` behind a result cache. Root looks every job up and broadcasts
+    only the misses, so the other processes never see the jobs root can answer, and
+    stores the new results afterwards.
+
+    Parameters:
+    - jobs: the integrals to compute, only read on root
+    - comm: the communicator
+    - cache: the result cache, only used on root
+    - root: the process that holds the jobs and receives the results
+
+    Returns:
+    On root, the integrals in job order; None elsewhere
+    """
+    integrals = missing = None
+    if comm.Get_rank() == root:
+        rule = riemann_rule(SUMMATION)
+        keys = [integral_key(*job, rule=rule) for job in jobs]
+        cached = [cache.get(key) for key in keys]
+        missing = [k for k, value in enumerate(cached) if value is None]
+        integrals = np.array([np.nan if v is None else v for v in cached])
+    todo = comm.bcast(None if missing is None else [jobs[k] for k in missing], root)
+    computed = integrate_jobs(todo, comm, root) if todo else np.empty(0)
+    if comm.Get_rank() == root:
+        for k, value in zip(missing, computed, strict=True):
+            integrals[k] = value
+            cache.put(keys[k], value, rule=rule, **jobs[k]._asdict())
+    return integrals
@@ -0,0 +1,110 @@
+"""
+A bounded pool of reusable NumPy buffers.
+
+The asynchronous collectives allocate a receive buffer with `np.empty` on every call.
+For a loop that exchanges the same shapes over and over, a `BufferPool` hands the
+same memory back instead: buffers are kept per (shape, dtype) and, once the pool
+holds more than `capacity` bytes, the buffers of the least recently used key are
+dropped first.
+
+Example:
+    >>> pool = BufferPool(capacity=1 << 20)
+    >>> buf = pool.acquire((4,), "f8")
+    >>> pool.release(buf)
+    >>> pool.acquire((4,), "f8") is buf
+    True
+
+Date: 10/18/2026
+Author: Djamil Lakhdar-Hamina
+
+"""
+
+from collections import OrderedDict
+from typing import List, Optional, Tuple, Type
+
+import numpy as np
+
+
+class BufferPool:
+    """
+    Free lists of NumPy buffers keyed by (shape, dtype) with LRU eviction.
+    """
+
+    def __init__(self, capacity: int = 1 << 28):
+        """
+        Parameters:
+        - capacity: the number of bytes the pool may hold on to, 256 MiB by default
+        """
+        self.capacity = capacity
+        self.nbytes = 0
+        self.free: "OrderedDict[Tuple, List[np.ndarray]]" = OrderedDict()
+
+    @staticmethod
+    def key(shape: int | Tuple[int, ...], dtype: Type) -> Tuple:
+        return (tuple(np.atleast_1d(shape).tolist()), np.dtype(dtype))
+
+    def acquire(self, shape: int | Tuple[int, ...], dtype: Type) -> np.ndarray:
+        """
+        Hands out an uninitialised buffer, reusing a released one if possible.
+
+        Parameters:
+        - shape: the shape of the buffer
+        - dtype: the NumPy dtype of the buffer
+
+        Returns:
+        A C-contiguous array that belongs to the caller until it is released
+        """
+        key = self.key(shape, dtype)
+        buffers = self.free.get(key)
+        if buffers:
+            buf = buffers.pop()
+            self.nbytes -= buf.nbytes
+            self.free.move_to_end(key)
+            return buf
+        return np.empty(key[0], dtype=key[1])
+
+    def release(self, buf: np.ndarray) -> None:
+        """
+        Returns a buffer obtained from `acquire` to the pool. The caller must not use
+        it afterwards.
+
+        Parameters:
+        - buf: the buffer to recycle
+        """
+        if buf.nbytes > self.capacity:
+            return
+        key = self.key(buf.shape, buf.dtype)
+        self.free.setdefault(key, []).append(buf)
+        self.free.move_to_end(key)
+        self.nbytes += buf.nbytes
+        while self.nbytes > self.capacity:
+            lru_key, buffers = next(iter(self.free.items()))
+            self.nbytes -= buffers.pop(0).nbytes
+            if not buffers:
+                del self.free[lru_key]
+
+    def clear(self) -> None:
+        """
+        Drops every pooled buffer.
+        """
+        self.free.clear()
+        self.nbytes = 0
+
+
+def allocate(
+    shape: int | Tuple[int, ...], dtype: Type, pool: Optional[BufferPool] = None
+) -> np.ndarray:
+    """
+    `np.empty` that draws from pool when one is given.
+
+    Parameters:
+    - shape: the shape of the buffer
+    - dtype: the NumPy dtype of the buffer
+    - pool: the pool to draw from, or None for a fresh allocation
+
+    Returns:
+    An uninitialised C-contiguous array
+    """
+    if pool is None:
+        return np.empty(shape, dtype=dtype)
+    return pool.acquire(shape, dtype)
@@ -0,0 +1,225 @@
+"""
+Memoisation of compiled integrands and computed integrals.
+
+Parameter sweeps keep revisiting the same (expression, interval, n) configurations,
+and every run used to exec the expression again on every process and recompute the
+integral from scratch. Two caches avoid that:
+
+- `cached_function_on_process` keeps the compiled callables in memory, keyed by the
+  normalised expression, so "x**2" and "x ** 2" are compiled once per process;
+- `ResultCache` stores computed integrals on disk under a content address, a hash
+  of (normalised expression AST, a, b, n, rule), and evicts the least recently used
+  entries once the directory grows beyond a size budget.
+
+Root looks results up before anything is broadcast, so a hit is answered without
+the other processes evaluating anything. The directory defaults to
+~/.cache/vhpc/integrals; set VHPC_INTEGRAL_CACHE to move it.
+
+Example:
+    >>> cache = ResultCache(tempfile.mkdtemp())
+    >>> key = integral_key("x**2", 0.0, 1.0, 1000)
+    >>> key == integral_key("x ** 2", 0, 1, 1000), cache.get(key)
+    (True, None)
+    >>> cache.put(key, 0.3328335)
+    >>> cache.get(key)
+    0.3328335
+
+Date: 10/18/2026
+Author: Djamil Lakhdar-Hamina
+
+"""
+
+import ast
+import hashlib
+import json
+import os
+import tempfile
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable, Optional
+
+from vhpc.mpi.integrand import create_function_on_process
+
+# bump when the meaning of a stored result changes so stale entries are not used
+CACHE_VERSION = 1
+
+# the disk budget of the result cache, 64 MiB
+DEFAULT_CAPACITY = 64 << 20
+
+# the number of compiled integrands kept per process
+COMPILED_CACHE_SIZE = 256
+
+
+def cache_dir() -> Path:
+    """
+    The directory holding the cached integrals.
+
+    Returns:
+    $VHPC_INTEGRAL_CACHE if set, ~/.cache/vhpc/integrals otherwise
+    """
+    default = Path.home() / ".cache" / "vhpc" / "integrals"
+    return Path(os.environ.get("VHPC_INTEGRAL_CACHE", default))
+
+
+def normalized_expression(function_string: str) -> str:
+    """
+    The expression reformatted from its syntax tree, so spelling differences that do
+    not change its meaning (whitespace, redundant parentheses) disappear.
+
+    Parameters:
+    - function_string: string or body of function
+
+    Returns:
+    The canonical source of the expression
+    """
+    return ast.unparse(ast.parse(function_string.strip(), mode="eval"))
+
+
+def integral_key(
+    function_string: str, a: float, b: float, n: int, rule: str = "left"
+) -> str:
+    """
+    The content address of an integral.
+
+    Parameters:
+    - function_string: string or body of function
+    - a: the lower limit
+    - b: the upper limit
+    - n: the partition number
+    - rule: the quadrature rule and any option that changes the result
+
+    Returns:
+    A hex digest naming the cache entry
+    """
+    tree = ast.dump(ast.parse(function_string.strip(), mode="eval"))
+    payload = f"{CACHE_VERSION}:{tree}:{float(a)!r}:{float(b)!r}:{int(n)}:{rule}"
+    return hashlib.sha256(payload.encode()).hexdigest()[:32]
+
+
+def riemann_rule(summation: str = "naive", jit: bool = False) -> str:
+    """
+    The rule of a left Riemann sum in `integral_key`, naming every option that
+    changes the result, so every program computing the same sum the same way finds
+    the results of the others.
+
+    Parameters:
+    - summation: how the partial sums are added (see vhpc.mpi.summation)
+    - jit: whether the sum is computed by the Numba kernel (see vhpc.mpi.jit)
+
+    Returns:
+    The rule, e.g. "left:naive" or "left:jit:neumaier"
+    """
+    engine = "jit:" if jit else ""
+    return f"left:{engine}{summation}"
+
+
+@lru_cache(maxsize=COMPILED_CACHE_SIZE)
+def _compiled_function(normalized: str) -> Callable:
+    return create_function_on_process(normalized)
+
+
+def cached_function_on_process(function_string: str) -> Callable:
+    """
+    `create_function_on_process`, compiled once per process and normalised
+    expression.
+
+    Parameters:
+    - function_string: string or body of function
+
+    Returns:
+    The function with body given, taking and returning float arrays
+    """
+    return _compiled_function(normalized_expression(function_string))
+
+
+class ResultCache:
+    """
+    Integrals on disk, one small JSON file per key, with least-recently-used
+    eviction once the files take more than capacity bytes. A hit refreshes the
+    entry's modification time, which is what eviction orders by, so the cache can
+    be shared by several runs (and nodes, on a shared file system) without any
+    index file to keep consistent.
+    """
+
+    def __init__(
+        self, directory: "str | Path | None" = None, capacity: int = DEFAULT_CAPACITY
+    ):
+        self.directory = Path(directory) if directory is not None else cache_dir()
+        self.capacity = capacity
+        # bytes on disk as of the last scan plus what was written since, so a put
+        # only rescans the directory when the budget may have been exceeded
+        self._size: Optional[int] = None
+
+    def path(self, key: str) -> Path:
+        """
+        The file of an entry.
+        """
+        return self.directory / f"{key}.json"
+
+    def get(self, key: str) -> Optional[float]:
+        """
+        Parameters:
+        - key: from `integral_key`
+
+        Returns:
+        The cached integral, or None on a miss
+        """
+        path = self.path(key)
+        try:
+            with open(path) as file:
+                integral = float(json.load(file)["integral"])
+            os.utime(path)
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+        return integral
+
+    def put(self, key: str, integral: float, **description) -> None:
+        """
+        Stores an integral, then evicts old entries if the cache is over capacity.
+        The file is written to a temporary name and renamed, so a reader never
+        sees half an entry.
+
+        Parameters:
+        - key: from `integral_key`
+        - integral: the value to store
+        - description: anything worth keeping next to it, e.g. the expression
+        """
+        self.directory.mkdir(parents=True, exist_ok=True)
+        entry = dict(description, integral=float(integral))
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "w") as file:
+            json.dump(entry, file)
+        os.replace(tmp, self.path(key))
+        if self._size is None:
+            self.evict()
+        else:
+            self._size += self.path(key).stat().st_size
+            if self._size > self.capacity:
+                self.evict()
+
+    def evict(self) -> None:
+        """
+        Removes least recently used entries until the cache fits its capacity.
+        """
+        entries = []
+        for path in self.directory.glob("*.json"):
+            try:
+                stat = path.stat()
+            except OSError:  # removed by another process meanwhile
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        size = sum(entry[1] for entry in entries)
+        for _, entry_size, path in sorted(entries):
+            if size <= self.capacity:
+                break
+            path.unlink(missing_ok=True)
+            size -= entry_size
+        self._size = size
+
+    def clear(self) -> None:
+        """
+        Removes every entry.
+        """
+        for path in self.directory.glob("*.json"):
+            path.unlink(missing_ok=True)
+        self._size = 0
@@ -0,0 +1,159 @@
+"""
+Distribute arrays whose length does not divide the number of processes.
+
+`Scatter`/`Gather` need the same count on every rank, which is why the examples
+used to abort when n % size != 0. The helpers here derive counts and displacements
+from the block layout in `vhpc.mpi.partition` (the first n % size ranks get one
+extra element) and use `Scatterv`/`Gatherv`, so any problem size runs on any number
+of processes with a load imbalance of at most one element.
+
+Usage:
+    x_local = scatterv(x if rank == 0 else None, n, float, comm)
+    result = gatherv(2 * x_local, n, comm)  # the array 2 * x on rank 0
+
+Date: 10/18/2026
+Author: Djamil Lakhdar-Hamina
+
+"""
+
+from typing import List, Optional, Tuple, Type
+
+import numpy as np
+from mpi4py import MPI
+from mpi4py.util import dtlib
+
+from vhpc.mpi.partition import block_counts, block_range, displacements
+
+
+def block_layout(n: int, comm: "MPI.Comm") -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Counts and displacements of the block layout of n elements over comm.
+
+    Parameters:
+    - n: total number of elements
+    - comm: the communicator the elements are spread over
+
+    Returns:
+    A tuple (counts, displacements) of int arrays of length comm.Get_size()
+    """
+    counts = block_counts(n, comm.Get_size())
+    return counts, displacements(counts)
+
+
+def scatterv(
+    sendbuf: Optional[np.ndarray],
+    n: int,
+    dtype: Type,
+    comm: "MPI.Comm",
+    root: int = 0,
+) -> np.ndarray:
+    """
+    Scatters the n elements of sendbuf from root in contiguous blocks whose sizes
+    differ by at most one.
+
+    Parameters:
+    - sendbuf: contiguous array of n elements on root, ignored elsewhere
+    - n: total number of elements, known on every rank
+    - dtype: NumPy dtype of the elements
+    - comm: the communicator to scatter over
+    - root: the rank holding sendbuf
+
+    Returns:
+    The block owned by the calling rank
+    """
+    counts, displs = block_layout(n, comm)
+    mpi_dtype = dtlib.from_numpy_dtype(dtype)
+    recvbuf = np.empty(counts[comm.Get_rank()], dtype=dtype)
+    if comm.Get_rank() == root:
+        sendspec = [sendbuf, counts, displs, mpi_dtype]
+    else:
+        sendspec = None
+    comm.Scatterv(sendspec, [recvbuf, mpi_dtype], root=root)
+    return recvbuf
+
+
+def gatherv(
+    sendbuf: np.ndarray, n: int, comm: "MPI.Comm", root: int = 0
+) -> Optional[np.ndarray]:
+    """
+    Gathers the blocks produced by `scatterv` back into one array on root.
+
+    Parameters:
+    - sendbuf: the block owned by the calling rank
+    - n: total number of elements, known on every rank
+    - comm: the communicator to gather over
+    - root: the rank receiving the result
+
+    Returns:
+    The assembled array of n elements on root, None elsewhere
+    """
+    counts, displs = block_layout(n, comm)
+    mpi_dtype = dtlib.from_numpy_dtype(sendbuf.dtype)
+    if comm.Get_rank() == root:
+        recvbuf = np.empty(n, dtype=sendbuf.dtype)
+        recvspec = [recvbuf, counts, displs, mpi_dtype]
+    else:
+        recvbuf = recvspec = None
+    comm.Gatherv([sendbuf, mpi_dtype], recvspec, root=root)
+    return recvbuf
+
+
+def block_interval(
+    a: float, b: float, n: int, comm: "MPI.Comm"
+) -> Tuple[float, float, int]:
+    """
+    The calling rank's share of the interval [a, b] cut into n equal partitions.
+    The subinterval endpoints lie on the global grid a + i * (b - a) / n, so the
+    local sums add up to exactly the serial Riemann sum.
+
+    Parameters:
+    - a: start of the interval
+    - b: end of the interval
+    - n: total number of partitions
+    - comm: the communicator the partitions are spread over
+
+    Returns:
+    A tuple (start, end, number of partitions) for the calling rank
+    """
+    offset, count = block_range(n, comm.Get_size(), comm.Get_rank())
+    delta_x = (b - a) / n if n else 0.0
+    return a + offset * delta_x, a + (offset + count) * delta_x, count
+
+
+def binomial_tree(
+    rank: int, size: int, root: int = 0
+) -> Tuple[Optional[int], List[int]]:
+    """
+    The neighbours of rank in the binomial tree over size processes rooted at root.
+    With ranks renumbered relative to the root, a process's parent is the process
+    that differs from it in its lowest set bit, and its children are the processes
+    it reaches by setting one of the bits below that one.
+
+    Parameters:
+    - rank: the process
+    - size: the number of processes
+    - root: the root of the tree
+
+    Returns:
+    A tuple (parent, children), parent None on the root and the children largest
+    subtree first
+
+    Example:
+        >>> [binomial_tree(r, 8) for r in (0, 4, 6)]
+        [(None, [4, 2, 1]), (0, [6, 5]), (4, [7])]
+    """
+    vrank = (rank - root) % size
+    parent = None
+    mask = 1
+    while mask < size:
+        if vrank & mask:
+            parent = (vrank - mask + root) % size
+            break
+        mask <<= 1
+    children = []
+    mask >>= 1
+    while mask > 0:
+        if vrank + mask < size:
+            children.append((vrank + mask + root) % size)
+        mask >>= 1
+    return parent, children
@@ -0,0 +1,79 @@
+"""
+Compute the left Riemann sums of a whole file of integrals in one MPI job, instead
+of starting `mpirun` once per integral.
+
+Each line of the jobs file is "expression, a, b, n"; root reads it and broadcasts
+the jobs, the partitions of all jobs are shared out evenly among the processes and a
+single reduce collects every integral (see vhpc.mpi.batch). Root writes one
+"expression, a, b, n, integral" line per job to the output file. With --cache the
+results are also kept on disk, and jobs computed by an earlier run are answered by
+root from the cache without being sent to the other processes (see
+vhpc.mpi.cache).
+
+Usage:
+    mpirun -n 4 python numpy_riemann_sum_batch.py jobs.txt -o integrals.txt
+
+Date: 10/18/2026
+Author: Djamil Lakhdar-Hamina
+
+"""
+
+import argparse
+
+from mpi4py import MPI
+
+from vhpc.mpi.batch import (
+    integrate_jobs,
+    integrate_jobs_cached,
+    read_jobs,
+    write_results,
+)
+from vhpc.mpi.cache import ResultCache
+
+
+def parse_args() -> argparse.Namespace:
+    """
+    Parses the command line.
+
+    Returns:
+    The options, `jobs` is the jobs file, `output` the results file and `cache` is
+    set when results should be looked up in and added to the result cache
+    """
+    parser = argparse.ArgumentParser(description="left Riemann sums of many jobs")
+    parser.add_argument("jobs", help="file of 'expression, a, b, n' lines")
+    parser.add_argument(
+        "-o", "--output", default="integrals.txt", help="file the results go to"
+    )
+    parser.add_argument(
+        "--cache",
+        action="store_true",
+        help="reuse results of earlier runs, kept in $VHPC_INTEGRAL_CACHE",
+    )
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    root = 0
+    comm = MPI.COMM_WORLD
+    rank = comm.Get_rank()
+
+    jobs = read_jobs(args.jobs) if rank == root else None
+
+    start = MPI.Wtime()
+    if args.cache:
+        integrals = integrate_jobs_cached(jobs, comm, ResultCache(), root)
+    else:
+        jobs = comm.bcast(jobs, root=root)
+        integrals = integrate_jobs(jobs, comm, root)
+    elapsed = MPI.Wtime() - start
+
+    if rank == root:
+        write_results(args.output, jobs, integrals)
+        print(f"{len(jobs)} integrals written to {args.output} in {elapsed:.4f}s")
+
+    return integrals
+
+
+if __name__ == "__main__":
+    main()
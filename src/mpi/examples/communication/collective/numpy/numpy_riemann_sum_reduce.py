@@ -1,104 +1,123 @@
 """
 Implement left-handed riemann sum using NumPy.
 
+Pass --summation pairwise or --summation neumaier to add the partial sums with less
+rounding error than plain addition; with neumaier every process sends its partial sum
+as a (sum, compensation) pair that is reduced with a user-defined MPI.Op (see
+vhpc.mpi.summation).
+
+Pass --cache to keep results on disk: root looks the integral up before anything is
+sent to the other processes, and on a hit answers it without them evaluating f (see
+vhpc.mpi.cache).
+
 Date: 05/22/2024
 Author: Djamil Lakhdar-Hamina
 
 """
 
+import argparse
 from typing import Callable, Type
 
 import numpy as np
 from mpi4py import MPI
 
+from vhpc.mpi.cache import (
+    ResultCache,
+    cached_function_on_process,
+    integral_key,
+    riemann_rule,
+)
+from vhpc.mpi.distribution import block_interval
+from vhpc.mpi.integrand import create_function_string_from_user_input
+from vhpc.mpi.jit import riemann_kernel_on_processes, riemann_parser
+from vhpc.mpi.riemann import riemann_sum_left as streaming_riemann_sum_left
+from vhpc.mpi.riemann import riemann_sum_left_pair
+from vhpc.mpi.summation import PAIR, SUMMATION_MODES, neumaier_op, resolve
 
-def is_single_line(expression: str) -> bool:
+
+def riemann_sum_left(
+    f: Callable[[np.ndarray], np.ndarray],
+    interval: tuple,
+    n: int,
+    dtype: Type = float,
+    summation: str = "naive",
+) -> np.ndarray:
     """
-    Takes a string expression and checks if the string is one-line by counting
-    /n (newline) characters.
+    Takes function f, an interval (a,b) defined as a tuple, and a partition number n
+    and approximates the integral of f on [a,b]
 
     Parameters:
-    - expression: the function body in string form
+    - f: function
+    - interval: interval (a,b) where b>a
+    - n : partition number, how many rectangles to approximate integral
+    - summation: "naive", "pairwise" or "neumaier" (see vhpc.mpi.summation)
 
     Returns:
-    A boolean indicating if function body is single-lined (true)
-
-    """
-    # Count the number of newline characters
-    newline_count = expression.count("\n")
-    # Return True if there is only one newline character, False otherwise
-    return newline_count == 0
-
-
-def create_function_string_from_user_input() -> str:
-    """
-    Dynamically create a single-lined function string from user input.
+    integral, the result of integration process, "area under the curve".
 
-    Parameters:
+    Example:
 
-    Returns:
-    A single-lined function of form f(x): return expression
+    Notes:
+    - The points are generated and reduced in fixed-size blocks, so memory stays
+    constant however large n is (see vhpc.mpi.riemann).
     """
-    # Get a string from the user
-    print("Enter a single-lined function body: ")
-    function_string = input()
-    # Check that string is well-formed
-    assert is_single_line(function_string)
-    # Execute code while making sure that scope of f is not just in exec bloc
-    return function_string
+    a = interval[0]
+    b = interval[1]
+    delta_x = (b - a) / n if n else 0.0
+    integral = streaming_riemann_sum_left(f, a, delta_x, n, summation=summation)
+    return np.array(integral, dtype=dtype)
 
 
-def create_function_on_process(function_string: str) -> Callable:
+def cache_rule(args: argparse.Namespace) -> str:
     """
-    Compiles a function from a function string on a process.
+    The rule results are cached under, naming every option that changes the result:
+    the summation mode applies with --jit too, since the partial sums are still
+    reduced through it.
 
     Parameters:
-    - function_string: string or body of function
+    - args: the options from `parse_args`
 
     Returns:
-    The function with body given
-
+    The rule, e.g. "left:jit:neumaier"
     """
-    locals_dict = {}
-    exec(f"def f(x): return {function_string}", {}, locals_dict)
-    return locals_dict["f"]
+    return riemann_rule(args.summation, args.jit)
 
 
-def riemann_sum_left(
-    f: Callable[[float, int], float], interval: tuple, n: int, dtype: Type = float
-) -> np.ndarray:
+def parse_args() -> argparse.Namespace:
     """
-    Takes function f, an interval (a,b) defined as a tuple, and a partition number n
-    and approximates the integral of f on [a,b]
-
-    Parameters:
-    - f: function
-    - interval: interval (a,b) where b>a
-    - n : partition number, how many rectangles to approximate integral
+    Parses the command line.
 
     Returns:
-    integral, the result of integration process, "area under the curve".
-
-    Example:
+    The options, `jit` is set when the integrand and the summation loop should be
+    compiled with Numba (see vhpc.mpi.jit), `summation` is how partial sums are added
+    (see vhpc.mpi.summation) and `cache` is set when the result should be looked up
+    in and added to the result cache (see vhpc.mpi.cache)
     """
-    a = interval[0]
-    b = interval[1]
-    delta_x = (b - a) / n
-    x = np.arange(a, b, delta_x)
-    integral = sum(f(x) * delta_x)
-    return np.array(integral, dtype=dtype)
+    parser = riemann_parser()
+    parser.add_argument(
+        "--summation",
+        choices=SUMMATION_MODES,
+        default="naive",
+        help="how partial sums are added, locally and across processes",
+    )
+    parser.add_argument(
+        "--cache",
+        action="store_true",
+        help="reuse results of earlier runs, kept in $VHPC_INTEGRAL_CACHE",
+    )
+    return parser.parse_args()
 
 
 def main():
+    args = parse_args()
     root = 0
     comm = MPI.COMM_WORLD
     rank = comm.Get_rank()
-    size = comm.Get_size()
     global_sum = np.empty(1, dtype=float)
     if rank == 0:
         # Define function on root process
         function_string = create_function_string_from_user_input()
-        f = create_function_on_process(function_string)
+        f = cached_function_on_process(function_string)
         # Check that it was "compiled"
         assert callable(f)
 
@@ -114,11 +133,6 @@ end of interval, and partition number: """
 
         # Check that user inputs fulfill conditions
         try:
-            if info[2] % size != 0:
-                raise ValueError(
-                    "Number of partitions \
-isn't evenly split between processes"
-                )
             if info[0] >= info[1]:
                 raise ValueError(
                     "The lower limit of the interval\
@@ -126,31 +140,61 @@ isn't evenly split between processes"
                 )
         except ValueError as e:
             print(e)
+
+        rule = cache_rule(args)
+        key = integral_key(function_string, info[0], info[1], int(info[2]), rule)
+        cache = ResultCache() if args.cache else None
+        cached = cache.get(key) if cache else None
     else:
         info = np.empty(3, dtype=float)
-        function_string = None
+        function_string = cached = None
 
     comm.Bcast([info, MPI.FLOAT], root=0)
-    function_string = comm.bcast(function_string, root=0)
+    function_string, cached = comm.bcast((function_string, cached), root=0)
+    if cached is not None:
+        # a hit is answered by root alone, the others have nothing to evaluate
+        global_sum[0] = cached
+        if rank == 0:
+            print("the global sum is:", global_sum[0], "(cached)")
+        return global_sum
     a, b, n = info
     if rank != 0:
-        f = create_function_on_process(function_string)
-
-    # use rank number to create a interval in tuple form
-    partition_size = (b - a) / size
-    partition_number = n // size
-    local_interval = (
-        a + rank * partition_size,
-        a + (rank + 1) * partition_size,
-    )
-    local_sum = riemann_sum_left(f, local_interval, partition_number)
-    # we use a double to allow for greater precision otherwise overflow can happen
-    comm.Reduce(
-        [local_sum, MPI.DOUBLE], [global_sum, MPI.DOUBLE], op=MPI.SUM, root=root
-    )
+        f = cached_function_on_process(function_string)
+
+    # use rank number to create a interval in tuple form, the partition counts of
+    # the processes differ by at most one so n need not divide the process count
+    start, end, partition_number = block_interval(a, b, int(n), comm)
+    # the global width, a process may have no partitions to derive it from
+    delta_x = (b - a) / n if n else 0.0
+    if args.jit:
+        kernel = riemann_kernel_on_processes(function_string, comm)
+        local_pair = (kernel(start, delta_x, partition_number), 0.0)
+    elif args.summation == "neumaier":
+        local_pair = riemann_sum_left_pair(f, start, delta_x, partition_number)
+    else:
+        local_sum = streaming_riemann_sum_left(
+            f, start, delta_x, partition_number, summation=args.summation
+        )
+        local_pair = (float(local_sum), 0.0)
+
+    if args.summation == "neumaier":
+        # the compensations travel with the sums and are added in by neumaier_op
+        local_sum = np.array(local_pair, dtype=float)
+        global_pair = np.empty(2, dtype=float)
+        comm.Reduce([local_sum, PAIR], [global_pair, PAIR], op=neumaier_op(), root=root)
+        global_sum[0] = resolve(global_pair)
+    else:
+        # we use a double to allow for greater precision otherwise overflow can happen
+        local_sum = np.array(resolve(local_pair))
+        comm.Reduce(
+            [local_sum, MPI.DOUBLE], [global_sum, MPI.DOUBLE], op=MPI.SUM, root=root
+        )
 
     if rank == 0:
         print("the global sum is:", global_sum[0])
+        if cache:
+            description = dict(expression=function_string, a=a, b=b, n=int(n))
+            cache.put(key, global_sum[0], rule=rule, **description)
 
     return global_sum
 
@@ -5,24 +5,10 @@ Date: 05/22/2024
 Author: Djamil Lakhdar-Hamin
 """
 
-from itertools import islice
-
 import numpy as np
 from mpi4py import MPI
 
-
-def part_gen(iterable: iter, n: int) -> list[list]:
-    # batched('ABCDEFG', 3) → ABC DEF G
-    if n < 1:
-        raise ValueError("n must be at least one")
-    it = iter(iterable)
-    while batch := list(islice(it, n)):
-        yield batch
-
-
-def partition(iterable: iter, n: int) -> list[list]:
-    "partition an iterable into chunks of n size"
-    return np.array(list(part_gen(iterable, n)))
+from vhpc.mpi.distribution import gatherv, scatterv
 
 
 def main():
@@ -30,50 +16,30 @@ def main():
 
     comm = MPI.COMM_WORLD
     rank = comm.Get_rank()
-    size = comm.Get_size()
 
     if rank == 0:
         print("input vector length:")
         n = int(input())
-        chunk = n // (size)
-        info = np.array([n, chunk], dtype=int)
-        print(f"number elements per process: {chunk}")
-        try:
-            if n % size != 0:
-                raise ValueError(
-                    "The values are not evenly partitioned between n workers\
-processors"
-                )
-        except ValueError as e:
-            print(e)
-            comm.Abort()
+        info = np.array([n], dtype=int)
         # define 2 random vectors
         x, y = np.random.rand(n), np.random.rand(n)
-        partitions = np.array(partition(x, chunk), dtype=float), np.array(
-            partition(y, chunk), dtype=float
-        )
-        # split each vector into p chunks of n size
-        sendbuf = np.array(
-            [np.concatenate((part_x, part_y)) for (part_x, part_y) in zip(*partitions)]
-        )
-        print(f"split it up and concatenated, sendbuf is : \n {sendbuf}\n")
     else:
-        info = np.zeros(2, dtype=int)
-        sendbuf = None
-
-    comm.Bcast([info, MPI.INT], root=0)
-    n, chunk = info
-    recvbuf = np.zeros(chunk * 2, dtype=float)
-
-    comm.Scatter([sendbuf, MPI.FLOAT], [recvbuf, MPI.FLOAT], root=ROOT)
-    midpoint = len(recvbuf) // 2
-    local_sum = recvbuf[:midpoint] + recvbuf[midpoint:]
-
-    finalrecvbuf = np.zeros((size, chunk))
-    comm.Gather([local_sum, MPI.FLOAT], [finalrecvbuf, MPI.FLOAT], root=ROOT)
+        info = np.zeros(1, dtype=int)
+        x = y = None
+
+    comm.Bcast([info, MPI.INT64_T], root=ROOT)
+    n = int(info[0])
+    # the vectors are scattered straight from their own memory, n need not divide
+    # the number of processes: block sizes differ by at most one element
+    local_x = scatterv(x, n, float, comm, root=ROOT)
+    local_y = scatterv(y, n, float, comm, root=ROOT)
+    print(f"process {rank} holds {len(local_x)} elements")
+    local_sum = local_x + local_y
+
+    finalrecvbuf = gatherv(local_sum, n, comm, root=ROOT)
     if rank == 0:
-        print(f" {x} + {y} = {finalrecvbuf.flatten()}")
-        assert np.all(x + y == finalrecvbuf.flatten())
+        print(f" {x} + {y} = {finalrecvbuf}")
+        assert np.all(x + y == finalrecvbuf)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,117 @@
+"""
+Multiply two n x n matrices with SUMMA on a 2D grid of processes (see
+vhpc.mpi.summa).
+
+Unlike matrix_multiplication_all_gather.py, which needs one process per row and
+leaves the whole product on every process, any n and any number of processes work
+and each process holds O(n^2 / p) of the matrices. By default every process fills
+its own blocks of A and B with random numbers, so no process ever holds a whole
+matrix; with --check root generates A and B, scatters them, gathers C and compares
+it with NumPy's product.
+
+Usage:
+    mpirun -n 4 python summa_matrix_multiplication.py --size 2000
+    mpirun -n 6 python summa_matrix_multiplication.py --size 301 --check
+
+Date: 10/18/2026
+Author: Djamil Lakhdar-Hamina
+
+"""
+
+import argparse
+
+import numpy as np
+from mpi4py import MPI
+
+from vhpc.mpi.summa import (
+    Grid,
+    create_grid,
+    free_grid,
+    gather_blocks,
+    padded_shape,
+    scatter_blocks,
+    summa,
+)
+
+
+def zero_padding(block: np.ndarray, grid: Grid, n: int) -> np.ndarray:
+    """
+    Zeroes the rows and columns of a process's block that lie beyond the n x n
+    matrix. The padded columns of A and rows of B enter every entry of C, so they
+    have to be zero for the product to be that of the n x n matrices.
+
+    Parameters:
+    - block: the calling process's block of a padded matrix
+    - grid: the process grid, whose coordinates place the block
+    - n: the order of the unpadded matrix
+
+    Returns:
+    block
+    """
+    rows, cols = block.shape
+    r, c = grid.coords
+    block[max(0, n - r * rows) :, :] = 0
+    block[:, max(0, n - c * cols) :] = 0
+    return block
+
+
+def parse_args() -> argparse.Namespace:
+    """
+    Parses the command line.
+
+    Returns:
+    The options, `size` the order of the matrices and `check` set when the product
+    should be verified on root
+    """
+    parser = argparse.ArgumentParser(description="SUMMA matrix multiplication")
+    parser.add_argument("--size", type=int, default=1000)
+    parser.add_argument(
+        "--check", action="store_true", help="compare the product with numpy's"
+    )
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    root = 0
+    comm = MPI.COMM_WORLD
+    rank = comm.Get_rank()
+    n = args.size
+
+    grid = create_grid(comm)
+    M, K, N = padded_shape(n, n, n, grid.dims)
+    pr, pc = grid.dims
+    if args.check:
+        rng = np.random.default_rng(0)
+        A = rng.random((n, n)) if rank == root else None
+        B = rng.random((n, n)) if rank == root else None
+        A_block = scatter_blocks(A, grid, (M, K), root=root)
+        B_block = scatter_blocks(B, grid, (K, N), root=root)
+    else:
+        rng = np.random.default_rng(rank)
+        A_block = zero_padding(rng.random((M // pr, K // pc)), grid, n)
+        B_block = zero_padding(rng.random((K // pr, N // pc)), grid, n)
+
+    comm.Barrier()
+    start = MPI.Wtime()
+    C_block = summa(A_block, B_block, grid)
+    comm.Barrier()
+    elapsed = MPI.Wtime() - start
+
+    C = None
+    if args.check:
+        C = gather_blocks(C_block, grid, (n, n), root=root)
+        if rank == root:
+            assert np.allclose(C, A @ B)
+    if rank == root:
+        print(
+            f"{n}x{n} product on a {pr}x{pc} grid in {elapsed:.4f}s, "
+            f"{2 * n**3 / elapsed / 1e9:.2f} GFLOP/s"
+        )
+    free_grid(grid)
+
+    return C
+
+
+if __name__ == "__main__":
+    main()
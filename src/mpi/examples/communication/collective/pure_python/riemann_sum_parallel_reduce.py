@@ -9,31 +9,12 @@ Last Modified : 05/15/2024
 
 """
 
-from itertools import islice
-from typing import Callable, Iterable, List, Type
+from typing import Callable, List
 
 from mpi4py import MPI
 
-
-def batched(iterable: Iterable, iterable_type: Type, n: int or float) -> List[Iterable]:
-    """
-    Takes an iterable and breaks it up into iterable_type iterators of n size .
-
-    Parameters:
-    - iterable: the iterator to break up
-    - iterable_type : the type of iterator to be broken up into
-    - n : the number of elements in the iterator
-
-    Returns:
-    A list of iterators with number of elements n
-
-    """
-    # batched('ABCDEFG', 3) → ABC DEF G
-    if n < 1:
-        raise ValueError("n must be at least one")
-    it = iter(iterable)
-    while batch := iterable_type(islice(it, n)):
-        yield batch
+from vhpc.mpi.jit import riemann_kernel_on_processes, riemann_parser
+from vhpc.mpi.partition import batched
 
 
 def is_single_line(expression: str) -> bool:
@@ -112,6 +93,7 @@ def riemann_sum_left(
 
 
 def main():
+    args = riemann_parser().parse_args()
     comm = MPI.COMM_WORLD
     rank = comm.Get_rank()
     size = comm.Get_size()
@@ -142,11 +124,6 @@ def main():
 
         # Check that user inputs fulfill conditions
         try:
-            if n % size != 0:
-                raise ValueError(
-                    "Number of partitions \
-isn't evenly split between processes"
-                )
             if a >= b:
                 raise ValueError(
                     "The lower limit of the interval\
@@ -155,12 +132,13 @@ greater or equal to upper"
         except ValueError as e:
             print(e)
 
-        # Evenly partition the interval into subintervals
-        # of size partition space, one per process
-        delta_x = (b - a) / n
+        # Partition the interval into subintervals of at most partition_size
+        # points, one per process, the last ones may be short or empty
+        delta_x = (b - a) / n if n else 0.0
         x = [a + i * delta_x for i in range(0, n)]
-        partition_size = n // size
-        batched_x = list(batched(x, list, partition_size))
+        partition_size = max(1, -(-n // size))
+        batched_x = list(batched(x, partition_size))
+        batched_x += [[]] * (size - len(batched_x))
 
     comm.Barrier()
 
@@ -170,7 +148,13 @@ greater or equal to upper"
         f = create_function_on_process(function_string)
 
     local_interval = comm.scatter(batched_x)
-    local_sum = riemann_sum_left(f, local_interval, delta_x)
+    if args.jit:
+        # the compiled loop only needs where the local points start and how many
+        kernel = riemann_kernel_on_processes(function_string, comm)
+        start = local_interval[0] if local_interval else 0.0
+        local_sum = kernel(start, delta_x, len(local_interval))
+    else:
+        local_sum = riemann_sum_left(f, local_interval, delta_x)
     global_sum = comm.reduce(local_sum, op=MPI.SUM)
 
     if rank == 0:
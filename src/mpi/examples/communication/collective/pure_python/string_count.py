@@ -1,25 +1,91 @@
-from random import sample
+"""
+Count the nucleotides and the k-mers of a random sequence held by root, in parallel.
 
+The sequence is kept packed, four bases to a byte (see vhpc.mpi.packed), instead
+of as a list of one-character strings, so root scatters a quarter of the bytes of
+the text and the processes count their bases straight from the packed bytes.
+Every piece but the last holds a whole number of bytes, so no byte is shared.
+
+The processes then count the k-mers of their pieces with vhpc.mpi.kmers: the k - 1
+bases that overlap the next piece come from the neighbour, and every k-mer is
+counted by the process its hash selects. Root prints the most frequent ones.
+
+Usage:
+    mpirun -n 4 python string_count.py --length 100000 -k 5 --top 10
+
+Date: 10/18/2026
+Author: Djamil Lakhdar-Hamina
+
+"""
+
+import argparse
+from collections import Counter
+from random import choices
+
+import numpy as np
 from mpi4py import MPI
 
+from vhpc.mpi.kmers import count_kmers, decode_kmer, top_kmers
+from vhpc.mpi.packed import BASES_PER_BYTE, count_packed, pack_sequence, unpack
+from vhpc.mpi.partition import block_ranges
+
+
+def parse_args() -> argparse.Namespace:
+    """
+    Parses the command line.
+
+    Returns:
+    The options, `length` the number of bases, `k` the k-mer length and `top` the
+    number of k-mers printed
+    """
+    parser = argparse.ArgumentParser(description="count nucleotides and k-mers")
+    parser.add_argument("--length", type=int, default=1000)
+    parser.add_argument("-k", type=int, default=4)
+    parser.add_argument("--top", type=int, default=5)
+    return parser.parse_args()
+
 
 def main() -> None:
     NUCLEOTIDES = "agtc"
+    ALPHABET = "ACGT"
+    args = parse_args()
     comm = MPI.COMM_WORLD
     rank = comm.Get_rank()
     size = comm.Get_size()
-    length = 1000
-    long_string = [sample(NUCLEOTIDES, k=1)[0] for _ in range(length)]
-    chunk_size = length // size
-    local_string = long_string[rank * chunk_size : (rank + 1) * chunk_size]
-    length_local_string = len(local_string)
-    lengths = comm.gather(length_local_string)
+    length, k = args.length, args.k
 
+    pieces = None
     if rank == 0:
-        sum = 0
-        for i in lengths:
-            sum += i
-            print(sum)
+        sequence = "".join(choices(NUCLEOTIDES, k=length))
+        packed = pack_sequence(sequence, ALPHABET)
+        # (bytes, number of bases) per process
+        pieces = [
+            (
+                packed[offset : offset + count],
+                max(0, min(count * BASES_PER_BYTE, length - offset * BASES_PER_BYTE)),
+            )
+            for offset, count in block_ranges(len(packed), size)
+        ]
+    local_packed, local_length = comm.scatter(pieces, root=0)
+    local_packed = np.frombuffer(local_packed, dtype=np.uint8)
+    local_counts = count_packed(local_packed, local_length)
+    counts = comm.reduce(local_counts, op=MPI.SUM, root=0)
+    lengths = comm.gather(local_length)
+
+    kmers, kmer_counts = count_kmers(unpack(local_packed, local_length), k, comm)
+    distinct = comm.reduce(kmers.size, op=MPI.SUM, root=0)
+    top = top_kmers(kmers, kmer_counts, args.top, comm)
+
+    if rank == 0:
+        assert sum(lengths) == length
+        assert counts.tolist() == [sequence.count(c) for c in ALPHABET.lower()]
+        print(dict(zip(ALPHABET, counts.tolist())))
+
+        expected = Counter(sequence[i : i + k] for i in range(length - k + 1))
+        assert distinct == len(expected)
+        top = [(decode_kmer(kmer, k, ALPHABET), count) for kmer, count in top]
+        assert all(expected[kmer.lower()] == count for kmer, count in top)
+        print(f"{distinct} distinct {k}-mers, most frequent: {top}")
 
 
 if __name__ == "__main__":
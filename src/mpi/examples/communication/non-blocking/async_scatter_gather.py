@@ -1,6 +1,8 @@
 """
 This program demonstrates builds an asynchronous bcast, scatter, and gather
-and demonstrates their use via vector-vector addition.
+and demonstrates their use via vector-vector addition. The scatter and gather also
+come in a segmented form, so the addition of one segment overlaps the transfer of
+the next.
 
 Usage:
     Run the script with an MPI execution command such as
@@ -11,75 +13,201 @@ Author: Djamil Lakhdar-Hamina
 
 """
 
-from itertools import islice
-from typing import Generator, Iterable, List, Sequence, Type
+from typing import Generator, Optional, Sequence, Tuple, Type
 
 import numpy as np
 from mpi4py import MPI
 
+from vhpc.mpi.buffer_pool import BufferPool, allocate
+from vhpc.mpi.distribution import binomial_tree, block_layout
+from vhpc.mpi.partition import block_partition, block_ranges, displacements
+
 comm = MPI.COMM_WORLD
 rank = comm.Get_rank()
 size = comm.Get_size()
 
 
-def part_gen(
-    iterable: Iterable, iterable_type: Type, n: int or float
-) -> "Generator[Iterable]":
+def count_of(recv_size: int | Sequence[int], p: int) -> int:
     """
-    Takes an iterable and breaks it up into iterable_type iterators of n size .
+    The number of elements process p exchanges.
 
     Parameters:
-    - iterable: the iterator to break up
-    - iterable_type : the type of iterator to be broken up into
-    - n : the number of elements in the iterator
+    - recv_size: one count shared by all processes or a sequence of counts per rank
+    - p: the rank
 
     Returns:
-    A list of iterators with number of elements n
+    The count for rank p
+    """
+    return int(recv_size) if np.ndim(recv_size) == 0 else int(recv_size[p])
+
+
+# Messages below this many bytes, or communicators with fewer processes than
+# BCAST_MIN_PROCS, go down the binomial tree; longer messages are scattered and
+# allgathered. The values are the defaults MPICH uses for the same decision.
+BCAST_SHORT_MSG_SIZE = 12288
+BCAST_MIN_PROCS = 8
 
+
+def async_bcast_linear(
+    buf: object,
+    buf_size: int,
+    dtype: Type,
+    comm: "MPI.Comm",
+    size: int,
+    root: int = 0,
+    pool: Optional[BufferPool] = None,
+) -> object:
     """
-    # batched('ABCDEFG', 3) → ABC DEF G
-    if n < 1:
-        raise ValueError("n must be at least one")
-    it = iter(iterable)
-    while batch := iterable_type(islice(it, n)):
-        yield batch
-
-
-def partition(
-    n: int,
-    inner_iterable: Iterable,
-    outer_iterable_type: Iterable = List,
-    inner_iterable_type: Iterable = List,
-) -> Iterable[List]:
+    Broadcasts by having the root send the whole buffer to every other process.
+
+    The root posts p - 1 sends, so its link carries p - 1 copies of the message and
+    the latency grows linearly with the number of processes. Kept as the reference
+    the tree-based variants are measured against.
+
+    Parameters and return value are those of `async_bcast`.
     """
-    Partition an iterable into chunks of a specified size.
+    if comm.Get_rank() == root:
+        recvbuf = buf
+        requests = []
+        for p in range(0, size):
+            if p != root:
+                request = comm.Isend(buf=recvbuf, dest=p, tag=0)
+                requests.append(request)
+        MPI.Request.Waitall(requests)
+    else:
+        recvbuf = allocate(buf_size, dtype, pool)
+        request = comm.Irecv(buf=recvbuf, source=root, tag=0)
+        request.Wait()
+    return recvbuf
 
-    This function divides an input iterable into smaller chunks, each of size `n`.
-    The resulting chunks are stored in an iterable specified by `outer_iterable`,
-    and each chunk itself is of the type specified by `inner_iterable_type`.
 
-    Parameters:
-    n (int): The size of each chunk.
-    inner_iterable (iter): The iterable to be partitioned.
-    outer_iterable (iter): The type of the outer iterable that will hold the chunks.
-    Default is `list`. inner_iterable_type (iter): The type of the inner iterables that
-    represent the chunks. Default is `list`.
+def async_bcast_binomial(
+    buf: object,
+    buf_size: int,
+    dtype: Type,
+    comm: "MPI.Comm",
+    size: int,
+    root: int = 0,
+    pool: Optional[BufferPool] = None,
+) -> object:
+    """
+    Broadcasts along a binomial tree rooted at root.
 
-    Returns:
-    iter[list]: An iterable containing the partitioned chunks.
+    Ranks are renumbered relative to the root. A process receives the buffer from the
+    process that differs from it in its lowest set bit and then forwards it to the
+    processes below it in the tree, so every process has the data after
+    ceil(log2(p)) rounds and no process sends more than log2(p) messages.
+
+    Parameters and return value are those of `async_bcast`.
 
     Example:
-    >>> list(partition(3, range(10)))
-    [[0, 1, 2], [3, 4, 5], [6, 7, 8], [9]]
+    With 8 processes and root 0: 0 -> 4, then 0 -> 2 and 4 -> 6, then 0 -> 1,
+    2 -> 3, 4 -> 5 and 6 -> 7.
+    """
+    vrank = (comm.Get_rank() - root) % size
+    recvbuf = buf if vrank == 0 else allocate(buf_size, dtype, pool)
+    parent, children = binomial_tree(comm.Get_rank(), size, root)
+
+    # receive from the parent, then forward to the children, largest subtree first
+    if parent is not None:
+        comm.Irecv(buf=recvbuf, source=parent, tag=0).Wait()
+    requests = [comm.Isend(buf=recvbuf, dest=child, tag=0) for child in children]
+    MPI.Request.Waitall(requests)
+    return recvbuf
+
+
+def async_bcast_scatter_allgather(
+    buf: object,
+    buf_size: int,
+    dtype: Type,
+    comm: "MPI.Comm",
+    size: int,
+    root: int = 0,
+    pool: Optional[BufferPool] = None,
+) -> object:
+    """
+    Broadcasts a long message by scattering it and allgathering the pieces
+    (van de Geijn).
+
+    The buffer is cut into p pieces whose sizes differ by at most one element. The
+    pieces are scattered down a binomial tree, each process receiving the pieces of
+    its whole subtree in one message, and then circulated around a ring in p - 1
+    steps. Every link carries about 2 * (p - 1) / p of the message instead of the
+    whole message log2(p) times, which wins once bandwidth rather than latency
+    dominates.
+
+    Parameters and return value are those of `async_bcast`.
+    """
+    vrank = (comm.Get_rank() - root) % size
+    recvbuf = buf if vrank == 0 else allocate(buf_size, dtype, pool)
+    # piece v belongs to the process with relative rank v
+    counts, displs = block_layout(buf_size, comm)
+
+    def pieces(first: int, last: int) -> object:
+        # the contiguous run of pieces first, ..., last - 1
+        last = min(last, size)
+        return recvbuf[displs[first] : displs[first] + counts[first:last].sum()]
+
+    # binomial scatter: a process receives the pieces of its subtree, which spans
+    # the relative ranks up to its lowest set bit
+    parent, children = binomial_tree(comm.Get_rank(), size, root)
+    if parent is not None:
+        subtree = pieces(vrank, vrank + (vrank & -vrank))
+        comm.Irecv(buf=subtree, source=parent, tag=1).Wait()
+    requests = []
+    for child in children:
+        vchild = (child - root) % size
+        subtree = pieces(vchild, 2 * vchild - vrank)
+        requests.append(comm.Isend(buf=subtree, dest=child, tag=1))
+    MPI.Request.Waitall(requests)
+
+    # ring allgather: in step s pass on the piece received in step s - 1
+    left = (vrank - 1 + root) % size
+    right = (vrank + 1 + root) % size
+    for step in range(size - 1):
+        send_piece = (vrank - step) % size
+        recv_piece = (vrank - step - 1) % size
+        MPI.Request.Waitall(
+            [
+                comm.Irecv(buf=pieces(recv_piece, recv_piece + 1), source=left, tag=2),
+                comm.Isend(buf=pieces(send_piece, send_piece + 1), dest=right, tag=2),
+            ]
+        )
+    return recvbuf
+
+
+BCAST_ALGORITHMS = {
+    "linear": async_bcast_linear,
+    "binomial": async_bcast_binomial,
+    "scatter_allgather": async_bcast_scatter_allgather,
+}
+
 
-    >>> tuple(partition(2, 'abcdef', outer_iterable=tuple, inner_iterable_type=str))
-    (('a', 'b'), ('c', 'd'), ('e', 'f'))
+def select_bcast_algorithm(nbytes: int, size: int) -> str:
     """
-    return outer_iterable_type(part_gen(inner_iterable, inner_iterable_type, n))
+    The broadcast algorithm "auto" picks.
+
+    Parameters:
+    - nbytes: the size of the message in bytes
+    - size: the number of processes
+
+    Returns:
+    "binomial" for short messages or few processes, "scatter_allgather" otherwise
+    """
+    if nbytes < BCAST_SHORT_MSG_SIZE or size < BCAST_MIN_PROCS:
+        return "binomial"
+    return "scatter_allgather"
 
 
 def async_bcast(
-    buf: object, buf_size: int, dtype: Type, comm: "MPI.Comm", size: int, root: int = 0
+    buf: object,
+    buf_size: int,
+    dtype: Type,
+    comm: "MPI.Comm",
+    size: int,
+    root: int = 0,
+    algorithm: str = "auto",
+    pool: Optional[BufferPool] = None,
 ) -> object:
     """
     Asynchronously broadcasts data from the root process to all other processes in the
@@ -94,6 +222,10 @@ def async_bcast(
     size (int): The total number of processes in the communicator.
     root (int, optional): The rank of the root process from which data will be
     broadcast. Default is 0.
+    algorithm (str, optional): One of "linear", "binomial", "scatter_allgather" or
+    "auto". Default is "auto", which picks by message size, see Notes.
+    pool (BufferPool, optional): A pool to draw the receive buffer from. The caller
+    hands the buffer back with `pool.release` once done with it. Default is None.
 
     Returns:
     object: The buffer containing the received data on non-root processes. On the root
@@ -115,35 +247,28 @@ def async_bcast(
     Notes:
     - This function uses non-blocking send (Isend) and receive (Irecv) operations to
     achieve asynchronous communication.
-    - The root process sends the buffer to all other processes.
+    - Messages shorter than BCAST_SHORT_MSG_SIZE bytes, and any message on fewer than
+    BCAST_MIN_PROCS processes, travel down a binomial tree: O(log p) rounds instead
+    of the root sending p - 1 copies. Longer messages are scattered and then
+    allgathered, which keeps every link busy with only a fraction of the message.
     - Non-root processes allocate an empty buffer of the specified size and type to
       receive the data.
     - The function returns the received buffer on non-root processes and the original
     buffer on the root process.
     """
-
-    if rank == root:
-        recvbuf = buf
-        requests = []
-        for p in range(0, size):
-            if p != root:
-                request = comm.Isend(buf=recvbuf, dest=p, tag=0)
-                requests.append(request)
-        MPI.Request.Waitall(requests)
-    else:
-        recvbuf = np.empty(buf_size, dtype=dtype)
-        request = comm.Irecv(buf=recvbuf, source=0, tag=0)
-        request.Wait()
-    return recvbuf
+    if algorithm == "auto":
+        algorithm = select_bcast_algorithm(buf_size * np.dtype(dtype).itemsize, size)
+    return BCAST_ALGORITHMS[algorithm](buf, buf_size, dtype, comm, size, root, pool)
 
 
 def async_scatter(
     sendbuf: Sequence[object],
-    recv_size: int,
+    recv_size: int | Sequence[int],
     dtype: Type,
     comm: "MPI.Comm" = comm,
     size: int = size,
     root: int = 0,
+    pool: Optional[BufferPool] = None,
 ) -> object:
     """
     Asynchronously scatters data from the root process to all other processes in the
@@ -152,13 +277,16 @@ def async_scatter(
     Parameters:
     sendbuf (Sequence[object]): A sequence of buffers, where each buffer contains the
     data to be sent to a specific process. This is only used by the root process.
-    recv_size (int): The size of the buffer (number of elements) to be received by each
-    process.
+    recv_size (int | Sequence[int]): The size of the buffer (number of elements) to be
+    received by each process, or a sequence with one size per rank when the data does
+    not split evenly (see `vhpc.mpi.distribution.block_layout`).
     dtype (Type): The data type of the elements in the buffer.
     comm (MPI.Comm): The MPI communicator over which the data is to be scattered.
     size (int): The total number of processes in the communicator.
     root (int, optional): The rank of the root process from which data will be
     scattered. Default is 0.
+    pool (BufferPool, optional): A pool to draw the receive buffer from. Default is
+    None.
 
     Returns:
     object: The buffer containing the received data on each process.
@@ -185,7 +313,7 @@ def async_scatter(
     - The function returns the received buffer on all processes.
     """
     if rank == root:
-        recvbuf = sendbuf[0]
+        recvbuf = sendbuf[root]
         requests = []
         for p in range(0, size):
             if p != root:
@@ -193,7 +321,7 @@ def async_scatter(
                 requests.append(request)
         MPI.Request.Waitall(requests)
     else:
-        recvbuf = np.empty(recv_size, dtype=dtype)
+        recvbuf = allocate(count_of(recv_size, rank), dtype, pool)
         request = comm.Irecv(recvbuf, source=root, tag=rank)
         request.Wait()
     return recvbuf
@@ -201,12 +329,13 @@ def async_scatter(
 
 def async_gather(
     sendbuf: Sequence[object],
-    recv_size: int,
+    recv_size: int | Sequence[int],
     dtype: Type,
     comm: "MPI.Comm" = comm,
     size: int = size,
     root: int = 0,
-) -> List[object]:
+    pool: Optional[BufferPool] = None,
+) -> Optional[object]:
     """
     Asynchronously gathers data from all processes to the root process in the given MPI
     communicator.
@@ -214,17 +343,20 @@ def async_gather(
     Parameters:
     sendbuf (Sequence[object]): The buffer containing the data to be sent from each
     process.
-    recv_size (int): The size of the buffer (number of elements) to be received
-    from each process.
+    recv_size (int | Sequence[int]): The size of the buffer (number of elements) to be
+    received from each process, or a sequence with one size per rank.
     dtype (Type): The data type of the elements in the buffer.
     comm (MPI.Comm): The MPI communicator over which the data is to be gathered.
     size (int): The total number of processes in the communicator.
     root (int, optional): The rank of the root process to which data will be gathered.
     Default is 0.
+    pool (BufferPool, optional): A pool to draw the result array from. Default is
+    None.
 
     Returns:
-    List[object]: A list of buffers containing the received data on the root process.
-    On non-root processes, returns None.
+    object: On the root process, one contiguous array holding the data in rank order:
+    of shape (size, recv_size) when recv_size is an int, and the concatenation of all
+    blocks when it is a sequence. On non-root processes, returns None.
 
     Example:
     >>> from mpi4py import MPI
@@ -236,27 +368,34 @@ def async_gather(
     >>> gathered_data = async_gather(sendbuf, 3, np.int, comm, size, root=0)
     >>> if rank == 0:
     >>>     for i, data in enumerate(gathered_data):
-    >>>         print(f"Process {i} sent: {data}")
+    >>>         print(f"Process {i} sent: {data}")  # row i of a (size, 3) array
 
     Notes:
     - This function uses non-blocking send (Isend) and receive (Irecv) operations to
     achieve asynchronous communication.
-    - The root process receives data from all processes and gathers it into a list.
+    - The root process receives every block straight into its place in the result
+    array, so no list of arrays has to be stacked or flattened afterwards.
     - Non-root processes send their data to the root process.
-    - The function returns a list of received buffers on the root process, and returns
-      None on non-root processes.
+    - The function returns the gathered array on the root process, and returns None
+      on non-root processes.
     """
 
     if rank == root:
+        counts = [count_of(recv_size, p) for p in range(size)]
+        displs = displacements(counts)
+        if np.ndim(recv_size) == 0:
+            gather_arr = allocate((size, int(recv_size)), dtype, pool)
+        else:
+            gather_arr = allocate(sum(counts), dtype, pool)
+        flat = gather_arr.reshape(-1)
         requests = []
-        gather_arr = []
-        gather_arr.append(sendbuf)
         for p in range(0, size):
-            if p != root:
-                recv_buf = np.empty(recv_size, dtype=dtype)
-                request = comm.Irecv(recv_buf, p, p)
+            block = flat[displs[p] : displs[p] + counts[p]]
+            if p == root:
+                block[...] = sendbuf
+            else:
+                request = comm.Irecv(block, p, p)
                 requests.append(request)
-                gather_arr.append(recv_buf)
         MPI.Request.Waitall(requests)
         return gather_arr
     else:
@@ -264,50 +403,218 @@ def async_gather(
         request.Wait()
 
 
+def async_scatter_segments(
+    sendbuf: Sequence[object],
+    recv_size: int | Sequence[int],
+    dtype: Type,
+    comm: "MPI.Comm" = comm,
+    size: int = size,
+    root: int = 0,
+    segments: int = 4,
+    pool: Optional[BufferPool] = None,
+    tag: int = 0,
+) -> Generator[Tuple[int, object], None, None]:
+    """
+    Asynchronously scatters data like `async_scatter`, but splits each process's
+    portion into segments and yields every segment as soon as it has arrived.
+
+    Parameters:
+    sendbuf (Sequence[object]): A sequence of buffers, one per process. This is only
+    used by the root process.
+    recv_size (int | Sequence[int]): The number of elements received by each process,
+    or a sequence with one count per rank.
+    dtype (Type): The data type of the elements in the buffer.
+    comm (MPI.Comm): The MPI communicator over which the data is to be scattered.
+    size (int): The total number of processes in the communicator.
+    root (int, optional): The rank of the root process. Default is 0.
+    segments (int, optional): The number of segments per process. Default is 4.
+    pool (BufferPool, optional): A pool to draw the receive buffer from. Default is
+    None.
+    tag (int, optional): The tag of the first segment, segment s is sent with tag
+    tag + s. Streams in flight on the same communicator at the same time need
+    disjoint tag ranges. Default is 0.
+
+    Returns:
+    Generator[Tuple[int, object]]: The (offset, segment) pairs of the calling process's
+    portion, in order. Each segment is a view of the receive buffer.
+
+    Example:
+    >>> total = 0.0
+    >>> for offset, segment in async_scatter_segments(sendbuf, 1000, float):
+    >>>     total += segment.sum()  # overlaps with the next segment's transfer
+
+    Notes:
+    - Every receive is posted before the first segment is yielded, so the transfer of
+    segment i + 1 proceeds while the caller works on segment i.
+    - The root yields its own portion straight away and waits for its sends once the
+    generator is exhausted, so the generator must be consumed to the end (use
+    zip(..., strict=True) when iterating over several of them).
+    """
+    rank = comm.Get_rank()
+    if rank == root:
+        requests = []
+        for p in range(0, size):
+            if p != root:
+                part = sendbuf[p]
+                for s, (offset, count) in enumerate(
+                    block_ranges(count_of(recv_size, p), segments)
+                ):
+                    request = comm.Isend(part[offset : offset + count], p, tag + s)
+                    requests.append(request)
+        own = sendbuf[root]
+        for offset, count in block_ranges(len(own), segments):
+            yield offset, own[offset : offset + count]
+        MPI.Request.Waitall(requests)
+    else:
+        recvbuf = allocate(count_of(recv_size, rank), dtype, pool)
+        ranges = block_ranges(len(recvbuf), segments)
+        requests = [
+            comm.Irecv(recvbuf[offset : offset + count], source=root, tag=tag + s)
+            for s, (offset, count) in enumerate(ranges)
+        ]
+        for request, (offset, count) in zip(requests, ranges):
+            request.Wait()
+            yield offset, recvbuf[offset : offset + count]
+
+
+class SegmentedGather:
+    """
+    Gathers results to the root segment by segment while they are being computed,
+    the counterpart of `async_scatter_segments`.
+
+    Every process calls `send` once per segment, in order, and `wait` at the end. The
+    root posts all of its receives up front into one contiguous result array, so
+    segments from every process land in place as they arrive.
+
+    Example:
+    >>> gather = SegmentedGather(counts, float)
+    >>> for offset, segment in async_scatter_segments(sendbuf, counts, float):
+    >>>     gather.send(2 * segment)
+    >>> result = gather.wait()  # the whole array on the root, None elsewhere
+    """
+
+    def __init__(
+        self,
+        recv_size: int | Sequence[int],
+        dtype: Type,
+        comm: "MPI.Comm" = comm,
+        size: int = size,
+        root: int = 0,
+        segments: int = 4,
+        pool: Optional[BufferPool] = None,
+        tag: int = 0,
+    ):
+        """
+        Parameters:
+        recv_size (int | Sequence[int]): The number of elements sent by each process,
+        or a sequence with one count per rank.
+        dtype (Type): The data type of the elements.
+        comm (MPI.Comm): The MPI communicator over which the data is gathered.
+        size (int): The total number of processes in the communicator.
+        root (int, optional): The rank of the root process. Default is 0.
+        segments (int, optional): The number of segments per process. Default is 4.
+        pool (BufferPool, optional): A pool to draw the result array from. Default is
+        None.
+        tag (int, optional): The tag of the first segment, as in
+        `async_scatter_segments`. Default is 0.
+        """
+        self.comm = comm
+        self.root = root
+        self.tag = tag
+        self.rank = comm.Get_rank()
+        counts = [count_of(recv_size, p) for p in range(size)]
+        self.ranges = block_ranges(counts[self.rank], segments)
+        self.segment = 0
+        self.requests = []
+        self.result = None
+        if self.rank == root:
+            displs = displacements(counts)
+            self.result = allocate(sum(counts), dtype, pool)
+            self.own = self.result[displs[root] : displs[root] + counts[root]]
+            for p in range(0, size):
+                if p == root:
+                    continue
+                for s, (offset, count) in enumerate(block_ranges(counts[p], segments)):
+                    start = displs[p] + offset
+                    request = self.comm.Irecv(
+                        self.result[start : start + count], source=p, tag=tag + s
+                    )
+                    self.requests.append(request)
+
+    def send(self, segment: object) -> None:
+        """
+        Hands over the next segment of the calling process's result. The segment must
+        not be modified until `wait` returns.
+
+        Parameters:
+        segment (object): A contiguous buffer with as many elements as the segment of
+        the same index produced by `async_scatter_segments`.
+        """
+        offset, count = self.ranges[self.segment]
+        if len(segment) != count:
+            raise ValueError(f"segment {self.segment} must have {count} elements")
+        if self.rank == self.root:
+            self.own[offset : offset + count] = segment
+        else:
+            request = self.comm.Isend(
+                segment, dest=self.root, tag=self.tag + self.segment
+            )
+            self.requests.append(request)
+        self.segment += 1
+
+    def wait(self) -> Optional[object]:
+        """
+        Completes the gather.
+
+        Returns:
+        object: The gathered array in rank order on the root process, None elsewhere.
+        """
+        if self.segment != len(self.ranges):
+            raise RuntimeError(
+                f"{self.segment} of {len(self.ranges)} segments were sent"
+            )
+        MPI.Request.Waitall(self.requests)
+        return self.result
+
+
 def main():
     assert size > 2
 
     if rank == 0:
         print("input vector length:")
         n = int(input())
-        chunk = n // (size)
-        chunk_buffer = np.array([chunk], dtype="i")
-        # print(f"number elements per process: {chunk}")
-        try:
-            if n % size != 0:
-                raise ValueError(
-                    "The values are not evenly partitioned between n workers\
-processors"
-                )
-        except ValueError as e:
-            print(e)
-            comm.Abort()
+        n_buffer = np.array([n], dtype=np.int64)
         # define 2 random vectors
         x, y = np.random.rand(n), np.random.rand(n)
-        partitions = partition(chunk, x, list, list), partition(chunk, y, list, list)
-        # split each vector into p chunks of n size
-        sendbuf = np.array(
-            [np.concatenate((part_x, part_y)) for (part_x, part_y) in zip(*partitions)]
-        )
-        # print(f"split it up and concatenated, sendbuf is : \n {sendbuf}\n")
+        # split each vector into p views whose sizes differ by at most one element,
+        # n does not have to divide the number of processes
+        x_parts, y_parts = block_partition(x, size), block_partition(y, size)
 
     else:
-        n = chunk_buffer = sendbuf = None
+        n_buffer = x_parts = y_parts = None
 
-    # broadcast chunk length
+    # broadcast vector length, every process derives the same block layout from it
     buf_size = 1  # Size of the buffer
-    chunk = async_bcast(
-        buf=chunk_buffer, buf_size=buf_size, dtype="i", comm=comm, size=size
+    n = async_bcast(
+        buf=n_buffer, buf_size=buf_size, dtype=np.int64, comm=comm, size=size
     )[0]
-    recvbuf = async_scatter(
-        sendbuf=sendbuf, recv_size=chunk * 2, dtype=float, comm=comm, size=size
-    )
-    local_sum = recvbuf[:chunk] + recvbuf[chunk:]
-    finalrecvbuf = np.array(
-        async_gather(sendbuf=local_sum, recv_size=chunk, dtype=float, comm=comm)
+    counts, _ = block_layout(n, comm)
+
+    # add each segment while the next ones are still in flight and stream the sums
+    # straight back to the root
+    # the two scatters are in flight together, so they use disjoint tags
+    segments = 4
+    x_segments = async_scatter_segments(x_parts, counts, float, segments=segments)
+    y_segments = async_scatter_segments(
+        y_parts, counts, float, segments=segments, tag=segments
     )
+    gather = SegmentedGather(counts, float, segments=segments)
+    # strict=True also drives y_segments to its end, where the root waits on its sends
+    for (_, x_segment), (_, y_segment) in zip(x_segments, y_segments, strict=True):
+        gather.send(x_segment + y_segment)
+    result = gather.wait()
     if rank == 0:
-        assert np.all(x + y == finalrecvbuf.flatten())
+        assert np.all(x + y == result)
 
 
 if __name__ == "__main__":
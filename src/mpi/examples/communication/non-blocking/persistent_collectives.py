@@ -0,0 +1,311 @@
+"""
+This program builds broadcast, scatter and gather "plans" out of persistent requests
+and demonstrates them on an iterative workload.
+
+`async_bcast`, `async_scatter` and `async_gather` in async_scatter_gather.py post new
+`Isend`/`Irecv` requests and allocate a new receive buffer on every call. An
+iterative solver repeats the same exchange thousands of times with the same buffers,
+so a plan creates its requests once with `Send_init`/`Recv_init` and every iteration
+is only a `Startall`/`Waitall`:
+
+    plan = ScatterPlan(shape, dtype, comm)
+    for _ in range(iterations):
+        local = plan.run(sendbuf)
+
+The requests are bound to the buffers of the first `run`; they are rebuilt only if a
+later call passes a buffer at a different address. Receive buffers that are not
+passed in are allocated once, when the plan is created.
+
+Usage:
+    Run the script with an MPI execution command such as
+   `mpiexec -n 4 python script_name.py`.
+
+Date: 10/18/2026
+Author: Djamil Lakhdar-Hamina
+
+"""
+
+from abc import ABC, abstractmethod
+from time import perf_counter
+from typing import List, Optional, Tuple, Type
+
+import numpy as np
+from mpi4py import MPI
+
+from vhpc.mpi.distribution import binomial_tree, block_layout
+
+BCAST_TAG, SCATTER_TAG, GATHER_TAG = 10, 11, 12
+
+
+def buffer_address(buf: Optional[np.ndarray]) -> Optional[int]:
+    """
+    The address of the first element of buf, or None for no buffer.
+
+    Parameters:
+    - buf: a NumPy array or None
+
+    Returns:
+    The data pointer of the array
+    """
+    return None if buf is None else buf.__array_interface__["data"][0]
+
+
+class PersistentPlan(ABC):
+    """
+    Owns a list of persistent requests bound to a set of buffers. Subclasses define
+    `build`, which creates the requests for the given buffers.
+    """
+
+    def __init__(self, comm: "MPI.Comm", root: int = 0):
+        self.comm = comm
+        self.root = root
+        self.rank = comm.Get_rank()
+        self.size = comm.Get_size()
+        self.requests: List["MPI.Prequest"] = []
+        self.bound = None
+
+    @abstractmethod
+    def build(self, *buffers: Optional[np.ndarray]) -> List["MPI.Prequest"]:
+        """
+        Creates the persistent requests of the plan.
+
+        Parameters:
+        - buffers: the buffers the requests are bound to, as passed to `bind`
+
+        Returns:
+        The requests, not started
+        """
+
+    def bind(self, *buffers: Optional[np.ndarray]) -> None:
+        """
+        Makes sure the requests point at buffers, rebuilding them only if a buffer
+        moved since the last call.
+
+        Parameters:
+        - buffers: the buffers of the current run
+        """
+        for buf in buffers:
+            if buf is not None and not buf.flags.c_contiguous:
+                raise ValueError("plan buffers must be C-contiguous")
+        key = tuple(buffer_address(buf) for buf in buffers)
+        if key != self.bound:
+            self.free()
+            self.requests = self.build(*buffers)
+            self.bound = key
+
+    def free(self) -> None:
+        """
+        Releases the persistent requests.
+        """
+        for request in self.requests:
+            request.Free()
+        self.requests = []
+        self.bound = None
+
+
+class BcastPlan(PersistentPlan):
+    """
+    Broadcasts an array of fixed shape along a binomial tree of persistent requests.
+    A process first completes its receive from its parent and only then starts the
+    sends to its children.
+    """
+
+    def __init__(
+        self, shape: Tuple[int, ...], dtype: Type, comm: "MPI.Comm", root: int = 0
+    ):
+        """
+        Parameters:
+        - shape: the shape of the broadcast array
+        - dtype: the NumPy dtype of the broadcast array
+        - comm: the communicator to broadcast over
+        - root: the rank the data comes from
+        """
+        super().__init__(comm, root)
+        self.buf = np.empty(shape, dtype=dtype)
+        self.parent, self.children = binomial_tree(self.rank, self.size, root)
+
+    def build(self, buf: np.ndarray) -> List["MPI.Prequest"]:
+        requests = []
+        if self.parent is not None:
+            requests.append(self.comm.Recv_init(buf, source=self.parent, tag=BCAST_TAG))
+        for child in self.children:
+            requests.append(self.comm.Send_init(buf, dest=child, tag=BCAST_TAG))
+        return requests
+
+    def run(self, buf: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Broadcasts buf from the root.
+
+        Parameters:
+        - buf: the data on the root; on the other processes the array to receive
+          into, or None to use the buffer owned by the plan
+
+        Returns:
+        The broadcast array
+        """
+        buf = self.buf if buf is None else buf
+        self.bind(buf)
+        if self.parent is not None:
+            recv, sends = self.requests[0], self.requests[1:]
+            recv.Start()
+            recv.Wait()
+        else:
+            sends = self.requests
+        MPI.Prequest.Startall(sends)
+        MPI.Request.Waitall(sends)
+        return buf
+
+
+class ScatterPlan(PersistentPlan):
+    """
+    Scatters the rows of an array of fixed shape from the root in blocks whose sizes
+    differ by at most one row.
+    """
+
+    def __init__(
+        self, shape: Tuple[int, ...], dtype: Type, comm: "MPI.Comm", root: int = 0
+    ):
+        """
+        Parameters:
+        - shape: the shape of the whole array on the root
+        - dtype: the NumPy dtype of the array
+        - comm: the communicator to scatter over
+        - root: the rank holding the array
+        """
+        super().__init__(comm, root)
+        self.counts, self.displs = block_layout(shape[0], comm)
+        block_shape = (self.counts[self.rank],) + tuple(shape[1:])
+        self.recvbuf = np.empty(block_shape, dtype=dtype)
+
+    def block(self, buf: np.ndarray, p: int) -> np.ndarray:
+        return buf[self.displs[p] : self.displs[p] + self.counts[p]]
+
+    def build(
+        self, sendbuf: Optional[np.ndarray], recvbuf: np.ndarray
+    ) -> List["MPI.Prequest"]:
+        if self.rank != self.root:
+            return [self.comm.Recv_init(recvbuf, source=self.root, tag=SCATTER_TAG)]
+        return [
+            self.comm.Send_init(self.block(sendbuf, p), dest=p, tag=SCATTER_TAG)
+            for p in range(self.size)
+            if p != self.root
+        ]
+
+    def run(
+        self, sendbuf: Optional[np.ndarray] = None, recvbuf: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """
+        Scatters sendbuf from the root.
+
+        Parameters:
+        - sendbuf: the whole array on the root, ignored elsewhere
+        - recvbuf: the array to receive the calling process's block into, or None to
+          use the buffer owned by the plan
+
+        Returns:
+        The calling process's block
+        """
+        recvbuf = self.recvbuf if recvbuf is None else recvbuf
+        if self.rank != self.root:
+            sendbuf = None
+        self.bind(sendbuf, recvbuf)
+        MPI.Prequest.Startall(self.requests)
+        if self.rank == self.root:
+            recvbuf[...] = self.block(sendbuf, self.root)
+        MPI.Request.Waitall(self.requests)
+        return recvbuf
+
+
+class GatherPlan(PersistentPlan):
+    """
+    Gathers blocks of rows, laid out as by `ScatterPlan`, into one array of fixed shape
+    on the root.
+    """
+
+    def __init__(
+        self, shape: Tuple[int, ...], dtype: Type, comm: "MPI.Comm", root: int = 0
+    ):
+        """
+        Parameters:
+        - shape: the shape of the whole array on the root
+        - dtype: the NumPy dtype of the array
+        - comm: the communicator to gather over
+        - root: the rank receiving the array
+        """
+        super().__init__(comm, root)
+        self.counts, self.displs = block_layout(shape[0], comm)
+        self.recvbuf = np.empty(shape, dtype=dtype) if self.rank == root else None
+
+    def block(self, buf: np.ndarray, p: int) -> np.ndarray:
+        return buf[self.displs[p] : self.displs[p] + self.counts[p]]
+
+    def build(
+        self, sendbuf: np.ndarray, recvbuf: Optional[np.ndarray]
+    ) -> List["MPI.Prequest"]:
+        if self.rank != self.root:
+            return [self.comm.Send_init(sendbuf, dest=self.root, tag=GATHER_TAG)]
+        return [
+            self.comm.Recv_init(self.block(recvbuf, p), source=p, tag=GATHER_TAG)
+            for p in range(self.size)
+            if p != self.root
+        ]
+
+    def run(
+        self, sendbuf: np.ndarray, recvbuf: Optional[np.ndarray] = None
+    ) -> Optional[np.ndarray]:
+        """
+        Gathers every process's sendbuf on the root.
+
+        Parameters:
+        - sendbuf: the calling process's block
+        - recvbuf: the array to gather into on the root, or None to use the buffer
+          owned by the plan; ignored elsewhere
+
+        Returns:
+        The gathered array on the root, None elsewhere
+        """
+        if self.rank == self.root:
+            recvbuf = self.recvbuf if recvbuf is None else recvbuf
+        else:
+            recvbuf = None
+        self.bind(sendbuf, recvbuf)
+        MPI.Prequest.Startall(self.requests)
+        if self.rank == self.root:
+            self.block(recvbuf, self.root)[...] = sendbuf
+        MPI.Request.Waitall(self.requests)
+        return recvbuf
+
+
+def main():
+    comm = MPI.COMM_WORLD
+    rank = comm.Get_rank()
+    n, iterations = 1_000_003, 100
+
+    # Jacobi-style iteration x <- (x + b) / 2, which converges to b. The root owns
+    # x, every process updates its block and the blocks are gathered back.
+    b_plan = BcastPlan((n,), float, comm)
+    scatter_plan = ScatterPlan((n,), float, comm)
+    gather_plan = GatherPlan((n,), float, comm)
+    b = b_plan.run(np.linspace(0.0, 1.0, n) if rank == 0 else None)
+    counts, displs = block_layout(n, comm)
+    local_b = b[displs[rank] : displs[rank] + counts[rank]]
+    x = np.zeros(n) if rank == 0 else None
+
+    start = perf_counter()
+    for _ in range(iterations):
+        local_x = scatter_plan.run(x)
+        local_x += local_b
+        local_x *= 0.5
+        x = gather_plan.run(local_x)
+    elapsed = perf_counter() - start
+
+    if rank == 0:
+        assert np.allclose(x, b)
+        print(f"{iterations} iterations, {elapsed / iterations * 1e3:.3f} ms each")
+
+    for plan in (b_plan, scatter_plan, gather_plan):
+        plan.free()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,35 +1,24 @@
 """
 This program computes the Riemann sum of a user-defined function over a specified
 interval using MPI for parallel processing. The main components of the program include
-functions for partitioning iterables, generating parts of iterables,
-validating single-line expressions,creating functions dynamically from user input, and
-performing the Riemann sum calculation. The MPI framework is utilized to distribute the
-computation across multiple processes.
+functions for validating single-line expressions, creating functions dynamically from
+user input, and performing the Riemann sum calculation. The MPI framework is utilized
+to distribute the computation across multiple processes.
 
 Functions:
 ----------
-- part_gen(iterable: Iterable,
-           iterable_type: Type,
-           n: int or float) -> "Generator[Iterable]":
-    Takes an iterable and breaks it up into `iterable_type` iterators of size `n`.
-
-- partition(n: int,
- inner_iterable: Iterable, outer_iterable_type: Iterable = List,
- inner_iterable_type: Iterable = List) -> Iterable[List]:
-    Partitions an iterable into chunks of a specified size.
-
-- is_single_line(expression: str) -> bool:
-    Checks if a string expression is a single line.
-
 - create_function_string_from_user_input() -> str:
-    Dynamically creates a single-lined function string from user input.
+    Dynamically creates a single-lined function string from user input
+    (from vhpc.mpi.integrand).
 
-- create_function_on_process(function_string: str) -> Callable:
-    Compiles a function from a function string on a process.
+- cached_function_on_process(function_string: str) -> Callable:
+    Compiles a function string into a function evaluated on whole NumPy arrays, once
+    per process and expression (from vhpc.mpi.cache).
 
 - riemann_sum_left(f: Callable[[(float | int)], float], interval: Tuple[(float | int)],
-delta_x: (float | int)) -> float | int:
-    Approximates the integral of `f` over an interval using the left Riemann sum method.
+delta_x: (float | int), summation: str) -> Tuple[float, float]:
+    Approximates the integral of `f` over an interval using the left Riemann sum method,
+    as a (sum, compensation) pair.
 
 MPI Process:
 -------------
@@ -50,133 +39,42 @@ Note:
 - Ensure MPI is set up in your environment to run this program.
 - The user input for the function should be in the form of a valid single-line Python
 expression.
+- Pass --jit to compile the function and the summation loop with Numba.
+- Pass --summation pairwise or --summation neumaier to add the partial sums with less
+rounding error. MPI only allows predefined operations in `Win.Accumulate`, so in
+neumaier mode each process puts its (sum, compensation) pair into its own slot of
+the root's window and the root combines the slots with compensated summation.
+- The partial sums are reduced by a `vhpc.mpi.rma.RMAReducer`: the window lives on
+the root only and all contributions travel in one passive-target epoch, without a
+barrier. With the default summation every process streams the sum of each block of
+points into the window as soon as the block is done.
 
 Date: 05/28/2024
 Author : Djamil Lakhdar-Hamina
 
 """
 
-from itertools import islice
-from typing import Callable, Generator, Iterable, List, Tuple, Type
+import argparse
+from typing import Callable, Tuple
 
 import numpy as np
 from mpi4py import MPI
-from mpi4py.util import dtlib
-
-
-def part_gen(
-    iterable: Iterable, iterable_type: Type, n: int or float
-) -> "Generator[Iterable]":
-    """
-    Takes an iterable and breaks it up into iterable_type iterators of n size .
-
-    Parameters:
-    - iterable: the iterator to break up
-    - iterable_type : the type of iterator to be broken up into
-    - n : the number of elements in the iterator
-
-    Returns:
-    A list of iterators with number of elements n
-
-    """
-    # batched('ABCDEFG', 3) → ABC DEF G
-    if n < 1:
-        raise ValueError("n must be at least one")
-    it = iter(iterable)
-    while batch := iterable_type(islice(it, n)):
-        yield batch
-
-
-def partition(
-    n: int,
-    inner_iterable: Iterable,
-    outer_iterable_type: Iterable = List,
-    inner_iterable_type: Iterable = List,
-) -> Iterable[List]:
-    """
-    Partition an iterable into chunks of a specified size.
-
-    This function divides an input iterable into smaller chunks, each of size `n`.
-    The resulting chunks are stored in an iterable specified by `outer_iterable`,
-    and each chunk itself is of the type specified by `inner_iterable_type`.
-
-    Parameters:
-    n (int): The size of each chunk.
-    inner_iterable (iter): The iterable to be partitioned.
-    outer_iterable (iter): The type of the outer iterable that will hold the chunks.
-    Default is `list`. inner_iterable_type (iter): The type of the inner iterables that
-    represent the chunks. Default is `list`.
-
-    Returns:
-    iter[list]: An iterable containing the partitioned chunks.
-
-    Example:
-    >>> list(partition(3, range(10)))
-    [[0, 1, 2], [3, 4, 5], [6, 7, 8], [9]]
-
-    >>> tuple(partition(2, 'abcdef', outer_iterable=tuple, inner_iterable_type=str))
-    (('a', 'b'), ('c', 'd'), ('e', 'f'))
-    """
-    return outer_iterable_type(part_gen(inner_iterable, inner_iterable_type, n))
-
-
-def is_single_line(expression: str) -> bool:
-    """
-    Takes a string expression and checks if the string is one-line by counting
-    /n (newline) characters.
-
-    Parameters:
-    - expression: the function body in string form
-
-    Returns:
-    A boolean indicating if function body is single-lined (true)
-
-    """
-    # Count the number of newline characters
-    newline_count = expression.count("\n")
-    # Return True if there is only one newline character, False otherwise
-    return newline_count == 0
-
-
-def create_function_string_from_user_input() -> str:
-    """
-    Dynamically create a single-lined function string from user input.
-
-    Parameters:
-
-    Returns:
-    A single-lined function of form f(x): return expression
-    """
-    # Get a string from the user
-    print("Enter a single-lined function body: ")
-    function_string = input()
-    # Check that string is well-formed
-    assert is_single_line(function_string)
-    # Execute code while making sure that scope of f is not just in exec bloc
-    return function_string
-
-
-def create_function_on_process(function_string: str) -> Callable:
-    """
-    Compiles a function from a function string on a process.
-
-    Parameters:
-    - function_string: string or body of function
-
-    Returns:
-    The function with body given
 
-    """
-    locals_dict = {}
-    exec(f"def f(x): return {function_string}", {}, locals_dict)
-    return locals_dict["f"]
+from vhpc.mpi.cache import cached_function_on_process
+from vhpc.mpi.distribution import block_interval
+from vhpc.mpi.integrand import create_function_string_from_user_input
+from vhpc.mpi.jit import riemann_kernel_on_processes, riemann_parser
+from vhpc.mpi.riemann import left_block_sums, riemann_sum_left_pair
+from vhpc.mpi.rma import RMAReducer
+from vhpc.mpi.summation import SUMMATION_MODES, neumaier_sum, resolve
 
 
 def riemann_sum_left(
     f: Callable[[(float | int)], float],
     interval: Tuple[(float | int)],
     delta_x: (float | int),
-) -> float | int:
+    summation: str = "naive",
+) -> Tuple[float, float]:
     """
     Takes function f, an interval (a,b) defined as a tuple, and a partition number n
     and approximates the integral of f on [a,b]
@@ -184,31 +82,49 @@ def riemann_sum_left(
     Parameters:
     - f: function
     - interval: interval (a,b) where b>a
-    - n : partition number, how many rectangles to approximate integral
+    - delta_x: width of a partition
+    - summation: "naive", "pairwise" or "neumaier" (see vhpc.mpi.summation)
 
     Returns:
-    integral, the result of integration process, "area under the curve".
+    integral, the result of integration process, "area under the curve", as a
+    (sum, compensation) pair.
 
     Example:
     """
-    fvec = np.vectorize(f)
-    return np.sum(
-        fvec(np.arange(start=interval[0], stop=interval[1], step=delta_x)) * delta_x
+    # f is evaluated block by block on whole arrays, see vhpc.mpi.riemann
+    count = round((interval[1] - interval[0]) / delta_x)
+    return riemann_sum_left_pair(f, interval[0], delta_x, count, summation=summation)
+
+
+def parse_args() -> argparse.Namespace:
+    """
+    Parses the command line.
+
+    Returns:
+    The options, `jit` is set when the integrand and the summation loop should be
+    compiled with Numba (see vhpc.mpi.jit), `summation` is how partial sums are added
+    (see vhpc.mpi.summation)
+    """
+    parser = riemann_parser()
+    parser.add_argument(
+        "--summation",
+        choices=SUMMATION_MODES,
+        default="naive",
+        help="how partial sums are added, locally and across processes",
     )
+    return parser.parse_args()
 
 
 def main():
+    args = parse_args()
     comm = MPI.COMM_WORLD
     rank = comm.Get_rank()
     size = comm.Get_size()
-    dtype = MPI.FLOAT
-    np_dtype = dtlib.to_numpy_dtype(dtype)
-    itemsize = dtype.Get_size()
 
     if rank == 0:
         # Define function on root process
         function_string = create_function_string_from_user_input()
-        f = create_function_on_process(function_string)
+        f = cached_function_on_process(function_string)
         # Check that it was "compiled"
         assert callable(f)
 
@@ -225,11 +141,6 @@ def main():
 
         # Check that user inputs fulfill conditions
         try:
-            if n % size != 0:
-                raise ValueError(
-                    "Number of partitions \
-isn't evenly split between processes"
-                )
             if a >= b:
                 raise ValueError(
                     "The lower limit of the interval\
@@ -248,32 +159,54 @@ greater or equal to upper"
 
     function_string, a, b, n = comm.bcast((function_string, a, b, n), root=0)
     if rank != 0:
-        f = create_function_on_process(function_string)
-
-    partition_size = (b - a) / size
-    partition_delta = n // size
-    n = partition_size / partition_delta
-    local_interval = (
-        a + rank * partition_size,
-        a + (rank + 1) * partition_size,
-    )
+        f = cached_function_on_process(function_string)
+
+    # the partition counts of the processes differ by at most one
+    start, end, count = block_interval(a, b, n, comm)
+    local_interval = (start, end)
+    delta_x = (b - a) / n
+
+    if args.jit:
+        kernel = riemann_kernel_on_processes(function_string, comm)
 
-    local_sum = np.array([riemann_sum_left(f, local_interval, n)], dtype=np_dtype)
-    global_sum = np.empty(1, dtype=np_dtype)
-    win = MPI.Win.Allocate(itemsize, comm=comm)
-    win.Lock(rank=0, lock_type=MPI.LOCK_SHARED, assertion=MPI.MODE_NOCHECK)
     target_rank = 0
-    win.Accumulate([local_sum, dtype], target_rank=target_rank, op=MPI.SUM)
-    win.Unlock(rank=0)
-    comm.Barrier()
-    win.Lock(rank=0, lock_type=MPI.LOCK_SHARED, assertion=MPI.MODE_NOCHECK)
-    win.Get(global_sum, target_rank=0)
-    win.Unlock(rank=0)
+    # partial sums are added in double precision, single precision loses most of the
+    # digits a fine partition gains
+    if args.summation == "neumaier":
+        # Accumulate takes predefined operations only, so each process puts its
+        # (sum, compensation) pair into a slot of its own and the root adds the slots
+        reducer = RMAReducer(comm, count=2 * size, root=target_rank)
+        reducer.start()
+        if args.jit:
+            local_pair = (kernel(start, delta_x, count), 0.0)
+        else:
+            local_pair = riemann_sum_left(f, local_interval, delta_x, args.summation)
+        reducer.accumulate(np.array(local_pair), offset=2 * rank, op=MPI.REPLACE)
+        slots = reducer.complete()
+        if rank == target_rank:
+            slots = slots.reshape(size, 2)
+            total, compensation = neumaier_sum(slots[:, 0])
+            global_sum = resolve((total, compensation + slots[:, 1].sum()))
+    else:
+        reducer = RMAReducer(comm, root=target_rank)
+        reducer.start()
+        if args.jit:
+            reducer.accumulate(np.array([kernel(start, delta_x, count)]))
+        elif args.summation == "naive":
+            # one contribution per block, sent while the next block is evaluated
+            for block_sum in left_block_sums(f, start, delta_x, count):
+                reducer.accumulate(np.array([block_sum * delta_x]))
+        else:
+            local_pair = riemann_sum_left(f, local_interval, delta_x, args.summation)
+            reducer.accumulate(np.array([resolve(local_pair)]))
+        result = reducer.complete()
+        if rank == target_rank:
+            global_sum = result[0]
 
     if rank == 0:
-        print(f"The integral of {function_string} = {global_sum[0]}")
+        print(f"The integral of {function_string} = {global_sum}")
 
-    win.Free()
+    reducer.free()
 
 
 if __name__ == "__main__":
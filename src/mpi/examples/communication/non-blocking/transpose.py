@@ -1,102 +1,151 @@
 """
-This program partitions a square matrix into smaller square submatrices,
-transposes each submatrix in parallel using MPI, and
-reassembles the transposed blocks into the final matrix.
-The main steps include dividing the matrix, scattering the
-submatrices to MPI processes, transposing locally, and gathering the transposed blocks.
+This program transposes a matrix distributed by rows over the MPI processes; the
+transpose comes back distributed by rows as well, so no process ever holds the
+whole matrix. The exchange is a single non-blocking all-to-all whose derived
+datatypes read the columns straight out of the local rows (see
+vhpc.mpi.transpose). The helpers below divide a matrix into blocks and assemble it
+again.
 
 Functions:
 ----------
-- block_partition(matrix: np.array, n: int) -> np.array:
-    Divides a square matrix into nxn submatrices.
+- block_view(matrix: np.array, n: int | (int, int)) -> np.array:
+    A 4d view of the blocks of a matrix, without copying.
 
-- unblock(block_matrix: np.array, n: int) -> np.array:
-    Reconstructs the original matrix from nxn submatrices.
+- block_partition(matrix: np.array, n: int | (int, int)) -> np.array:
+    Divides a matrix into nxn (or rxc) submatrices.
+
+- unblock(block_matrix: np.array, n: int | (int, int)) -> np.array:
+    Reconstructs the original matrix from its submatrices.
 
 - transpose(matrix: np.array) -> np.array:
-    Transposes a given matrix.
+    Transposes a given matrix with a tiled kernel.
 
 MPI Process:
 -------------
 - main():
-    Manages the MPI processes, including matrix input, partitioning,
-    scattering, transposing, and gathering results.
+    Every process fills its rows of an (m x n) matrix A, starts the distributed
+    transpose with `itranspose` and checks its rows of A^T once it completes.
+    With --source the matrix is instead read from a binary file and its transpose
+    written to --destination by `transpose_file`, block by block, so it never has
+    to fit in memory; a missing source file is generated first.
 
 Example Usage:
 --------------
-1. The user is prompted to enter the dimensions of the square matrix and the block size.
-2. The matrix is partitioned, and submatrices are scattered to MPI processes.
-3. Each process transposes its submatrix and the results are gathered and reassembled
-   by the root process.
+    mpirun -n 4 python transpose.py --rows 4096 --cols 2048
+    mpirun -n 4 python transpose.py --rows 100000 --cols 50000 \\
+        --source A.bin --destination AT.bin --check
 
 Note:
 -----
 - Ensure MPI is set up in your environment to run this program.
 
-Example:
-
-
+Date: 10/18/2026
+Author: Djamil Lakhdar-Hamina
 
 """
 
+import argparse
+import os
+from typing import Tuple
+
 import numpy as np
 from mpi4py import MPI
-from mpi4py.util import dtlib
 
+from vhpc.mpi.distribution import block_layout
+from vhpc.mpi.transpose import (
+    DEFAULT_BLOCK_BYTES,
+    itranspose,
+    local_transpose,
+    transpose_file,
+)
+
+
+def _block_shape(block_shape: "int | Tuple[int, int]") -> Tuple[int, int]:
+    if isinstance(block_shape, tuple):
+        return block_shape
+    return block_shape, block_shape
 
-def block_partition(matrix: np.array, n: int) -> np.array:
+
+def block_view(matrix: np.array, n: "int | Tuple[int, int]") -> np.array:
     """
-    Takes a square matrix of dimensions mxm and breaks into
-    square submatrices of dimensions nxn.
+    The blocks of a matrix as a 4d view of it: element [i, j] is the block in the
+    i-th row and j-th column of blocks. Nothing is copied.
 
     Parameters:
-    - matrix: 2d np.array matrix to be divided
-    - n: dimension of the matrix
+    - matrix: 2d np.array matrix to be divided, of dimensions (pxq)
+    - n: dimension of the blocks, n for square (nxn) blocks or (r, c) for (rxc)
 
     Returns:
-    np.array with dimensions (mxm/(nxn),n,n)
+    np.array view with dimensions (p/r, q/c, r, c)
 
     Example:
-
+    >>> blocks = block_view(np.arange(8).reshape(2, 4), (2, 2))
+    >>> blocks.shape, blocks[0, 1].tolist()
+    ((1, 2, 2, 2), [[2, 3], [6, 7]])
     """
-    m = matrix.shape[0]
-    blocks = []
-    for i in range(0, m, n):
-        for j in range(0, m, n):
-            block = matrix[i : i + n, j : j + n]
-            blocks.append(block)
-    return np.array(blocks)
+    r, c = _block_shape(n)
+    p, q = matrix.shape
+    if p % r or q % c:
+        raise ValueError(f"({p}x{q}) matrix cannot be divided into ({r}x{c}) blocks")
+    # rows of blocks, rows in a block, columns of blocks, columns in a block; then
+    # swap the middle axes so a block's rows and columns come last
+    return matrix.reshape(p // r, r, q // c, c).swapaxes(1, 2)
 
 
-# TODO : write this function
-def unblock(block_matrix: np.array, n: int) -> np.array:
+def block_partition(matrix: np.array, n: "int | Tuple[int, int]") -> np.array:
     """
-    Takes a block matrix of sub dimensions mxm and builds
-    square matrix of dimension nxn.
+    Takes a matrix of dimensions pxq and breaks it into submatrices of dimensions
+    nxn (or rxc), listed row of blocks by row of blocks.
 
     Parameters:
-    - matrix: 3d np.array matrix to be collapsed
-    - n: dimension of the matrix
+    - matrix: 2d np.array matrix to be divided
+    - n: dimension of the blocks, n for square (nxn) blocks or (r, c) for (rxc)
 
     Returns:
-    np.array with dimensions (nxn)
+    np.array with dimensions (pxq/(rxc),r,c); a view of matrix when the blocks are
+    already laid out contiguously in it (a single column of blocks), a copy
+    otherwise
 
     Example:
+    >>> block_partition(np.arange(8).reshape(2, 4), 2)[1].tolist()
+    [[2, 3], [6, 7]]
+    """
+    r, c = _block_shape(n)
+    return block_view(matrix, (r, c)).reshape(-1, r, c)
+
 
+def unblock(block_matrix: np.array, n: "int | Tuple[int, int]") -> np.array:
     """
-    b, m, _ = block_matrix.shape
-    matrix = np.empty((n, n))
-    for i in range(0, b):
-        for j in range(0, m):
-            for k in range(0, m):
-                matrix[j, k] = block_matrix[i, j, k]
-    return matrix
+    The inverse of `block_partition`: takes the blocks of a matrix and builds the
+    matrix of dimension nxn (or pxq) back.
+
+    Parameters:
+    - block_matrix: 3d np.array of blocks listed row of blocks by row of blocks,
+      or the 4d array of `block_view`
+    - n: dimension of the matrix, n for (nxn) or (p, q) for (pxq)
+
+    Returns:
+    np.array with dimensions (pxq); a view of block_matrix when its blocks form a
+    single column, a copy otherwise
+
+    Example:
+    >>> A = np.arange(24).reshape(4, 6)
+    >>> bool((unblock(block_partition(A, (2, 3)), A.shape) == A).all())
+    True
+    """
+    p, q = _block_shape(n)
+    r, c = block_matrix.shape[-2:]
+    if p % r or q % c or block_matrix.size != p * q:
+        raise ValueError(f"({r}x{c}) blocks cannot be assembled into ({p}x{q})")
+    blocks = block_matrix.reshape(p // r, q // c, r, c)
+    return blocks.swapaxes(1, 2).reshape(p, q)
 
 
 def transpose(matrix: np.array) -> np.array:
     """
     Takes a matrix of dimensions mxn and gives the
-    tranpose nxm.
+    tranpose nxm, of the same dtype, copied tile by tile (see
+    vhpc.mpi.transpose.local_transpose).
 
     Parameters:
     - matrix: 2d np.array matrix to be tranposed
@@ -105,69 +154,134 @@ def transpose(matrix: np.array) -> np.array:
     np.array with dimensions (nxm)
 
     Example:
+    >>> transpose(np.arange(6, dtype=np.int16).reshape(2, 3)).tolist()
+    [[0, 3], [1, 4], [2, 5]]
+    """
+    return local_transpose(matrix)
+
 
+def row_chunks(m: int, n: int, comm: MPI.Comm):
     """
-    m, n = matrix.shape
-    new_matrix = np.empty((n, m))
-    for row in range(m):
-        new_matrix[:, row] = matrix[row, :]
-    return new_matrix
+    The calling process's rows of an (m x n) matrix of doubles, in chunks of at
+    most DEFAULT_BLOCK_BYTES.
+
+    Returns:
+    A generator of (first row, number of rows)
+    """
+    row_counts, row_displs = block_layout(m, comm)
+    first, rows = row_displs[comm.Get_rank()], row_counts[comm.Get_rank()]
+    chunk = max(1, DEFAULT_BLOCK_BYTES // (8 * max(n, 1)))
+    # the same number of chunks everywhere, since the file calls are collective
+    chunks = -(-int(row_counts.max()) // chunk)
+    for c in range(chunks):
+        start = min(first + c * chunk, first + rows)
+        yield start, min(chunk, first + rows - start)
+
+
+def write_matrix_file(filename: str, m: int, n: int, comm: MPI.Comm) -> None:
+    """
+    Writes the (m x n) matrix A[i, j] = i * n + j of doubles to a binary file, every
+    process its rows a chunk at a time.
+    """
+    fh = MPI.File.Open(comm, filename, MPI.MODE_WRONLY | MPI.MODE_CREATE)
+    for start, rows in row_chunks(m, n, comm):
+        chunk = np.arange(start * n, (start + rows) * n, dtype=np.float64)
+        fh.Write_at_all(start * n * chunk.itemsize, chunk)
+    fh.Close()
+
+
+def check_transpose_file(filename: str, m: int, n: int, comm: MPI.Comm) -> bool:
+    """
+    Whether a binary file holds the (n x m) transpose of the matrix written by
+    `write_matrix_file`, every process checking its rows a chunk at a time.
+    """
+    fh = MPI.File.Open(comm, filename, MPI.MODE_RDONLY)
+    correct = fh.Get_size() == m * n * 8
+    for start, rows in row_chunks(n, m, comm):
+        chunk = np.empty((rows, m), dtype=np.float64)
+        fh.Read_at_all(start * m * chunk.itemsize, chunk)
+        j = np.arange(start, start + rows)
+        correct &= bool((chunk == np.arange(m) * n + j[:, np.newaxis]).all())
+    fh.Close()
+    return comm.allreduce(correct, op=MPI.LAND)
+
+
+def parse_args() -> argparse.Namespace:
+    """
+    Parses the command line.
+
+    Returns:
+    The options, `rows` and `cols` the dimensions of the matrix; `source` and
+    `destination` the files of the out-of-core mode, `block` the edge of its blocks
+    and `check` set when the destination should be verified
+    """
+    parser = argparse.ArgumentParser(description="distributed matrix transpose")
+    parser.add_argument("--rows", type=int, default=1024)
+    parser.add_argument("--cols", type=int, default=1024)
+    parser.add_argument("--source", help="binary file of the matrix of doubles")
+    parser.add_argument("--destination", default="transpose.bin")
+    parser.add_argument("--block", type=int, default=None)
+    parser.add_argument("--check", action="store_true")
+    return parser.parse_args()
+
+
+def main_file(args: argparse.Namespace, comm: MPI.Comm, root: int) -> None:
+    """
+    The out-of-core mode: transposes the matrix in args.source into
+    args.destination.
+    """
+    m, n = args.rows, args.cols
+    if not os.path.exists(args.source):
+        write_matrix_file(args.source, m, n, comm)
+
+    comm.Barrier()
+    start = MPI.Wtime()
+    transpose_file(args.source, args.destination, (m, n), np.float64, comm, args.block)
+    elapsed = comm.reduce(MPI.Wtime() - start, op=MPI.MAX, root=root)
+
+    if args.check:
+        assert check_transpose_file(args.destination, m, n, comm)
+    if comm.Get_rank() == root:
+        print(
+            f"({m}x{n}) matrix in {args.source} transposed into {args.destination} "
+            f"by {comm.Get_size()} processes in {elapsed:.4f}s"
+        )
 
 
 def main():
     ROOT = 0
+    args = parse_args()
     comm = MPI.COMM_WORLD
     rank = comm.Get_rank()
-    size = comm.Get_size()
-
-    dtype = MPI.FLOAT
-    np_dtype = dtlib.to_numpy_dtype(dtype)
-    itemsize = dtype.Get_size()
-
-    dim = blocks = local_block = None
-    if rank == 0:
-        print("dimensions of the square matrix:")
-        dim = int(input())
-        print("block dimension:")
-        block_dimension = int(input())
-        A = np.array([np.arange(dim) for _ in range(dim)])
-        blocks = block_partition(A, block_dimension)
-        final_buf = np.empty((blocks.shape), dtype=np_dtype)
-        try:
-            if dim % size != 0 and dim % 2 != 0 and size % 2 != 0:
-                raise ValueError(
-                    f"Dimensions {dim} cannot be block partitioned across {size}\
-processes and dimensions and size are not even numbers"
-                )
-        except ValueError as e:
-            print(e)
-            exit(1)
-
-    local_block = comm.scatter(blocks, root=ROOT)
-    dim = comm.bcast(dim, root=ROOT)
-    block_dimension = local_block.shape[1]
-    win_size = dim**2 * itemsize
-    win = MPI.Win.Allocate(win_size, comm=comm)
-    local_buf = np.empty((block_dimension, block_dimension), dtype=np_dtype)
-
-    win.Lock(rank=rank)
-    local_buf = transpose(local_block)
-    win.Put(local_buf, target_rank=rank)
-    win.Unlock(rank=rank)
-    comm.Barrier()
+    m, n = args.rows, args.cols
 
-    if rank == 0:
-        win.Lock(rank=ROOT)
-        for i in range(0, size):
-            win.Get(local_buf, target_rank=i)
-            final_buf[i] = local_buf
-        win.Unlock(rank=ROOT)
+    if args.source is not None:
+        return main_file(args, comm, ROOT)
 
-    if rank == 0:
-        print(final_buf)
-        # TODO: finish unblocking the result end
+    # this process's rows of A, with A[i, j] = i * n + j
+    row_counts, row_displs = block_layout(m, comm)
+    first, rows = row_displs[rank], row_counts[rank]
+    local = np.arange(first * n, (first + rows) * n, dtype=np.float64).reshape(rows, n)
 
-    win.Free()
+    comm.Barrier()
+    start = MPI.Wtime()
+    local_rows, request = itranspose(local, (m, n), comm)
+    request.Wait()
+    elapsed = comm.reduce(MPI.Wtime() - start, op=MPI.MAX, root=ROOT)
+
+    # this process's rows of A^T are the columns j of A it owns now
+    col_counts, col_displs = block_layout(n, comm)
+    j = np.arange(col_displs[rank], col_displs[rank] + col_counts[rank])
+    expected = np.arange(m) * n + j[:, np.newaxis]
+    assert (local_rows == expected).all()
+
+    if rank == ROOT:
+        print(
+            f"({m}x{n}) matrix transposed over {comm.Get_size()} processes in "
+            f"{elapsed:.4f}s"
+        )
+
+    return local_rows
 
 
 if __name__ == "__main__":
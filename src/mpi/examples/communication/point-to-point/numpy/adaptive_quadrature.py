@@ -0,0 +1,80 @@
+"""
+Integrate a user-defined function to a given tolerance with adaptive Gauss-Kronrod
+quadrature. The root process keeps the subintervals in a priority queue ordered by
+their error estimate and sends the worst ones to whichever process is idle, which
+bisects and integrates them and sends the halves back (see vhpc.mpi.quadrature).
+
+Run with at least two processes to have workers; on one process the root refines
+the intervals itself.
+
+Date: 10/18/2026
+Author: Djamil Lakhdar-Hamina
+
+"""
+
+import argparse
+
+from mpi4py import MPI
+
+from vhpc.mpi.integrand import (
+    create_function_on_process,
+    create_function_string_from_user_input,
+)
+from vhpc.mpi.quadrature import KRONROD_NODES, adaptive_quadrature
+
+
+def parse_args() -> argparse.Namespace:
+    """
+    Parses the command line.
+
+    Returns:
+    The options, `batch` is the most intervals sent to a worker at a time and
+    `max_intervals` the subdivision budget
+    """
+    parser = argparse.ArgumentParser(description="adaptive quadrature of f on [a, b]")
+    parser.add_argument("--batch", type=int, default=8)
+    parser.add_argument("--max-intervals", type=int, default=1 << 16)
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    root = 0
+    comm = MPI.COMM_WORLD
+    rank = comm.Get_rank()
+    if rank == root:
+        function_string = create_function_string_from_user_input()
+        print("Enter start of interval, end of interval, and tolerance: ")
+        a, b, tolerance = map(float, input().split())
+        try:
+            if a >= b:
+                raise ValueError(
+                    "The lower limit of the interval greater or equal to upper"
+                )
+        except ValueError as e:
+            print(e)
+    else:
+        function_string = a = b = tolerance = None
+
+    function_string, a, b, tolerance = comm.bcast(
+        (function_string, a, b, tolerance), root=root
+    )
+    f = create_function_on_process(function_string)
+
+    start = MPI.Wtime()
+    integral, error, intervals = adaptive_quadrature(
+        f, a, b, tolerance, comm, root, args.batch, args.max_intervals
+    )
+    elapsed = MPI.Wtime() - start
+
+    if rank == root:
+        print(f"The integral of {function_string} = {integral}")
+        print(f"error estimate: {error:.3e}, tolerance: {tolerance:.3e}")
+        # each bisection integrates two halves and adds one subinterval
+        evaluations = len(KRONROD_NODES) * (2 * intervals)
+        print(f"{intervals} subintervals, about {evaluations} evaluations of f")
+        print(f"time: {elapsed:.4f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -8,31 +8,12 @@ Last Modified : 05/15/2024
 
 """
 
-from itertools import islice
-from typing import Callable, Generator, Iterable, List, Type
+from typing import Callable, List
 
 from mpi4py import MPI
 
-
-def batched(iterable: Iterable, iterable_type: Type, n: (int | float)) -> Generator:
-    """
-    Takes an iterable and breaks it up into iterable_type iterators of n size .
-
-    Parameters:
-    - iterable: the iterator to break up
-    - iterable_type : the type of iterator to be broken up into
-    - n : the number of elements in the iterator
-
-    Returns:
-    A list of iterators with number of elements n
-
-    """
-    # batched('ABCDEFG', 3) → ABC DEF G
-    if n < 1:
-        raise ValueError("n must be at least one")
-    it = iter(iterable)
-    while batch := iterable_type(islice(it, n)):
-        yield batch
+from vhpc.mpi.jit import riemann_kernel_on_processes, riemann_parser
+from vhpc.mpi.partition import block_ranges
 
 
 def is_single_line(expression: str) -> bool:
@@ -113,6 +94,7 @@ def riemann_sum_left(
 
 
 def main():
+    args = riemann_parser().parse_args()
     comm = MPI.COMM_WORLD
     rank = comm.Get_rank()
     size = comm.Get_size()
@@ -141,11 +123,6 @@ end of interval, and partition number: """
 
         # Check that user inputs fulfill conditions
         try:
-            if n % size != 0:
-                raise ValueError(
-                    "Number of partitions \
-isn't evenly split between processes"
-                )
             if a >= b:
                 raise ValueError(
                     "The lower limit of the interval\
@@ -154,31 +131,34 @@ greater or equal to upper"
         except ValueError as e:
             print(e)
 
-        # Evenly partition the interval into subintervals
-        # of size partition space, one per process
+        # Evenly partition the interval into subintervals, one per process. Only
+        # the (offset, count) of each subinterval is sent, every process builds
+        # its own points.
         delta_x = (b - a) / n
-        x = [a + i * delta_x for i in range(0, n)]
-        partition_size = n // size
-        batched_x = list(batched(x, list, partition_size))
-        print(batched_x)
+        ranges = block_ranges(n, size)
+        print(ranges)
 
     comm.Barrier()
 
     # Distribute the info and sub-interval across processes.
     # Receive the info and compile function
     if rank == 0:
-        local_interval = batched_x[0]
-        local_sum = riemann_sum_left(f, local_interval, delta_x)
+        offset, count = ranges[0]
         for i in range(1, size):
-            info = (batched_x[i], function_string, delta_x)
+            info = (ranges[i], function_string, a, delta_x)
             comm.send(info, dest=i)
     else:
-        local_interval, function_string, delta_x = comm.recv(source=0)
+        (offset, count), function_string, a, delta_x = comm.recv(source=0)
         f = create_function_on_process(function_string)
 
     # Perform the local summation then send back
-    if rank != 0:
+    if args.jit:
+        kernel = riemann_kernel_on_processes(function_string, comm)
+        local_sum = kernel(a + offset * delta_x, delta_x, count)
+    else:
+        local_interval = [a + i * delta_x for i in range(offset, offset + count)]
         local_sum = riemann_sum_left(f, local_interval, delta_x)
+    if rank != 0:
         comm.send(local_sum, dest=0)
     else:
         global_sum = local_sum
@@ -8,7 +8,7 @@ The program consists of the following functions:
 1. is_single_line(expression: str) -> bool:
     - Checks if a given string expression is a single line.
 
-2. create_function_from_user_input() -> Callable:
+2. create_function_from_user_input() -> Tuple[Callable, str]:
     - Prompts the user to enter a single-line function body and dynamically creates
     this function.
 
@@ -27,9 +27,12 @@ Usage:
 - Enter the start and end of the interval and the number of partitions when prompted.
 - The program will output the approximate integral of the function over the specified
  interval.
+- Pass --jit to compile the function and the summation loop with Numba.
 """
 
-from typing import Callable
+from typing import Callable, Tuple
+
+from vhpc.mpi.jit import riemann_kernel, riemann_parser
 
 
 def is_single_line(expression: str) -> bool:
@@ -50,14 +53,14 @@ def is_single_line(expression: str) -> bool:
     return newline_count == 0
 
 
-def create_function_from_user_input() -> Callable:
+def create_function_from_user_input() -> Tuple[Callable, str]:
     """
     Dynamically create a single-lined function from user input.
 
     Parameters:
 
     Returns:
-    A single-lined function of form f(x): return expression
+    A single-lined function of form f(x): return expression, and the expression
     """
     locals_dict = {}
     # Get a string from the user
@@ -66,7 +69,7 @@ def create_function_from_user_input() -> Callable:
     assert is_single_line(function_string)
     # Execute code while making sure that scope of f is not just in exec bloc
     exec(f"def f(x): return {function_string}", {}, locals_dict)
-    return locals_dict["f"]
+    return locals_dict["f"], function_string
 
 
 def riemann_sum_left(
@@ -98,7 +101,8 @@ def riemann_sum_left(
 
 
 def main():
-    f = create_function_from_user_input()
+    args = riemann_parser().parse_args()
+    f, function_string = create_function_from_user_input()
 
     assert callable(f)
 
@@ -114,7 +118,10 @@ def main():
 
     assert a < b
 
-    result = riemann_sum_left(f, (a, b), n)
+    if args.jit:
+        result = riemann_kernel(function_string)(a, (b - a) / n, n)
+    else:
+        result = riemann_sum_left(f, (a, b), n)
     print(f"The integral of {f} on [{a},{b}] given n={n}:\n result: {result}\n")
 
 
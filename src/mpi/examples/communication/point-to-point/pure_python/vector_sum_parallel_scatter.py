@@ -7,56 +7,13 @@ Author: Djamil Lakhdar-Hamina
 
 """
 
-from itertools import chain, islice
+from itertools import chain
 from random import randint
-from typing import Generator, Iterable, List, Type
+from typing import Iterable, List
 
 from mpi4py import MPI
 
-
-def part_gen(iterable: Iterable, iterator_type: Type, n: int) -> Generator:
-    """
-    Takes an iterable and breaks it up into iterable_type iterators of n size .
-
-    Parameters:
-    - iterable: the iterator to break up
-    - iterable_type : the type of iterator to be broken up into
-    - n : the number of elements in the iterator
-
-    Returns:
-    A generator of iterators with number of elements n
-
-    """
-    # batched('ABCDEFG', 3) → ABC DEF G
-    if n < 1:
-        raise ValueError("n must be at least one")
-    it = iter(iterable)
-    while batch := iterator_type(islice(it, n)):
-        yield batch
-
-
-def partition(
-    iterable: Iterable, outer_iterator_type: Type, inner_iterator_type: Type, n: int
-) -> Iterable[Iterable]:
-    """
-    Takes an iterable and breaks it up into iterable_type iterators of n size .
-
-    Parameters:
-    - iterable: the iterator to break up
-    - outer_iterator_type: the iterator to wrap inner pieces in
-    - iterable_type : the type of iterator to be broken up into
-    - n : the number of elements in the iterator
-
-    Returns:
-    A actual iterator of iterators with number of elements n
-
-    Example:
-
-    >>> partition([1,2,3,4,5,6],tuple, list,2)
-        ([1,2],[3,4],[5,6])
-
-    """
-    return outer_iterator_type(part_gen(iterable, inner_iterator_type, n))
+from vhpc.mpi.partition import batched
 
 
 def flatten(outer_iterable: Iterable, iterable: Iterable[Iterable]) -> Iterable:
@@ -165,8 +122,8 @@ def main():
         y = rand_vector(LOWER_LIMIT, UPPER_LIMIT, VECTOR_LENGTH)
 
         # partition them or shard them, one shard for each process including root!
-        partitioned_x = partition(x, list, list, chunk)
-        partitioned_y = partition(y, list, list, chunk)
+        partitioned_x = batched(x, chunk)
+        partitioned_y = batched(y, chunk)
 
         # build a list of tuples, the first element is x chunk, second y chunk
         x_y = [
@@ -3,25 +3,145 @@ Generate random RNA file (aguc) of length N. Read in this
 file in parallel fashion and create array of chars. Then
 count each letter per process. Sum total and write to new file
 
+The file is generated only when it does not exist yet, so any plain sequence or
+FASTA file can be counted instead (pass --alphabet ACGT for DNA). Every process
+reads its own byte range in chunks of --chunk-bytes with collective reads and
+counts it with np.bincount; root writes one "letter count" line per letter of the
+alphabet to the output file (see vhpc.mpi.nucleotides).
+
+With --packed the file is in the 2-bit packed format of vhpc.mpi.packed instead,
+four bases per byte, and the bases are counted on the packed bytes.
+
+Usage:
+    mpirun -n 4 python rna.py data.rna --length 1000000000 -o counts.txt
+    mpirun -n 4 python rna.py data.vhna --packed --length 1000000000
+
 Date: 05/20/2024
 Author: Djamil Lakhdar-Hamina
 
 """
 
+import argparse
+import os
+
 import numpy as np
 from mpi4py import MPI
 
+from vhpc.mpi.nucleotides import DEFAULT_CHUNK_BYTES, count_file, letter_counts
+from vhpc.mpi.packed import (
+    BASES_PER_BYTE,
+    count_packed_file,
+    packed_range,
+    write_packed,
+)
+from vhpc.mpi.partition import block_range
+
+
+def write_random_rna(
+    filename: str, length: int, comm: MPI.Comm, chunk_bytes: int
+) -> None:
+    """
+    Writes length random nucleotides (agcu) to a file, every process its own block
+    of it, a chunk at a time.
+
+    Parameters:
+    - filename: the file written
+    - length: the number of nucleotides
+    - comm: the communicator sharing the work
+    - chunk_bytes: the bytes a process generates and writes at a time
+    """
+    rank = comm.Get_rank()
+    nucleotides = np.frombuffer(b"agcu", dtype=np.uint8)
+    rng = np.random.default_rng(rank)
+    offset, count = block_range(length, comm.Get_size(), rank)
+    chunks = comm.allreduce(-(-count // chunk_bytes), op=MPI.MAX)
+    fh = MPI.File.Open(comm, filename, MPI.MODE_CREATE | MPI.MODE_WRONLY)
+    for c in range(chunks):
+        start = min(c * chunk_bytes, count)
+        size = min(chunk_bytes, count - start)
+        fh.Write_at_all(offset + start, nucleotides[rng.integers(0, 4, size)])
+    fh.Close()
+
+
+def write_random_packed(
+    filename: str, length: int, comm: MPI.Comm, chunk_bytes: int
+) -> None:
+    """
+    Writes length random nucleotides as a packed file, every process its own
+    byte-aligned block of it, a chunk at a time.
+
+    Parameters:
+    - filename: the file written
+    - length: the number of nucleotides
+    - comm: the communicator sharing the work
+    - chunk_bytes: the packed bytes a process generates and writes at a time
+    """
+    rng = np.random.default_rng(comm.Get_rank())
+    offset, count = packed_range(length, comm)
+    chunk = chunk_bytes * BASES_PER_BYTE
+    codes = (
+        rng.integers(0, 4, min(chunk, count - start), dtype=np.uint8)
+        for start in range(0, count, chunk)
+    )
+    write_packed(filename, codes, offset, length, comm, "ACGU", chunk_bytes)
+
+
+def parse_args() -> argparse.Namespace:
+    """
+    Parses the command line.
+
+    Returns:
+    The options, `filename` the sequence file, `length` the number of nucleotides
+    generated when it does not exist, `output` the file of the totals, `alphabet`
+    the letters counted, `chunk_bytes` the read buffer of a process and `packed`
+    set for a file in the packed format
+    """
+    parser = argparse.ArgumentParser(description="count the nucleotides of a file")
+    parser.add_argument("filename", nargs="?", default="./data.rna")
+    parser.add_argument("--length", type=int, default=10_000_000)
+    parser.add_argument("-o", "--output", default="./counts.txt")
+    parser.add_argument("--alphabet", default="ACGU")
+    parser.add_argument("--chunk-bytes", type=int, default=DEFAULT_CHUNK_BYTES)
+    parser.add_argument("--packed", action="store_true", help="2-bit packed file")
+    return parser.parse_args()
+
 
 def main():
+    args = parse_args()
+    root = 0
     comm = MPI.COMM_WORLD
     rank = comm.Get_rank()
-    # size = comm.Get_size()
 
-    amode = MPI.MODE_CREATE | MPI.MODE_RDWR | MPI.MODE_APPEND
+    if not os.path.exists(args.filename):
+        write = write_random_packed if args.packed else write_random_rna
+        write(args.filename, args.length, comm, args.chunk_bytes)
+
+    comm.Barrier()
+    start = MPI.Wtime()
+    if args.packed:
+        header, counts = count_packed_file(
+            args.filename, comm, args.chunk_bytes, root=root
+        )
+    else:
+        counts = count_file(args.filename, comm, args.chunk_bytes, root=root)
+    elapsed = MPI.Wtime() - start
+
+    if rank == root:
+        if args.packed:
+            letters = dict(zip(header.alphabet.decode(), counts.tolist()))
+        else:
+            letters = letter_counts(counts, args.alphabet)
+        with open(args.output, "w") as file:
+            for letter, count in letters.items():
+                file.write(f"{letter} {count}\n")
+        size = os.path.getsize(args.filename)
+        print(
+            f"{letters} counted in {elapsed:.4f}s, "
+            f"{size / elapsed / 2**20:.1f} MiB/s, "
+            f"{sum(letters.values()) / elapsed / 1e6:.1f} Mbases/s"
+        )
+        return letters
+
 
-    fh = MPI.File.Open(comm, "./data.rna", amode)
-    nucleotides = ["a", "g", "u", "c"]
-    buffer = np.random.choice(nucleotides, 10)
-    chunk_size = buffer.nbytes
-    offset = chunk_size * rank
-    fh.Write_at_all(offset, buffer)
+if __name__ == "__main__":
+    main()
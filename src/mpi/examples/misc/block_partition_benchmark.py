@@ -0,0 +1,75 @@
+"""
+Time `block_view` and `block_partition` of the non-blocking transpose example against
+a list comprehension of slices that cuts the matrix into the same blocks.
+
+`block_view` only reshapes and swaps axes, so it takes the same time for any matrix
+size; `block_partition` copies the blocks once with a single vectorized reshape.
+
+Usage:
+    python block_partition_benchmark.py --sizes 1024 2048 4096 --block 16
+
+Date: 10/18/2026
+Author: Djamil Lakhdar-Hamina
+
+"""
+
+import argparse
+import importlib.util
+import time
+from pathlib import Path
+
+import numpy as np
+
+PATH = Path(__file__).parents[1] / "communication/non-blocking/transpose.py"
+spec = importlib.util.spec_from_file_location("transpose", PATH)
+transpose = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(transpose)
+
+
+def loop_block_partition(matrix: np.ndarray, r: int, c: int) -> np.ndarray:
+    """
+    The r x c blocks of matrix in row-major block order, one slice at a time.
+    """
+    p, q = matrix.shape
+    return np.array(
+        [matrix[i : i + r, j : j + c] for i in range(0, p, r) for j in range(0, q, c)]
+    )
+
+
+def parse_args() -> argparse.Namespace:
+    """
+    Parses the command line.
+
+    Returns:
+    The options, `sizes` the matrix edges to time and `block` the block edge
+    """
+    parser = argparse.ArgumentParser(description="benchmark block partitioning")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[512, 1024, 2048])
+    parser.add_argument("--block", type=int, default=16)
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    b = args.block
+    print(f"{'n':>6} {'view':>10} {'loop':>10} {'vectorized':>10} {'speedup':>8}")
+    for n in args.sizes:
+        A = np.random.default_rng(n).random((n, n))
+        start = time.perf_counter()
+        transpose.block_view(A, b)
+        view = time.perf_counter() - start
+        start = time.perf_counter()
+        expected = loop_block_partition(A, b, b)
+        loop = time.perf_counter() - start
+        start = time.perf_counter()
+        blocks = transpose.block_partition(A, b)
+        vectorized = time.perf_counter() - start
+        assert (blocks == expected).all()
+        print(
+            f"{n:>6} {view:>10.6f} {loop:>10.4f} {vectorized:>10.4f} "
+            f"{loop / vectorized:>8.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
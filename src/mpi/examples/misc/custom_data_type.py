@@ -1,16 +1,7 @@
-from itertools import islice
-
 import numpy as np
 from mpi4py import MPI
 
-
-def batched(iterable, bundle_type, n=2):
-    # batched('ABCDEFG', 3) → ABC DEF G
-    if n < 1:
-        raise ValueError("n must be at least one")
-    it = iter(iterable)
-    while batch := bundle_type(islice(it, n)):
-        yield batch
+from vhpc.mpi.partition import batched
 
 
 def definetype(field_names: list, field_dtypes: list, size: int) -> MPI.Datatype:
@@ -47,7 +38,7 @@ def main():
         comm.Recv([buf, custom_type], source=0, tag=0)
         print(buf)
     else:
-        buf = np.array(list(batched(range(0, size * 2), tuple)), dtype=point_type)
+        buf = np.array(list(batched(range(0, size * 2), 2, tuple)), dtype=point_type)
         for p in range(1, size):
             comm.Send([buf, custom_type], dest=p, tag=0)
 
@@ -0,0 +1,102 @@
+"""
+Time the matmul kernels of vhpc.mpi.matrix on random n x n matrices of doubles and
+report their speedup over the naive i-j-k loop.
+
+The pure-Python kernels take O(n^3) interpreted operations, so they only run up to
+--max-python-size; above it the naive time is extrapolated from the largest size it
+ran at (marked with *), which is what the speedups of the NumPy and Numba kernels
+are measured against.
+
+Usage:
+    python matmul_benchmark.py --sizes 64 128 256 512 1024 2048
+
+Date: 10/18/2026
+Author: Djamil Lakhdar-Hamina
+
+"""
+
+import argparse
+import random
+import time
+from typing import Dict, List
+
+from vhpc.mpi.matrix import MATMUL_KERNELS, Matrix, matmul
+
+PYTHON_KERNELS = ("naive", "transposed", "blocked")
+
+
+def random_matrix(n: int) -> Matrix:
+    """
+    An n x n matrix of uniform random doubles.
+    """
+    return Matrix([[random.random() for _ in range(n)] for _ in range(n)])
+
+
+def best_time(A: Matrix, B: Matrix, kernel: str, repeat: int) -> float:
+    """
+    The fastest of repeat runs of one kernel, in seconds.
+    """
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        matmul(A, B, kernel)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def parse_args() -> argparse.Namespace:
+    """
+    Parses the command line.
+
+    Returns:
+    The options, `sizes` and `kernels` to time, `max_python_size` the largest size
+    the pure-Python kernels run at and `repeat` the runs per compiled kernel
+    """
+    parser = argparse.ArgumentParser(description="benchmark the matmul kernels")
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[64, 128, 256, 512, 1024, 2048]
+    )
+    parser.add_argument(
+        "--kernels", nargs="+", choices=list(MATMUL_KERNELS), default=None
+    )
+    parser.add_argument("--max-python-size", type=int, default=256)
+    parser.add_argument("--repeat", type=int, default=3)
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    kernels = args.kernels or list(MATMUL_KERNELS)
+    available: List[str] = []
+    for kernel in kernels:
+        try:
+            # also triggers the compilation of the numba kernel
+            matmul(random_matrix(2), random_matrix(2), kernel)
+            available.append(kernel)
+        except ImportError as e:
+            print(f"skipping {kernel}: {e}")
+
+    print(f"{'n':>6} {'kernel':>11} {'seconds':>10} {'speedup':>9}")
+    naive_size = naive_time = None
+    for n in args.sizes:
+        A, B = random_matrix(n), random_matrix(n)
+        times: Dict[str, float] = {}
+        for kernel in available:
+            if kernel in PYTHON_KERNELS and n > args.max_python_size:
+                continue
+            repeat = 1 if kernel in PYTHON_KERNELS else args.repeat
+            times[kernel] = best_time(A, B, kernel, repeat)
+        if "naive" in times:
+            naive_size, naive_time = n, times["naive"]
+            reference, mark = naive_time, ""
+        elif naive_time is not None:
+            reference, mark = naive_time * (n / naive_size) ** 3, "*"
+        else:
+            reference, mark = None, ""
+        for kernel, seconds in times.items():
+            speedup = f"{reference / seconds:8.1f}{mark}" if reference else "-"
+            print(f"{n:>6} {kernel:>11} {seconds:>10.4f} {speedup:>9}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Time the local transpose kernels of vhpc.mpi.transpose on random n x n arrays and
+report their speedup over `np.ascontiguousarray(a.T)`.
+
+The default sizes straddle the usual cache capacities: a 64 x 64 array of doubles
+(32 KiB) fits in L1, 256 x 256 (512 KiB) in L2, 1024 x 1024 (8 MiB) in L3 and the
+larger ones in none of them. The in-place kernels are timed on a copy of the
+array made before the clock starts.
+
+Usage:
+    python transpose_benchmark.py --sizes 64 256 1024 2048 4096 8192
+
+Date: 10/18/2026
+Author: Djamil Lakhdar-Hamina
+
+"""
+
+import argparse
+import time
+from typing import Callable, Dict, List
+
+import numpy as np
+
+from vhpc.mpi.transpose import (
+    LOCAL_TRANSPOSE_KERNELS,
+    TILE,
+    local_transpose,
+    transpose_inplace,
+)
+
+
+def kernels(tile: int) -> Dict[str, Callable[[np.ndarray], np.ndarray]]:
+    """
+    The functions timed, by name; the reference comes first.
+    """
+    timed = {"a.T copy": lambda a: np.ascontiguousarray(a.T)}
+    for name, kernel in LOCAL_TRANSPOSE_KERNELS.items():
+        timed[name] = lambda a, kernel=kernel: kernel(a, tile=tile)
+    for name in LOCAL_TRANSPOSE_KERNELS:
+        timed[f"{name} inplace"] = lambda a, name=name: transpose_inplace(a, name, tile)
+    return timed
+
+
+def best_time(a: np.ndarray, f: Callable, repeat: int) -> float:
+    """
+    The fastest of repeat runs of f on a copy of a, in seconds.
+    """
+    times = []
+    for _ in range(repeat):
+        b = a.copy()
+        start = time.perf_counter()
+        f(b)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def parse_args() -> argparse.Namespace:
+    """
+    Parses the command line.
+
+    Returns:
+    The options, `sizes` to time, `tile` the tile edge of the kernels and `repeat`
+    the runs per kernel and size
+    """
+    parser = argparse.ArgumentParser(description="benchmark the transpose kernels")
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[64, 256, 512, 1024, 2048, 4096]
+    )
+    parser.add_argument("--tile", type=int, default=TILE)
+    parser.add_argument("--repeat", type=int, default=5)
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    available: Dict[str, Callable] = {}
+    for name, f in kernels(args.tile).items():
+        try:
+            # also triggers the compilation of the numba kernels
+            f(np.zeros((2, 2)))
+            available[name] = f
+        except ImportError as e:
+            print(f"skipping {name}: {e}")
+
+    print(f"{'n':>6} {'MiB':>7} {'kernel':>14} {'seconds':>10} {'speedup':>8}")
+    for n in args.sizes:
+        a = np.random.default_rng(n).random((n, n))
+        assert (local_transpose(a) == a.T).all()
+        times: List[float] = []
+        for name, f in available.items():
+            seconds = best_time(a, f, args.repeat)
+            times.append(seconds)
+            print(
+                f"{n:>6} {a.nbytes / 2**20:>7.2f} {name:>14} {seconds:>10.5f} "
+                f"{times[0] / seconds:>8.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
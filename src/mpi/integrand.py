@@ -0,0 +1,249 @@
+"""
+Turn a user-supplied, single-line expression in x into a callable that evaluates it
+on whole NumPy arrays.
+
+The Riemann-sum programs `exec` "def f(x): return <expression>" and then either call
+f once per abscissa or wrap it in `np.vectorize`, both of which run the interpreter
+once per point. Most expressions a user types in (polynomials, exp, sin, sqrt, ...)
+are just as valid on an array as on a float, so `create_function_on_process`
+compiles the expression a second time against NumPy versions of the math functions
+that compute the same values (ARRAY_FUNCTIONS) and checks on a few probe points
+that the array evaluation agrees with the scalar one, which uses math itself.
+Only expressions that cannot be evaluated on arrays, e.g. `x if x > 0 else -x`, fall
+back to a chunked, per-element loop.
+
+Example:
+    >>> f = create_function_on_process("math.sin(x) ** 2 + x")
+    >>> f.vectorized
+    True
+    >>> f(np.array([0.0, 1.0])).round(4).tolist()
+    [0.0, 1.7081]
+    >>> create_function_on_process("x if x > 0 else -x").vectorized
+    False
+
+Date: 10/18/2026
+Author: Djamil Lakhdar-Hamina
+
+"""
+
+import ast
+import math
+from types import SimpleNamespace
+from typing import Callable, Dict
+
+import numpy as np
+
+
+def _log(x, base=math.e):
+    """
+    math.log on arrays, the natural logarithm or, given a base, log(x) / log(base).
+    """
+    if base is math.e:
+        return np.log(x)
+    return np.log(x) / np.log(base)
+
+
+# the math functions whose NumPy counterpart computes the same values on arrays
+# (and accepts the same arguments); every other math name keeps the math function,
+# so an expression using it falls back to the per-element loop
+ARRAY_FUNCTIONS = {
+    "acos": np.arccos,
+    "acosh": np.arccosh,
+    "asin": np.arcsin,
+    "asinh": np.arcsinh,
+    "atan": np.arctan,
+    "atan2": np.arctan2,
+    "atanh": np.arctanh,
+    "cbrt": np.cbrt,
+    "ceil": np.ceil,
+    "copysign": np.copysign,
+    "cos": np.cos,
+    "cosh": np.cosh,
+    "degrees": np.degrees,
+    "exp": np.exp,
+    "exp2": np.exp2,
+    "expm1": np.expm1,
+    "fabs": np.fabs,
+    "floor": np.floor,
+    "hypot": np.hypot,
+    "log": _log,
+    "log10": np.log10,
+    "log1p": np.log1p,
+    "log2": np.log2,
+    "pow": np.power,
+    "radians": np.radians,
+    "sin": np.sin,
+    "sinh": np.sinh,
+    "sqrt": np.sqrt,
+    "tan": np.tan,
+    "tanh": np.tanh,
+    "trunc": np.trunc,
+}
+
+# the probe points on which array and scalar evaluation have to agree
+PROBE = np.array([0.375, 0.8125, 1.25, 2.6875])
+
+# number of points the per-element fallback converts at a time
+CHUNK_SIZE = 1 << 16
+
+
+def scalar_namespace() -> Dict[str, object]:
+    """
+    The globals user expressions are evaluated against point by point: NumPy under
+    `np`, the math module and the bare math names.
+
+    Returns:
+    A dict usable as the globals of `exec`
+    """
+    functions = {name: getattr(math, name) for name in dir(math) if name[0] != "_"}
+    return dict(functions, math=math, np=np, numpy=np)
+
+
+def array_namespace() -> Dict[str, object]:
+    """
+    The globals user expressions are compiled against for whole arrays: like
+    `scalar_namespace`, with the math functions of ARRAY_FUNCTIONS replaced by their
+    NumPy counterparts.
+
+    Returns:
+    A dict usable as the globals of `exec`
+    """
+    namespace = scalar_namespace()
+    functions = {name: namespace[name] for name in namespace if hasattr(math, name)}
+    functions.update(ARRAY_FUNCTIONS)
+    namespace.update(functions, math=SimpleNamespace(**functions), abs=np.abs)
+    return namespace
+
+
+def is_single_line(expression: str) -> bool:
+    """
+    Takes a string expression and checks if the string is one-line by counting
+    /n (newline) characters.
+
+    Parameters:
+    - expression: the function body in string form
+
+    Returns:
+    A boolean indicating if function body is single-lined (true)
+
+    """
+    return expression.count("\n") == 0
+
+
+def create_function_string_from_user_input() -> str:
+    """
+    Dynamically create a single-lined function string from user input.
+
+    Parameters:
+
+    Returns:
+    A single-lined function of form f(x): return expression
+    """
+    print("Enter a single-lined function body: ")
+    function_string = input()
+    assert is_single_line(function_string)
+    return function_string
+
+
+def compile_scalar_function(function_string: str, array: bool = False) -> Callable:
+    """
+    Compiles "def f(x): return <function_string>" against `scalar_namespace`, or
+    `array_namespace` when array is set.
+
+    Parameters:
+    - function_string: string or body of function
+    - array: whether to compile against the NumPy versions of the math functions
+
+    Returns:
+    The function with body given
+    """
+    namespace = array_namespace() if array else scalar_namespace()
+    exec(f"def f(x): return {function_string}", namespace)
+    return namespace["f"]
+
+
+def depends_on_x(function_string: str) -> bool:
+    """
+    Checks whether the expression mentions x at all.
+
+    Parameters:
+    - function_string: string or body of function
+
+    Returns:
+    False for constant expressions such as "2 * pi"
+    """
+    tree = ast.parse(function_string, mode="eval")
+    return any(isinstance(node, ast.Name) and node.id == "x" for node in ast.walk(tree))
+
+
+def chunked_vectorize(f: Callable, chunk_size: int = CHUNK_SIZE) -> Callable:
+    """
+    Applies a scalar function element by element, chunk_size points at a time, so the
+    intermediate object array never grows beyond one chunk.
+
+    Parameters:
+    - f: a function of one float
+    - chunk_size: number of points converted at a time
+
+    Returns:
+    A function mapping a float array to a float array of the same shape
+    """
+    ufunc = np.frompyfunc(f, 1, 1)
+
+    def fvec(x: np.ndarray) -> np.ndarray:
+        x = np.asarray(x, dtype=float)
+        out = np.empty(x.shape, dtype=float)
+        flat_x, flat_out = x.reshape(-1), out.reshape(-1)
+        for start in range(0, flat_x.size, chunk_size):
+            flat_out[start : start + chunk_size] = ufunc(
+                flat_x[start : start + chunk_size]
+            )
+        return out
+
+    return fvec
+
+
+def create_function_on_process(function_string: str) -> Callable:
+    """
+    Compiles a function from a function string on a process. The returned function
+    evaluates whole arrays at once when the expression allows it and point by point
+    otherwise; its `vectorized` attribute tells which.
+
+    Parameters:
+    - function_string: string or body of function
+
+    Returns:
+    The function with body given, taking and returning float arrays
+    """
+    f = compile_scalar_function(function_string)
+    farray = compile_scalar_function(function_string, array=True)
+
+    if not depends_on_x(function_string):
+        value = float(f(0.0))
+
+        def fvec(x: np.ndarray) -> np.ndarray:
+            return np.full(np.shape(x), value)
+
+        fvec.vectorized = True
+        return fvec
+
+    with np.errstate(all="ignore"):
+        try:
+            expected = np.array([f(float(p)) for p in PROBE], dtype=float)
+        except Exception:
+            # the expression fails on the probe points themselves, so there is
+            # nothing to compare against: keep the exact per-element semantics
+            expected = None
+        try:
+            result = np.asarray(farray(PROBE.copy()), dtype=float)
+            vectorized = (
+                expected is not None
+                and result.shape == PROBE.shape
+                and np.allclose(result, expected, equal_nan=True)
+            )
+        except Exception:
+            vectorized = False
+
+    fvec = farray if vectorized else chunked_vectorize(f)
+    fvec.vectorized = vectorized
+    return fvec
@@ -0,0 +1,218 @@
+"""
+Opt-in Numba engine for the Riemann-sum programs.
+
+`riemann_kernel` turns a user expression into one compiled function that evaluates
+the expression and accumulates the left Riemann sum in a single fused loop,
+`numba.njit(fastmath=True, parallel=True)` with `prange` over the partitions, so no
+array of abscissae or function values is ever built.
+
+Numba's on-disk cache only works for functions defined in a file, so the kernel is
+written out as a small module named after a hash of the normalised expression, e.g.
+~/.cache/vhpc/jit/riemann_<hash>.py, and compiled with `cache=True`. A later run
+with the same expression (even spelled with different whitespace) imports the same
+module and loads the machine code from __pycache__ instead of compiling again. Set
+VHPC_JIT_CACHE to put the cache somewhere else, e.g. on a shared file system.
+
+Numba is an optional dependency: `pip install vhpc[jit]`.
+
+Example:
+    >>> kernel = riemann_kernel("x**2")
+    >>> round(kernel(0.0, 1e-3, 1000), 10)  # left Riemann sum of x**2 on [0, 1]
+    0.3328335
+
+Date: 10/18/2026
+Author: Djamil Lakhdar-Hamina
+
+"""
+
+import argparse
+import ast
+import hashlib
+import importlib.util
+import os
+import pickle
+import sys
+import tempfile
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable
+
+from mpi4py import MPI
+
+try:
+    import numba
+except ImportError:  # pragma: no cover - exercised only without numba installed
+    numba = None
+
+# bump when KERNEL_TEMPLATE changes so stale cache files are not picked up
+KERNEL_VERSION = 1
+
+KERNEL_TEMPLATE = '''"""
+Generated by vhpc.mpi.jit for the expression {expression!r}
+"""
+
+import math
+from math import *  # noqa: F401,F403 - the expression may use bare math names
+
+import numpy as np  # noqa: F401
+from numba import njit, prange
+
+
+@njit(fastmath=True, cache=True)
+def f(x):
+    return {expression}
+
+
+@njit(fastmath=True, parallel=True, cache=True)
+def riemann_left(start, delta_x, count):
+    total = 0.0
+    for i in prange(count):
+        total += f(start + i * delta_x)
+    return total * delta_x
+'''
+
+
+def cache_dir() -> Path:
+    """
+    The directory holding the generated kernel modules.
+
+    Returns:
+    $VHPC_JIT_CACHE if set, ~/.cache/vhpc/jit otherwise
+    """
+    default = Path.home() / ".cache" / "vhpc" / "jit"
+    return Path(os.environ.get("VHPC_JIT_CACHE", default))
+
+
+def expression_key(function_string: str) -> str:
+    """
+    A hash of the expression that ignores formatting: "x**2" and "x ** 2" share it.
+
+    Parameters:
+    - function_string: string or body of function
+
+    Returns:
+    A hex digest naming the kernel module
+    """
+    normalized = ast.dump(ast.parse(function_string.strip(), mode="eval"))
+    payload = f"{KERNEL_VERSION}:{normalized}".encode()
+    return hashlib.sha256(payload).hexdigest()[:32]
+
+
+def write_kernel_module(function_string: str) -> Path:
+    """
+    Writes the kernel module for an expression unless it already exists. The file is
+    written to a temporary name and renamed, so processes racing on a shared cache
+    never see a half-written module.
+
+    Parameters:
+    - function_string: string or body of function
+
+    Returns:
+    The path of the module
+    """
+    directory = cache_dir()
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / f"riemann_{expression_key(function_string)}.py"
+    if not path.exists():
+        source = KERNEL_TEMPLATE.format(expression=f"({function_string.strip()})")
+        fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        with os.fdopen(fd, "w") as file:
+            file.write(source)
+        os.replace(tmp, path)
+    return path
+
+
+@lru_cache(maxsize=None)
+def riemann_kernel(function_string: str) -> Callable[[float, float, int], float]:
+    """
+    The compiled fused kernel for an expression.
+
+    Parameters:
+    - function_string: string or body of function
+
+    Returns:
+    riemann_left(start, delta_x, count), the left Riemann sum of f over the count
+    partitions of width delta_x starting at start
+    """
+    if numba is None:
+        raise ImportError("the JIT engine needs numba: pip install vhpc[jit]")
+    path = write_kernel_module(function_string)
+    name = f"vhpc_jit_{path.stem}"
+    module = sys.modules.get(name)
+    if module is None:
+        spec = importlib.util.spec_from_file_location(name, path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        sys.modules[name] = module
+    return module.riemann_left
+
+
+def riemann_kernel_on_processes(
+    function_string: str, comm: "MPI.Comm", root: int = 0
+) -> Callable[[float, float, int], float]:
+    """
+    Compiles the kernel on root first and lets the other processes load it from the
+    disk cache, instead of every process compiling the same code at once. Assumes
+    the cache directory is visible to all processes; otherwise each node simply
+    compiles once and caches its own copy.
+
+    Parameters:
+    - function_string: string or body of function
+    - comm: the communicator whose processes need the kernel
+    - root: the process that compiles
+
+    Returns:
+    The kernel, as from `riemann_kernel`; raises on every process what compiling it
+    raised on root
+    """
+    kernel = error = None
+    if comm.Get_rank() == root:
+        try:
+            kernel = riemann_kernel(function_string)
+            # trigger compilation (and the cache write) with the types used later on
+            kernel(0.0, 1.0, 1)
+        except Exception as e:
+            error = e
+            try:
+                pickle.dumps(e)
+            except Exception:
+                error = RuntimeError(f"{type(e).__name__}: {e}")
+    # every process learns whether root succeeded, so none of them waits for a
+    # kernel that will never be compiled
+    error = comm.bcast(error, root=root)
+    if error is not None:
+        raise error
+    if kernel is None:
+        kernel = riemann_kernel(function_string)
+    return kernel
+
+
+def add_jit_argument(parser: argparse.ArgumentParser) -> argparse.ArgumentParser:
+    """
+    Adds the --jit option of the Riemann-sum programs, set when the integrand and
+    the summation loop should be compiled with Numba.
+
+    Parameters:
+    - parser: the program's parser
+
+    Returns:
+    parser
+    """
+    parser.add_argument(
+        "--jit",
+        action="store_true",
+        help="compile f and the summation loop with Numba, needs vhpc[jit]",
+    )
+    return parser
+
+
+def riemann_parser() -> argparse.ArgumentParser:
+    """
+    The command line parser shared by the Riemann-sum programs, with --jit; programs
+    with more options add them to it.
+
+    Returns:
+    The parser
+    """
+    parser = argparse.ArgumentParser(description="left Riemann sum of f on [a, b]")
+    return add_jit_argument(parser)
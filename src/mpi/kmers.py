@@ -0,0 +1,296 @@
+"""
+Distributed k-mer counting.
+
+The sequence is shared among the processes in contiguous slices, in rank order, as
+2-bit codes (`vhpc.mpi.packed`). A k-mer is encoded as the integer whose base-4
+digits are its codes, first base most significant, so k <= MAX_K bases fit in a
+uint64. The steps:
+
+1. Overlap: the k-mers starting in the last k - 1 bases of a slice end in the next
+   one, so every process receives the first k - 1 bases of its right neighbour
+   with one `Sendrecv` (an `allgather` of the slice heads when some slice is
+   shorter than that).
+2. Encoding: the k-mers of a chunk are built by doubling, 2-mers from pairs of
+   1-mers, 4-mers from pairs of 2-mers and so on, combining the windows the binary
+   digits of k call for, i.e. about 2 log2(k) vectorized passes over the chunk
+   instead of a rolling update per base.
+3. Pre-aggregation: a sort of the chunk's k-mers and a reduction of equal runs
+   gives (k-mer, count) pairs, so a k-mer is sent once per chunk however often
+   it occurs.
+4. Shuffle: every k-mer has an owner, a multiplicative hash of it modulo the number
+   of processes; the pairs are ordered by owner and exchanged with `Alltoallv`.
+5. Merge: an owner sorts what it received together with its table so far and sums
+   equal runs again, once what it received outgrows the table.
+
+The sequence is processed chunk by chunk, so apart from its slice a process holds a
+few arrays of `chunk_bases` elements and its share of the distinct k-mers: memory
+per process scales as 1/p.
+
+Example:
+    >>> from vhpc.mpi.packed import encode
+    >>> codes = encode(np.frombuffer(b"GATTACAGATTACA", dtype=np.uint8), "ACGT")
+    >>> kmers, counts = count_kmers(codes, 3, MPI.COMM_SELF)
+    >>> [(decode_kmer(int(km), 3, "ACGT"), int(c)) for km, c in zip(kmers, counts)][:4]
+    [('ACA', 2), ('AGA', 1), ('ATT', 2), ('CAG', 1)]
+
+Date: 10/18/2026
+Author: Djamil Lakhdar-Hamina
+
+"""
+
+from typing import List, Optional, Tuple
+
+import numpy as np
+from mpi4py import MPI
+
+from vhpc.mpi.packed import PackedHeader, read_packed
+
+# the longest k-mer that fits in 64 bits
+MAX_K = 32
+
+# the k-mers a process encodes and shuffles at a time, 4 Mi
+DEFAULT_CHUNK_BASES = 1 << 22
+
+# Knuth's multiplicative hash constant, 2**64 divided by the golden ratio
+HASH_MULTIPLIER = np.uint64(0x9E3779B97F4A7C15)
+
+
+def kmer_codes(codes: np.ndarray, k: int) -> np.ndarray:
+    """
+    The integer encodings of all k-mers of a sequence.
+
+    Parameters:
+    - codes: the sequence as a uint8 array of codes 0-3
+    - k: the k-mer length, 1 to MAX_K
+
+    Returns:
+    A uint64 array of codes.size - k + 1 k-mers, element i for the k-mer starting
+    at base i
+    """
+    if not 1 <= k <= MAX_K:
+        raise ValueError(f"k must be between 1 and {MAX_K}")
+    n = codes.size - k + 1
+    if n <= 0:
+        return np.empty(0, dtype=np.uint64)
+    # windows[i] is the width-bases k-mer at i; result the k-mers of width done
+    windows, width = codes.astype(np.uint64), 1
+    result, done = None, 0
+    while True:
+        if k & width:
+            if result is None:
+                result, done = windows, width
+            else:
+                m = codes.size - done - width + 1
+                shift = np.uint64(2 * width)
+                result = (result[:m] << shift) | windows[done : done + m]
+                done += width
+        if done == k:
+            return result[:n]
+        m = codes.size - 2 * width + 1
+        shift = np.uint64(2 * width)
+        windows = (windows[:m] << shift) | windows[width : width + m]
+        width *= 2
+
+
+def decode_kmer(kmer: int, k: int, alphabet="ACGT") -> str:
+    """
+    The letters of an encoded k-mer.
+    """
+    if isinstance(alphabet, bytes):
+        alphabet = alphabet.decode("ascii")
+    return "".join(alphabet[(kmer >> 2 * (k - 1 - i)) & 3] for i in range(k))
+
+
+def owners(kmers: np.ndarray, size: int) -> np.ndarray:
+    """
+    The process that counts each k-mer: the high bits of a multiplicative hash,
+    which mix all of the k-mer's bases, modulo the number of processes.
+    """
+    return ((kmers * HASH_MULTIPLIER) >> np.uint64(32)) % np.uint64(size)
+
+
+def sort_reduce(
+    kmers: np.ndarray, counts: Optional[np.ndarray] = None
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Sums the counts of equal k-mers.
+
+    Parameters:
+    - kmers: a uint64 array
+    - counts: the int64 count of each, one each when None
+
+    Returns:
+    A tuple (kmers, counts), kmers sorted and distinct
+    """
+    if counts is None:
+        kmers, counts = np.unique(kmers, return_counts=True)
+        return kmers, counts.astype(np.int64)
+    order = np.argsort(kmers)
+    kmers, counts = kmers[order], counts[order]
+    if kmers.size == 0:
+        return kmers, counts
+    starts = np.flatnonzero(np.r_[True, kmers[1:] != kmers[:-1]])
+    return kmers[starts], np.add.reduceat(counts, starts)
+
+
+def halo(codes: np.ndarray, k: int, comm: "MPI.Comm") -> np.ndarray:
+    """
+    The k - 1 bases that follow the calling process's slice, fewer on the last
+    processes. Collective over comm.
+
+    Parameters:
+    - codes: the calling process's slice of the sequence
+    - k: the k-mer length
+    - comm: the communicator holding the slices in rank order
+
+    Returns:
+    A uint8 array of codes
+    """
+    size, rank = comm.Get_size(), comm.Get_rank()
+    need = k - 1
+    head = np.ascontiguousarray(codes[:need], dtype=np.uint8)
+    lengths = comm.allgather(codes.size)
+    if all(length >= need for length in lengths[1:]):
+        received = np.empty(need if rank < size - 1 else 0, dtype=np.uint8)
+        left = rank - 1 if rank > 0 else MPI.PROC_NULL
+        right = rank + 1 if rank < size - 1 else MPI.PROC_NULL
+        comm.Sendrecv(head, dest=left, recvbuf=received, source=right)
+        return received
+    # some slice is shorter than k - 1, the bases may come from several processes
+    heads = comm.allgather(head)
+    return np.concatenate([heads[r] for r in range(rank + 1, size)] + [head[:0]])[:need]
+
+
+def shuffle(
+    kmers: np.ndarray, counts: np.ndarray, comm: "MPI.Comm"
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Sends every (k-mer, count) pair to the k-mer's owner. Collective over comm.
+
+    Returns:
+    A tuple (kmers, counts) of the pairs the calling process owns
+    """
+    size = comm.Get_size()
+    destination = owners(kmers, size)
+    order = np.argsort(destination)
+    kmers, counts = kmers[order], counts[order]
+    sendcounts = np.bincount(destination, minlength=size).astype(np.int64)
+    recvcounts = np.empty(size, dtype=np.int64)
+    comm.Alltoall(sendcounts, recvcounts)
+    sdispls = np.zeros(size, dtype=np.int64)
+    rdispls = np.zeros(size, dtype=np.int64)
+    np.cumsum(sendcounts[:-1], out=sdispls[1:])
+    np.cumsum(recvcounts[:-1], out=rdispls[1:])
+
+    received_kmers = np.empty(recvcounts.sum(), dtype=np.uint64)
+    received_counts = np.empty(recvcounts.sum(), dtype=np.int64)
+    comm.Alltoallv(
+        [kmers, (sendcounts, sdispls), MPI.UINT64_T],
+        [received_kmers, (recvcounts, rdispls), MPI.UINT64_T],
+    )
+    comm.Alltoallv(
+        [counts, (sendcounts, sdispls), MPI.INT64_T],
+        [received_counts, (recvcounts, rdispls), MPI.INT64_T],
+    )
+    return received_kmers, received_counts
+
+
+def count_kmers(
+    codes: np.ndarray,
+    k: int,
+    comm: "MPI.Comm",
+    chunk_bases: int = DEFAULT_CHUNK_BASES,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Counts the k-mers of a sequence shared among the processes. Collective over
+    comm.
+
+    Parameters:
+    - codes: the calling process's slice of the sequence, as 2-bit codes; the
+      slices of the processes in rank order make up the sequence
+    - k: the k-mer length, 1 to MAX_K
+    - comm: the communicator
+    - chunk_bases: the k-mers encoded and shuffled at a time
+
+    Returns:
+    A tuple (kmers, counts) of the k-mers the calling process owns, sorted, and
+    their int64 counts
+    """
+    if not 1 <= k <= MAX_K:
+        raise ValueError(f"k must be between 1 and {MAX_K}")
+    extended = np.concatenate(
+        (codes.astype(np.uint8, copy=False), halo(codes, k, comm))
+    )
+    # the k-mers starting in the slice
+    starts = max(0, extended.size - k + 1)
+    rounds = comm.allreduce(-(-starts // chunk_bases), op=MPI.MAX)
+    table = (np.empty(0, dtype=np.uint64), np.empty(0, dtype=np.int64))
+    # received pairs not merged yet; merging them only once they outgrow the table
+    # sorts every pair O(log(rounds)) times while holding at most twice the table
+    pending: List[Tuple[np.ndarray, np.ndarray]] = []
+    pending_size = 0
+    for r in range(rounds):
+        first = min(r * chunk_bases, starts)
+        last = min(first + chunk_bases, starts)
+        kmers = kmer_codes(extended[first : last + k - 1], k)
+        pending.append(shuffle(*sort_reduce(kmers), comm))
+        pending_size += pending[-1][0].size
+        if pending_size > table[0].size or r == rounds - 1:
+            pending.append(table)
+            table = sort_reduce(
+                np.concatenate([pair[0] for pair in pending]),
+                np.concatenate([pair[1] for pair in pending]),
+            )
+            pending, pending_size = [], 0
+    return table
+
+
+def count_kmers_file(
+    filename: str,
+    k: int,
+    comm: "MPI.Comm",
+    chunk_bases: int = DEFAULT_CHUNK_BASES,
+    verify: bool = True,
+) -> Tuple[PackedHeader, np.ndarray, np.ndarray]:
+    """
+    Counts the k-mers of a packed sequence file (`vhpc.mpi.packed`). Collective
+    over comm.
+
+    Parameters:
+    - filename: the packed file
+    - k: the k-mer length, 1 to MAX_K
+    - comm: the communicator sharing the file
+    - chunk_bases: the k-mers encoded and shuffled at a time
+    - verify: whether to check the payload against the header's checksum
+
+    Returns:
+    A tuple (header, kmers, counts), see `count_kmers`
+    """
+    header, _, codes = read_packed(filename, comm, verify)
+    return (header, *count_kmers(codes, k, comm, chunk_bases))
+
+
+def top_kmers(
+    kmers: np.ndarray, counts: np.ndarray, n: int, comm: "MPI.Comm", root: int = 0
+) -> Optional[List[Tuple[int, int]]]:
+    """
+    The n most frequent k-mers over all processes. Collective over comm.
+
+    Parameters:
+    - kmers, counts: the calling process's k-mers, from `count_kmers`
+    - n: the number of k-mers wanted
+    - comm: the communicator
+    - root: the process receiving them
+
+    Returns:
+    A list of (k-mer, count), most frequent first and ties by k-mer, on root, None
+    elsewhere
+    """
+    # the n largest of every process include the n largest overall
+    best = np.argsort(-counts, kind="stable")[:n]
+    local = list(zip(kmers[best].tolist(), counts[best].tolist()))
+    gathered = comm.gather(local, root=root)
+    if gathered is None:
+        return None
+    merged = [pair for pairs in gathered for pair in pairs]
+    return sorted(merged, key=lambda pair: (-pair[1], pair[0]))[:n]
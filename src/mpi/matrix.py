@@ -0,0 +1,475 @@
+"""
+A dense matrix stored in one flat, row-major `array.array`.
+
+The list-of-lists `Matrix` of the matrix-multiplication examples paid for every
+element access with a chain of `isinstance` checks and a tuple, and had to be
+pickled to travel between processes. This one keeps the same indexing API on top of
+a single typed buffer described by an offset and (row, column) strides:
+
+- `A[i, j]` is one multiply-add into the buffer, negative indices included;
+- rows and columns used by the arithmetic are taken as strided slices of the
+  buffer, so the inner loops run over arrays instead of calling `__getitem__`;
+- slicing (`A[i, :]`, `A[:, j]`, `A[1:3, ::2]`) and `T()` return views, matrices
+  with their own offset and strides over the same buffer, in O(1) and without
+  copying a single element. A view and the matrix it came from behave like
+  independent copies all the same: a matrix that shares its buffer copies its
+  elements to a buffer of its own before it is first written to (copy-on-write);
+- the buffer is exported through `__buffer__` (Python 3.12+) and DLPack, so a
+  matrix can be passed to `comm.Send`, `comm.Bcast`, ... as is, without pickling.
+
+Integer entries are stored as 64-bit integers ("q") and anything else as doubles
+("d"); pass a typecode to choose.
+
+`A * B` runs one of several kernels, chosen by `Matrix.kernel` or by calling
+`matmul(A, B, kernel)` directly:
+
+- "naive": the i-j-k triple loop through `A[i, k] * B[k, j]`, which walks B
+  column-wise; kept as the reference;
+- "transposed": every column of B is gathered once, so each entry is a dot
+  product of two contiguous arrays;
+- "blocked": the same dot products computed tile by tile, TILE rows by TILE
+  columns by TILE terms at a time, so the pieces of A and B in use stay in cache;
+- "numpy": a zero-copy NumPy view of both buffers and `np.matmul` (BLAS);
+- "numba": a compiled, parallel i-k-j loop, if Numba is installed;
+- "auto" (the default): "numpy" when NumPy is installed, "transposed" otherwise.
+
+Example:
+    >>> A = Matrix([[1, 2, 3], [3, 4, 5]])
+    >>> A[1, -1], A.typecode, A.dimensions
+    (5, 'q', (2, 3))
+    >>> print(A * A.T())
+    Matrix: 2x2
+    14 26
+    26 50
+    >>> column = A[:, 1]  # a view, nothing is copied
+    >>> column.data is A.data
+    True
+    >>> column[0, 0] = 20  # the first write copies
+    >>> column.data is A.data, A[0, 1]
+    (False, 2)
+
+Date: 10/18/2026
+Author: Djamil Lakhdar-Hamina
+
+"""
+
+from array import array
+from functools import lru_cache
+from itertools import chain
+from operator import add, mul
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised only without numpy installed
+    np = None
+
+# the DLPack device type of host memory
+DLPACK_CPU = 1
+
+# PyBUF_WRITABLE, the flag of a buffer request that intends to write
+BUFFER_WRITABLE = 0x1
+
+# the tile edge of the blocked kernel: a 64-term slice of a row or column of doubles
+# is 512 bytes, so the tiles in use fit in the L1/L2 caches
+TILE = 64
+
+
+class Matrix:
+    """
+    A class representing a matrix including various attributes
+    and methods.
+
+    Attributes:
+        dimensions (tuple(int,int)): dimension of matrix
+        data (array.array): the flat buffer holding the elements
+        offset (int): the position of element (0, 0) in data
+        strides (tuple(int,int)): the distance in data between neighbouring rows
+        and neighbouring columns
+        shared (bool): whether data may be seen by another matrix, in which case
+        it is copied before the first write
+
+    Methods:
+        setitem: set the item using a tuple
+        getitem: get the item using a tuple or slice
+        str: produce a string rep for print
+        T: produce transpose of matrix
+        equal: dimensional and elementwise
+        add: add two matrices
+        multiply: multiply two matrices
+
+    """
+
+    __slots__ = ("data", "dimensions", "offset", "strides", "shared")
+
+    # the matmul kernel used by `*`, one of MATMUL_KERNELS
+    kernel = "auto"
+
+    def __init__(self, A: Sequence[Sequence] = [[]], typecode: Optional[str] = None):
+        """
+        Parameters:
+        - A: the rows of the matrix
+        - typecode: the `array` typecode of the elements, "q" when all entries are
+          integers and "d" otherwise by default
+        """
+        m, n = len(A), len(A[0])
+        if any(len(row) != n for row in A):
+            raise ValueError("all rows of a matrix must have the same length")
+        flat = list(chain.from_iterable(A))
+        if typecode is None:
+            typecode = "q" if all(type(x) is int for x in flat) else "d"
+        self.data = array(typecode, flat)
+        self.dimensions = (m, n)
+        self.offset = 0
+        self.strides = (n, 1)
+        self.shared = False
+
+    @classmethod
+    def from_buffer(
+        cls,
+        data: array,
+        dimensions: Tuple[int, int],
+        offset: int = 0,
+        strides: Optional[Tuple[int, int]] = None,
+    ) -> "Matrix":
+        """
+        A matrix over existing storage, without copying it.
+
+        Parameters:
+        - data: the flat buffer
+        - dimensions: (rows, columns)
+        - offset: the position of element (0, 0) in data
+        - strides: (row stride, column stride), row-major by default
+
+        Returns:
+        The matrix
+        """
+        matrix = cls.__new__(cls)
+        matrix.data = data
+        matrix.dimensions = tuple(dimensions)
+        matrix.offset = offset
+        matrix.strides = (dimensions[1], 1) if strides is None else tuple(strides)
+        matrix.shared = False
+        return matrix
+
+    def _view(
+        self, dimensions: Tuple[int, int], offset: int, strides: Tuple[int, int]
+    ) -> "Matrix":
+        view = Matrix.from_buffer(self.data, dimensions, offset, strides)
+        view.shared = self.shared = True
+        return view
+
+    def copy(self) -> "Matrix":
+        """
+        A contiguous copy, e.g. of a view to pass to MPI.
+        """
+        data = array(self.typecode)
+        for i in range(self.dimensions[0]):
+            data.extend(self._row(i))
+        return Matrix.from_buffer(data, self.dimensions)
+
+    def _detach(self) -> None:
+        # copy-on-write: give this matrix a buffer nobody else sees
+        copy = self.copy()
+        self.data, self.offset, self.strides = copy.data, 0, copy.strides
+        self.shared = False
+
+    @classmethod
+    def zeros(cls, m: int, n: int, typecode: str = "d") -> "Matrix":
+        """
+        An m x n matrix of zeros, e.g. to receive into.
+        """
+        itemsize = array(typecode).itemsize
+        return cls.from_buffer(array(typecode, bytes(m * n * itemsize)), (m, n))
+
+    @property
+    def typecode(self) -> str:
+        return self.data.typecode
+
+    @property
+    def mat(self) -> List[list]:
+        """
+        The rows as lists, as the list-of-lists Matrix stored them.
+        """
+        return self.tolist()
+
+    def tolist(self) -> List[list]:
+        return [self._row(i).tolist() for i in range(self.dimensions[0])]
+
+    def is_contiguous(self) -> bool:
+        """
+        Whether the elements are laid out row-major without gaps, which is what the
+        buffer export needs.
+        """
+        m, n = self.dimensions
+        return (m <= 1 or self.strides[0] == n) and (n <= 1 or self.strides[1] == 1)
+
+    def _index(self, row: int, col: int) -> int:
+        m, n = self.dimensions
+        if row < 0:
+            row += m
+        if col < 0:
+            col += n
+        if not (0 <= row < m and 0 <= col < n):
+            raise IndexError("matrix index out of range")
+        return self.offset + row * self.strides[0] + col * self.strides[1]
+
+    def _strided(self, start: int, count: int, step: int) -> array:
+        stop = start + count * step
+        # a negative stride running down to element 0 has no stop index
+        return self.data[start : stop if stop >= 0 else None : step]
+
+    def _row(self, i: int) -> array:
+        start = self.offset + i * self.strides[0]
+        return self._strided(start, self.dimensions[1], self.strides[1])
+
+    def _column(self, j: int) -> array:
+        start = self.offset + j * self.strides[1]
+        return self._strided(start, self.dimensions[0], self.strides[0])
+
+    def __setitem__(self, index, value):
+        if not isinstance(index, tuple) or len(index) != 2:
+            raise IndexError("Invalid index format")
+        row, col = index
+        position = self._index(row, col)
+        if self.shared:
+            self._detach()
+            position = self._index(row, col)
+        self.data[position] = value
+
+    def __getitem__(self, index: tuple) -> "Matrix":
+        if not isinstance(index, tuple) or len(index) != 2:
+            raise TypeError("Invalid key type")
+        row, col = index
+        try:
+            # the common case, two integers, without any type dispatch
+            return self.data[self._index(row, col)]
+        except TypeError:
+            pass
+        # slices are views: the same buffer, another offset and strides
+        m, n = self.dimensions
+        rows = self._process_slice(row, m)
+        cols = self._process_slice(col, n)
+        s0, s1 = self.strides
+        offset = self.offset + rows.start * s0 + cols.start * s1
+        strides = (s0 * rows.step, s1 * cols.step)
+        return self._view((len(rows), len(cols)), offset, strides)
+
+    def _process_slice(self, key, size) -> range:
+        if isinstance(key, slice):
+            return range(*key.indices(size))
+        if not isinstance(key, int):
+            raise TypeError("Invalid key type")
+        if key < 0:
+            key += size
+        if not 0 <= key < size:
+            raise IndexError("matrix index out of range")
+        return range(key, key + 1)
+
+    def __str__(self):
+        strings = [" ".join(map(str, self._row(i))) for i in range(self.dimensions[0])]
+        values = "\n".join(strings)
+        m, n = self.dimensions
+        header = f"Matrix: {m}x{n}"
+        return "\n".join([header, values])
+
+    def T(self) -> "Matrix":
+        # a view with the strides swapped
+        m, n = self.dimensions
+        return self._view((n, m), self.offset, self.strides[::-1])
+
+    def __eq__(self, B: "Matrix") -> "Matrix":
+        assert B.dimensions == self.dimensions
+        m, _ = self.dimensions
+        return all(self._row(i) == B._row(i) for i in range(m))
+
+    def __add__(self, B: "Matrix") -> "Matrix":
+        assert self.dimensions == B.dimensions
+        m, n = self.dimensions
+        typecode = _result_typecode(self, B)
+        data = array(typecode)
+        for i in range(m):
+            data.extend(array(typecode, map(add, self._row(i), B._row(i))))
+        return Matrix.from_buffer(data, (m, n))
+
+    def __mul__(self, B: "Matrix") -> "Matrix":
+        return matmul(self, B, self.kernel)
+
+    def __buffer__(self, flags: int) -> memoryview:
+        if not self.is_contiguous():
+            raise BufferError("only contiguous matrices export their buffer, copy()")
+        if self.shared and flags & BUFFER_WRITABLE:
+            # the buffer may be written through, e.g. by comm.Recv
+            self._detach()
+        m, n = self.dimensions
+        return memoryview(self.data)[self.offset : self.offset + m * n]
+
+    def __dlpack__(self, **kwargs):
+        # before Python 3.12 a Python class cannot export a buffer itself; mpi4py
+        # accepts DLPack, which a zero-copy NumPy view of the buffer provides
+        # DLPack does not tell readers from writers, so assume a write
+        buffer = self.__buffer__(BUFFER_WRITABLE)
+        return np.frombuffer(buffer, dtype=self.typecode).__dlpack__(**kwargs)
+
+    def __dlpack_device__(self) -> Tuple[int, int]:
+        return (DLPACK_CPU, 0)
+
+
+def _result_typecode(A: Matrix, B: Matrix) -> str:
+    return A.typecode if A.typecode == B.typecode else "d"
+
+
+def matmul_naive(A: Matrix, B: Matrix) -> Matrix:
+    """
+    The i-j-k triple loop, one `__getitem__` per operand, B walked column-wise.
+    """
+    m, n = A.dimensions
+    _, s = B.dimensions
+    data = array(_result_typecode(A, B))
+    for i in range(m):
+        for j in range(s):
+            val = 0
+            for k in range(n):
+                val += A[i, k] * B[k, j]
+            data.append(val)
+    return Matrix.from_buffer(data, (m, s))
+
+
+def matmul_transposed(A: Matrix, B: Matrix) -> Matrix:
+    """
+    Dot products of the rows of A with the columns of B, each column gathered once
+    instead of once per row of A.
+    """
+    m, _ = A.dimensions
+    _, s = B.dimensions
+    columns = [B._column(j) for j in range(s)]
+    data = array(
+        _result_typecode(A, B),
+        (
+            sum(map(mul, row, column))
+            for row in map(A._row, range(m))
+            for column in columns
+        ),
+    )
+    return Matrix.from_buffer(data, (m, s))
+
+
+def matmul_blocked(A: Matrix, B: Matrix, tile: int = TILE) -> Matrix:
+    """
+    `matmul_transposed` computed tile by tile: for every slice of tile terms, the
+    partial dot products of a tile of rows with a tile of columns are added up
+    before moving on, so the slices in use stay in cache.
+    """
+    m, n = A.dimensions
+    _, s = B.dimensions
+    rows = [A._row(i) for i in range(m)]
+    columns = [B._column(j) for j in range(s)]
+    C = [[0] * s for _ in range(m)]
+    for k0 in range(0, n, tile):
+        row_slices = [row[k0 : k0 + tile] for row in rows]
+        column_slices = [column[k0 : k0 + tile] for column in columns]
+        for i0 in range(0, m, tile):
+            for j0 in range(0, s, tile):
+                tile_columns = column_slices[j0 : j0 + tile]
+                for i in range(i0, min(i0 + tile, m)):
+                    row, c = row_slices[i], C[i]
+                    for j, column in enumerate(tile_columns, j0):
+                        c[j] += sum(map(mul, row, column))
+    data = array(_result_typecode(A, B), chain.from_iterable(C))
+    return Matrix.from_buffer(data, (m, s))
+
+
+def as_ndarray(A: Matrix) -> "np.ndarray":
+    """
+    A NumPy view of a matrix, sharing its buffer, strides included.
+    """
+    itemsize = A.data.itemsize
+    return np.ndarray(
+        A.dimensions,
+        dtype=A.typecode,
+        buffer=A.data,
+        offset=A.offset * itemsize,
+        strides=tuple(stride * itemsize for stride in A.strides),
+    )
+
+
+def _from_ndarray(C: "np.ndarray", typecode: str) -> Matrix:
+    data = array(typecode)
+    data.frombytes(np.ascontiguousarray(C, dtype=typecode).tobytes())
+    return Matrix.from_buffer(data, C.shape)
+
+
+def matmul_numpy(A: Matrix, B: Matrix) -> Matrix:
+    """
+    `np.matmul` on zero-copy views of both matrices.
+    """
+    if np is None:
+        raise ImportError("the numpy kernel needs numpy")
+    C = np.matmul(as_ndarray(A), as_ndarray(B))
+    return _from_ndarray(C, _result_typecode(A, B))
+
+
+@lru_cache(maxsize=None)
+def _numba_kernel() -> Callable:
+    try:
+        import numba
+    except ImportError:
+        raise ImportError("the numba kernel needs numba: pip install vhpc[jit]")
+
+    @numba.njit(parallel=True, cache=True)
+    def kernel(a, b, c):
+        # i-k-j: the innermost loop runs along rows of b and c
+        m, n = a.shape
+        s = b.shape[1]
+        for i in numba.prange(m):
+            for k in range(n):
+                aik = a[i, k]
+                for j in range(s):
+                    c[i, j] += aik * b[k, j]
+
+    return kernel
+
+
+def matmul_numba(A: Matrix, B: Matrix) -> Matrix:
+    """
+    A compiled, parallel i-k-j loop over contiguous copies of both matrices.
+    """
+    if np is None:
+        raise ImportError("the numba kernel needs numpy")
+    typecode = _result_typecode(A, B)
+    a = np.ascontiguousarray(as_ndarray(A), dtype=typecode)
+    b = np.ascontiguousarray(as_ndarray(B), dtype=typecode)
+    c = np.zeros((a.shape[0], b.shape[1]), dtype=typecode)
+    _numba_kernel()(a, b, c)
+    return _from_ndarray(c, typecode)
+
+
+MATMUL_KERNELS: Dict[str, Callable[[Matrix, Matrix], Matrix]] = {
+    "naive": matmul_naive,
+    "transposed": matmul_transposed,
+    "blocked": matmul_blocked,
+    "numpy": matmul_numpy,
+    "numba": matmul_numba,
+}
+
+
+def matmul(A: Matrix, B: Matrix, kernel: str = "auto") -> Matrix:
+    """
+    The product A B.
+
+    Parameters:
+    - A: an m x n matrix
+    - B: an n x s matrix
+    - kernel: one of MATMUL_KERNELS or "auto"
+
+    Returns:
+    The m x s product, integer if both factors are
+    """
+    assert A.dimensions[1] == B.dimensions[0]
+    if kernel == "auto":
+        kernel = "transposed" if np is None else "numpy"
+    try:
+        f = MATMUL_KERNELS[kernel]
+    except KeyError:
+        raise ValueError(f"kernel must be 'auto' or one of {list(MATMUL_KERNELS)}")
+    return f(A, B)
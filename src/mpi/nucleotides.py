@@ -0,0 +1,205 @@
+"""
+Parallel nucleotide counting over sequence files with MPI-IO.
+
+A plain sequence or FASTA file is split into one contiguous byte range per process
+(the block layout of `vhpc.mpi.partition`), so every byte belongs to exactly one
+process. A process streams its range through a buffer of `chunk_bytes` with
+collective `Read_at_all` calls and counts every byte value of a chunk with
+`np.bincount` on its uint8 view, one sub-slice of COUNT_BLOCK bytes at a time so
+the intp copy bincount makes stays in cache. Peak memory is the chunk buffer plus a
+few small arrays, however large the file. A single `Reduce` (or `Allreduce`) of the
+256 counts gives the totals.
+
+FASTA header lines (from ">" to the end of the line) are not sequence and are left
+out. A range may start inside a header that began on another process: the bytes
+before a process's first newline are counted separately and only added once an
+`Allgather` of one state per process tells whether the previous newline was
+followed by a header.
+
+Example:
+    >>> counter = SequenceCounter()
+    >>> counter.update(np.frombuffer(b">seq1 gauc\\nGAUC\\nga", dtype=np.uint8))
+    >>> counter.update(np.frombuffer(b"uu\\n>seq2\\nAAAA\\n", dtype=np.uint8))
+    >>> letter_counts(counter.resolve(MPI.COMM_SELF))
+    {'A': 6, 'C': 1, 'G': 2, 'U': 3}
+
+Date: 10/18/2026
+Author: Djamil Lakhdar-Hamina
+
+"""
+
+from typing import Dict, Optional
+
+import numpy as np
+from mpi4py import MPI
+
+from vhpc.mpi.partition import block_range
+
+# the buffer a process reads its range through, 64 MiB
+DEFAULT_CHUNK_BYTES = 64 << 20
+
+# the bytes counted by one np.bincount call, which copies them to intp first
+COUNT_BLOCK = 1 << 20
+
+NEWLINE = ord("\n")
+HEADER = ord(">")
+
+
+def byte_counts(data: np.ndarray, counts: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    How often every byte value occurs in data.
+
+    Parameters:
+    - data: a uint8 array
+    - counts: an int64 array of 256 counts to add to, allocated when None
+
+    Returns:
+    counts, counts[b] the occurrences of byte b
+    """
+    if counts is None:
+        counts = np.zeros(256, dtype=np.int64)
+    for start in range(0, data.size, COUNT_BLOCK):
+        counts += np.bincount(data[start : start + COUNT_BLOCK], minlength=256)
+    return counts
+
+
+class SequenceCounter:
+    """
+    Byte counts of consecutive chunks of one byte range of a sequence file, leaving
+    out FASTA header lines.
+    """
+
+    def __init__(self):
+        self.counts = np.zeros(256, dtype=np.int64)
+        # the bytes before the range's first newline, which are sequence unless the
+        # range starts inside a header
+        self.prefix = np.zeros(256, dtype=np.int64)
+        # whether the chunk read last ended inside a header, None until a newline
+        # or a header has been seen
+        self.in_header: Optional[bool] = None
+
+    def update(self, data: np.ndarray) -> None:
+        """
+        Counts the next chunk of the range.
+
+        Parameters:
+        - data: the chunk, a uint8 array
+        """
+        chunk = byte_counts(data)
+        # the common cases, sequence lines only or a sequence without newlines,
+        # need no search for lines
+        if self.in_header is False and not chunk[HEADER]:
+            self.counts += chunk
+            return
+        if self.in_header is None and not chunk[HEADER] and not chunk[NEWLINE]:
+            self.prefix += chunk
+            return
+        newlines = np.flatnonzero(data == NEWLINE)
+        headers = np.flatnonzero(data == HEADER)
+        # the first line of the chunk, up to its first newline
+        first = newlines[0] if newlines.size else data.size
+        if self.in_header is None:
+            start = first
+            if headers.size and headers[0] < first:
+                # a header starts on the line, only what precedes it is uncertain
+                start = headers[0]
+            self.prefix += byte_counts(data[:start])
+        elif self.in_header:
+            start = first
+        else:
+            start = 0
+        self.counts += chunk - byte_counts(data[:start])
+        headers = headers[headers >= start]
+        ends = np.searchsorted(newlines, headers)
+        # a ">" inside a header line is part of it, not the start of another one
+        first_on_line = np.ones(headers.size, dtype=bool)
+        first_on_line[1:] = ends[1:] != ends[:-1]
+        for h, end in zip(headers[first_on_line], ends[first_on_line]):
+            end = newlines[end] if end < newlines.size else data.size
+            self.counts -= byte_counts(data[h:end])
+        # a header that is still open at the end of the chunk
+        if headers.size and (not newlines.size or headers[-1] > newlines[-1]):
+            self.in_header = True
+        elif newlines.size:
+            self.in_header = False
+
+    def resolve(self, comm: "MPI.Comm") -> np.ndarray:
+        """
+        Adds the bytes before the range's first newline, once it is known whether
+        they belong to a header. Collective over comm, whose ranks must hold the
+        ranges of the file in order.
+
+        Returns:
+        The byte counts of the calling process's range
+        """
+        states = comm.allgather(self.in_header)
+        # the state at the start of the range is the last known one before it, the
+        # file itself starts outside any header
+        in_header = next(
+            (s for s in reversed(states[: comm.Get_rank()]) if s is not None), False
+        )
+        if not in_header:
+            self.counts += self.prefix
+        self.prefix[:] = 0
+        return self.counts
+
+
+def count_file(
+    filename: str,
+    comm: "MPI.Comm",
+    chunk_bytes: int = DEFAULT_CHUNK_BYTES,
+    root: Optional[int] = None,
+) -> Optional[np.ndarray]:
+    """
+    Counts every byte value of the sequence in a file, FASTA headers left out.
+    Collective over comm.
+
+    Parameters:
+    - filename: a plain sequence or FASTA file
+    - comm: the communicator sharing the file
+    - chunk_bytes: the bytes a process reads at a time
+    - root: the process receiving the counts, all of them when None
+
+    Returns:
+    The int64 array of the 256 counts on root (everywhere when root is None), None
+    elsewhere
+    """
+    size, rank = comm.Get_size(), comm.Get_rank()
+    fh = MPI.File.Open(comm, filename, MPI.MODE_RDONLY)
+    offset, count = block_range(fh.Get_size(), size, rank)
+    # every process calls Read_at_all as often as the one with the largest range
+    chunks = comm.allreduce(-(-count // chunk_bytes), op=MPI.MAX)
+    buffer = np.empty(min(chunk_bytes, count), dtype=np.uint8)
+    counter = SequenceCounter()
+    for c in range(chunks):
+        start = min(c * chunk_bytes, count)
+        data = buffer[: min(chunk_bytes, count - start)]
+        fh.Read_at_all(offset + start, data)
+        counter.update(data)
+    fh.Close()
+
+    counts = counter.resolve(comm)
+    if root is None:
+        total = np.empty_like(counts)
+        comm.Allreduce(counts, total, op=MPI.SUM)
+        return total
+    total = np.empty_like(counts) if rank == root else None
+    comm.Reduce(counts, total, op=MPI.SUM, root=root)
+    return total
+
+
+def letter_counts(counts: np.ndarray, alphabet: str = "ACGU") -> Dict[str, int]:
+    """
+    The counts of the letters of an alphabet, upper and lower case together.
+
+    Parameters:
+    - counts: the 256 byte counts of `count_file`
+    - alphabet: the letters to report
+
+    Returns:
+    A dict from every (upper case) letter to its count
+    """
+    return {
+        letter: int(counts[ord(letter)] + counts[ord(letter.lower())])
+        for letter in alphabet.upper()
+    }
@@ -0,0 +1,407 @@
+"""
+A 2-bit packed storage format for nucleotide sequences.
+
+A base takes one of four values, so it needs two bits, where a text file spends a
+byte on it and a NumPy "<U1" array four. A packed file is a HEADER_SIZE byte
+header followed by the payload, four bases per byte:
+
+    magic   4 bytes  b"VHNA"
+    version 1 byte   FORMAT_VERSION, then 3 bytes of padding
+    alphabet 4 bytes the letters coded 0, 1, 2, 3, e.g. b"ACGU" or b"ACGT"
+    length  8 bytes  the number of bases, little-endian
+    checksum 4 bytes `checksum` of the payload, little-endian
+
+Base i is bits 2 * (i % 4) and up of payload byte i // 4, the unused bits of the
+last byte are zero. Every multiple of four bases starts a new byte, so processes
+that own byte-aligned ranges of bases (`packed_range`) read and write the payload
+without touching each other's bytes. The checksum is a position-weighted sum of the
+payload bytes rather than a CRC, so the processes can each checksum their own
+range and add the results up.
+
+Counting works on the packed bytes directly: a bincount of the byte values times
+the 256 x 4 table PACKED_COUNTS, which holds how many bases of each code a byte
+value contains.
+
+Example:
+    >>> packed = pack_sequence("GAUCCA")
+    >>> len(packed), unpack_sequence(packed, 6)
+    (2, b'GAUCCA')
+    >>> count_packed(np.frombuffer(packed, dtype=np.uint8), 6).tolist()
+    [2, 2, 1, 1]
+
+Date: 10/18/2026
+Author: Djamil Lakhdar-Hamina
+
+"""
+
+import struct
+from typing import Iterable, NamedTuple, Optional, Tuple, Union
+
+import numpy as np
+from mpi4py import MPI
+
+from vhpc.mpi.partition import block_range
+
+MAGIC = b"VHNA"
+FORMAT_VERSION = 1
+HEADER_FORMAT = "<4sB3x4sQI"
+HEADER_SIZE = struct.calcsize(HEADER_FORMAT)
+
+BASES_PER_BYTE = 4
+
+# the payload bytes a process reads or packs at a time, 16 MiB (64 Mi bases)
+DEFAULT_CHUNK_BYTES = 16 << 20
+
+# the bytes checksummed or counted by one vectorized call
+BLOCK = 1 << 20
+
+# the codes of the four bases in every byte value, low bits first
+_SHIFTS = np.arange(0, 8, 2, dtype=np.uint8)
+UNPACKED = (np.arange(256, dtype=np.uint8)[:, np.newaxis] >> _SHIFTS) & 3
+
+# PACKED_COUNTS[b, c] is the number of bases with code c in byte value b
+PACKED_COUNTS = np.stack([(UNPACKED == c).sum(axis=1) for c in range(4)], axis=1)
+
+
+class PackedHeader(NamedTuple):
+    """
+    The header of a packed file.
+    """
+
+    length: int
+    alphabet: bytes
+    checksum: int
+
+    def encode(self) -> bytes:
+        return struct.pack(
+            HEADER_FORMAT,
+            MAGIC,
+            FORMAT_VERSION,
+            self.alphabet,
+            self.length,
+            self.checksum,
+        )
+
+    @classmethod
+    def decode(cls, data: bytes) -> "PackedHeader":
+        magic, version, alphabet, length, checksum = struct.unpack(
+            HEADER_FORMAT, bytes(data)
+        )
+        if magic != MAGIC:
+            raise ValueError("not a packed nucleotide file")
+        if version != FORMAT_VERSION:
+            raise ValueError(f"unsupported packed format version {version}")
+        return cls(length, alphabet, checksum)
+
+
+def _alphabet(alphabet: Union[str, bytes]) -> bytes:
+    if isinstance(alphabet, str):
+        alphabet = alphabet.encode("ascii")
+    alphabet = alphabet.upper()
+    if len(alphabet) != 4 or len(set(alphabet)) != 4:
+        raise ValueError("an alphabet has four different letters")
+    return alphabet
+
+
+def packed_size(length: int) -> int:
+    """
+    The payload bytes of length bases.
+    """
+    return -(-length // BASES_PER_BYTE)
+
+
+def encode(letters: np.ndarray, alphabet: Union[str, bytes] = b"ACGU") -> np.ndarray:
+    """
+    The codes 0-3 of a sequence of letters, upper or lower case.
+
+    Parameters:
+    - letters: a uint8 array of ASCII letters
+    - alphabet: the letters coded 0, 1, 2, 3
+
+    Returns:
+    A uint8 array of codes
+    """
+    table = np.full(256, 255, dtype=np.uint8)
+    for code, letter in enumerate(_alphabet(alphabet)):
+        table[letter] = table[ord(chr(letter).lower())] = code
+    codes = table[letters]
+    if (codes == 255).any():
+        raise ValueError(f"sequence has letters outside the alphabet {alphabet!r}")
+    return codes
+
+
+def decode(codes: np.ndarray, alphabet: Union[str, bytes] = b"ACGU") -> np.ndarray:
+    """
+    The letters of a sequence of codes, the inverse of `encode`.
+    """
+    return np.frombuffer(_alphabet(alphabet), dtype=np.uint8)[codes]
+
+
+def pack(codes: np.ndarray) -> np.ndarray:
+    """
+    Packs codes four to a byte.
+
+    Parameters:
+    - codes: a uint8 array of codes 0-3
+
+    Returns:
+    The uint8 array of `packed_size(codes.size)` bytes
+    """
+    padded = np.zeros(packed_size(codes.size) * BASES_PER_BYTE, dtype=np.uint8)
+    padded[: codes.size] = codes
+    quads = padded.reshape(-1, BASES_PER_BYTE)
+    return quads[:, 0] | quads[:, 1] << 2 | quads[:, 2] << 4 | quads[:, 3] << 6
+
+
+def unpack(packed: np.ndarray, length: Optional[int] = None) -> np.ndarray:
+    """
+    The codes of packed bytes, the inverse of `pack`.
+
+    Parameters:
+    - packed: a uint8 array
+    - length: the number of bases, all bases of all bytes when None
+
+    Returns:
+    A uint8 array of length codes
+    """
+    return UNPACKED[packed].ravel()[:length]
+
+
+def pack_sequence(sequence: Union[str, bytes], alphabet=b"ACGU") -> bytes:
+    """
+    The packed payload of a sequence of letters.
+    """
+    if isinstance(sequence, str):
+        sequence = sequence.encode("ascii")
+    letters = np.frombuffer(sequence, dtype=np.uint8)
+    return pack(encode(letters, alphabet)).tobytes()
+
+
+def unpack_sequence(packed: bytes, length: int, alphabet=b"ACGU") -> bytes:
+    """
+    The letters of a packed payload of length bases.
+    """
+    codes = unpack(np.frombuffer(packed, dtype=np.uint8), length)
+    return decode(codes, alphabet).tobytes()
+
+
+def count_packed(packed: np.ndarray, length: Optional[int] = None) -> np.ndarray:
+    """
+    The number of bases of every code in packed bytes, without unpacking them.
+
+    Parameters:
+    - packed: a uint8 array
+    - length: the number of bases in it, when the last byte is only partly used
+
+    Returns:
+    An int64 array of the 4 counts
+    """
+    counts = np.zeros(4, dtype=np.int64)
+    for start in range(0, packed.size, BLOCK):
+        values = np.bincount(packed[start : start + BLOCK], minlength=256)
+        counts += values @ PACKED_COUNTS
+    if length is not None:
+        # the unused bases of the last byte are zero bits, i.e. code 0
+        counts[0] -= packed.size * BASES_PER_BYTE - length
+    return counts
+
+
+def checksum(packed: np.ndarray, start: int = 0) -> int:
+    """
+    The sum of (i + 1) * byte i over the payload, modulo 2**32; of a part of it
+    starting at byte start, the checksum of the payload is the sum of those of its
+    parts, modulo 2**32.
+
+    Parameters:
+    - packed: a uint8 array, bytes start, start + 1, ... of the payload
+    - start: the position of packed in the payload
+
+    Returns:
+    The (partial) checksum
+    """
+    total = 0
+    for first in range(0, packed.size, BLOCK):
+        block = packed[first : first + BLOCK].astype(np.uint64)
+        weights = np.arange(
+            start + first + 1, start + first + 1 + block.size, dtype=np.uint64
+        )
+        # uint64 arithmetic wraps around, which keeps the sum right modulo 2**32
+        total = (total + int(block @ weights)) & 0xFFFFFFFF
+    return total
+
+
+def packed_range(length: int, comm: "MPI.Comm") -> Tuple[int, int]:
+    """
+    The calling process's share of length bases in a byte-aligned block layout:
+    every range starts at a multiple of four, only the last one may end elsewhere.
+
+    Returns:
+    A tuple (offset, count) of bases
+    """
+    offset, count = block_range(packed_size(length), comm.Get_size(), comm.Get_rank())
+    first = offset * BASES_PER_BYTE
+    return first, max(0, min(count * BASES_PER_BYTE, length - first))
+
+
+def read_header(fh: "MPI.File") -> PackedHeader:
+    """
+    Reads the header of an open packed file. Collective over the file.
+    """
+    data = bytearray(HEADER_SIZE)
+    fh.Read_at_all(0, data)
+    return PackedHeader.decode(data)
+
+
+def write_packed(
+    filename: str,
+    codes: Union[np.ndarray, Iterable[np.ndarray]],
+    offset: int,
+    length: int,
+    comm: "MPI.Comm",
+    alphabet: Union[str, bytes] = b"ACGU",
+    chunk_bytes: int = DEFAULT_CHUNK_BYTES,
+) -> PackedHeader:
+    """
+    Writes a sequence of length bases, shared among the processes, as a packed
+    file. Collective over comm.
+
+    Parameters:
+    - filename: the file written
+    - codes: the calling process's bases, from offset on, as codes; one array or
+      an iterable of consecutive arrays so a range need not be in memory at once
+    - offset: the position of the first of them, a multiple of four
+    - length: the number of bases in the file
+    - comm: the communicator writing the file
+    - alphabet: the letters coded 0, 1, 2, 3
+    - chunk_bytes: the payload bytes packed and written at a time
+
+    Returns:
+    The header written
+    """
+    if offset % BASES_PER_BYTE:
+        raise ValueError("a process's bases must start at a multiple of four")
+    alphabet = _alphabet(alphabet)
+    if isinstance(codes, np.ndarray):
+        codes = (codes,)
+    fh = MPI.File.Open(comm, filename, MPI.MODE_WRONLY | MPI.MODE_CREATE)
+    fh.Set_size(HEADER_SIZE + packed_size(length))
+    chunk_bases = chunk_bytes * BASES_PER_BYTE
+    position, partial = offset, 0
+    pending = np.empty(0, dtype=np.uint8)
+
+    def write(bases: np.ndarray) -> None:
+        nonlocal position, partial
+        for first in range(0, bases.size, chunk_bases):
+            piece = pack(bases[first : first + chunk_bases])
+            byte = position // BASES_PER_BYTE
+            fh.Write_at(HEADER_SIZE + byte, piece)
+            partial += checksum(piece, byte)
+            position += min(chunk_bases, bases.size - first)
+
+    for array in codes:
+        array = np.concatenate((pending, np.asarray(array, dtype=np.uint8)))
+        # only whole bytes are written before the end, the rest waits for the next
+        # array
+        whole = array.size - array.size % BASES_PER_BYTE
+        write(array[:whole])
+        pending = array[whole:]
+    write(pending)
+
+    written = comm.allreduce(position - offset, op=MPI.SUM)
+    total = comm.allreduce(partial, op=MPI.SUM) & 0xFFFFFFFF
+    header = PackedHeader(length, alphabet, total)
+    if written != length:
+        fh.Close()
+        raise ValueError(f"{written} bases written, the file holds {length}")
+    if comm.Get_rank() == 0:
+        fh.Write_at(0, header.encode())
+    fh.Close()
+    return header
+
+
+def read_packed(
+    filename: str, comm: "MPI.Comm", verify: bool = True
+) -> Tuple[PackedHeader, int, np.ndarray]:
+    """
+    Reads a packed file, every process the bases of its `packed_range`. Collective
+    over comm.
+
+    Parameters:
+    - filename: the packed file
+    - comm: the communicator reading it
+    - verify: whether to check the payload against the header's checksum
+
+    Returns:
+    A tuple (header, offset, codes) with the calling process's bases as codes
+    """
+    fh = MPI.File.Open(comm, filename, MPI.MODE_RDONLY)
+    header = read_header(fh)
+    offset, count = packed_range(header.length, comm)
+    packed = np.empty(packed_size(count), dtype=np.uint8)
+    byte = offset // BASES_PER_BYTE
+    fh.Read_at_all(HEADER_SIZE + byte, packed)
+    fh.Close()
+    if verify:
+        _verify(header, checksum(packed, byte), comm)
+    return header, offset, unpack(packed, count)
+
+
+def count_packed_file(
+    filename: str,
+    comm: "MPI.Comm",
+    chunk_bytes: int = DEFAULT_CHUNK_BYTES,
+    root: Optional[int] = None,
+    verify: bool = True,
+) -> Tuple[PackedHeader, Optional[np.ndarray]]:
+    """
+    Counts the bases of every code in a packed file, reading and counting the packed
+    bytes a chunk at a time. Collective over comm.
+
+    Parameters:
+    - filename: the packed file
+    - comm: the communicator sharing the work
+    - chunk_bytes: the payload bytes a process reads at a time
+    - root: the process receiving the counts, all of them when None
+    - verify: whether to check the payload against the header's checksum
+
+    Returns:
+    A tuple (header, counts), counts the int64 array of the 4 counts in the order of
+    the alphabet on root (everywhere when root is None), None elsewhere
+    """
+    fh = MPI.File.Open(comm, filename, MPI.MODE_RDONLY)
+    header = read_header(fh)
+    nbytes = packed_size(header.length)
+    offset, count = block_range(nbytes, comm.Get_size(), comm.Get_rank())
+    chunks = comm.allreduce(-(-count // chunk_bytes), op=MPI.MAX)
+    buffer = np.empty(min(chunk_bytes, count), dtype=np.uint8)
+    counts = np.zeros(4, dtype=np.int64)
+    partial = 0
+    for c in range(chunks):
+        start = min(c * chunk_bytes, count)
+        data = buffer[: min(chunk_bytes, count - start)]
+        fh.Read_at_all(HEADER_SIZE + offset + start, data)
+        counts += count_packed(data)
+        if verify:
+            partial += checksum(data, offset + start)
+    fh.Close()
+    if verify:
+        _verify(header, partial, comm)
+
+    if count and offset + count == nbytes:
+        counts[0] -= nbytes * BASES_PER_BYTE - header.length
+    if root is None:
+        total = np.empty_like(counts)
+        comm.Allreduce(counts, total, op=MPI.SUM)
+        return header, total
+    total = np.empty_like(counts) if comm.Get_rank() == root else None
+    comm.Reduce(counts, total, op=MPI.SUM, root=root)
+    return header, total
+
+
+def _verify(header: PackedHeader, partial: int, comm: "MPI.Comm") -> None:
+    """
+    Raises ValueError on every process unless the partial checksums of all of them
+    add up to the header's. Collective over comm.
+    """
+    if comm.allreduce(partial, op=MPI.SUM) & 0xFFFFFFFF != header.checksum:
+        raise ValueError("packed file is corrupt: checksum mismatch")
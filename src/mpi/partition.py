@@ -0,0 +1,217 @@
+"""
+Shared partitioning helpers for the MPI examples.
+
+The examples used to carry their own copies of `part_gen`, `partition` and
+`batched`, all of which walk the input with `islice` and build Python lists. For
+NumPy input that copies every element through the interpreter before a single byte
+is sent. The helpers below instead describe a layout as (offset, count) pairs and,
+when handed an array, return views into it so nothing is copied until MPI packs
+the data.
+
+Three layouts are supported:
+
+- block: rank p owns one contiguous run; the first n % parts ranks own one extra
+  element, so the load imbalance is at most one element.
+- cyclic: rank p owns elements p, p + parts, p + 2 * parts, ...
+- block-cyclic: blocks of `block` elements are dealt round-robin to the ranks; the
+  last block may be short.
+
+Example:
+    >>> import numpy as np
+    >>> x = np.arange(10)
+    >>> block_ranges(10, 3)
+    [(0, 4), (4, 3), (7, 3)]
+    >>> [part.tolist() for part in block_partition(x, 3)]
+    [[0, 1, 2, 3], [4, 5, 6], [7, 8, 9]]
+    >>> [part.tolist() for part in cyclic_partition(x, 3)]
+    [[0, 3, 6, 9], [1, 4, 7], [2, 5, 8]]
+
+Date: 10/18/2026
+Author: Djamil Lakhdar-Hamina
+
+"""
+
+from itertools import islice
+from typing import Generator, Iterable, List, Sequence, Tuple, Type
+
+import numpy as np
+
+
+def batched(
+    iterable: Iterable, n: int, iterable_type: Type = list
+) -> Generator[Iterable, None, None]:
+    """
+    Breaks an iterable up into consecutive batches of n elements, the last batch may
+    be shorter. NumPy arrays are sliced, so every batch is a view of the input.
+
+    Parameters:
+    - iterable: the iterable to break up
+    - n : the number of elements per batch
+    - iterable_type : the type of each batch for non-array input
+
+    Returns:
+    A generator of batches with (at most) n elements
+
+    Example:
+    >>> list(batched("ABCDEFG", 3, tuple))
+    [('A', 'B', 'C'), ('D', 'E', 'F'), ('G',)]
+    """
+    if n < 1:
+        raise ValueError("n must be at least one")
+    if isinstance(iterable, np.ndarray):
+        for start in range(0, len(iterable), n):
+            yield iterable[start : start + n]
+        return
+    it = iter(iterable)
+    while batch := iterable_type(islice(it, n)):
+        yield batch
+
+
+def block_counts(n: int, parts: int) -> np.ndarray:
+    """
+    Number of elements each of `parts` owners gets when n elements are split into
+    contiguous blocks. The remainder goes to the lowest ranks, one element each.
+
+    Parameters:
+    - n: total number of elements
+    - parts: number of owners (usually the communicator size)
+
+    Returns:
+    An int array of length parts that sums to n
+    """
+    if parts < 1:
+        raise ValueError("parts must be at least one")
+    if n < 0:
+        raise ValueError("n must be non-negative")
+    counts = np.full(parts, n // parts, dtype=np.int64)
+    counts[: n % parts] += 1
+    return counts
+
+
+def displacements(counts: Sequence[int]) -> np.ndarray:
+    """
+    Exclusive prefix sum of counts, i.e. the offset of each block.
+
+    Parameters:
+    - counts: number of elements per owner
+
+    Returns:
+    An int array with the starting offset of every block
+    """
+    counts = np.asarray(counts, dtype=np.int64)
+    displs = np.zeros_like(counts)
+    np.cumsum(counts[:-1], out=displs[1:])
+    return displs
+
+
+def block_range(n: int, parts: int, rank: int) -> Tuple[int, int]:
+    """
+    (offset, count) of the block owned by rank, computed in O(1) so a rank never has
+    to build the full layout to find its own share.
+
+    Parameters:
+    - n: total number of elements
+    - parts: number of owners
+    - rank: the owner whose block is requested
+
+    Returns:
+    A tuple (offset, count)
+    """
+    if not 0 <= rank < parts:
+        raise ValueError(f"rank {rank} out of range for {parts} parts")
+    base, extra = divmod(n, parts)
+    count = base + (1 if rank < extra else 0)
+    offset = rank * base + min(rank, extra)
+    return offset, count
+
+
+def block_ranges(n: int, parts: int) -> List[Tuple[int, int]]:
+    """
+    (offset, count) descriptors of the block layout for every owner.
+
+    Parameters:
+    - n: total number of elements
+    - parts: number of owners
+
+    Returns:
+    A list of parts tuples (offset, count)
+    """
+    counts = block_counts(n, parts)
+    return list(zip(displacements(counts).tolist(), counts.tolist()))
+
+
+def block_partition(array: np.ndarray, parts: int) -> List[np.ndarray]:
+    """
+    Splits an array along its first axis into parts contiguous views.
+
+    Parameters:
+    - array: the array to split
+    - parts: number of owners
+
+    Returns:
+    A list of views, one per owner, whose lengths differ by at most one
+    """
+    return [
+        array[offset : offset + count]
+        for offset, count in block_ranges(len(array), parts)
+    ]
+
+
+def cyclic_partition(array: np.ndarray, parts: int) -> List[np.ndarray]:
+    """
+    Deals the elements of an array round-robin to parts owners. Each part is a
+    strided view of the input.
+
+    Parameters:
+    - array: the array to split
+    - parts: number of owners
+
+    Returns:
+    A list of views, one per owner, whose lengths differ by at most one
+    """
+    if parts < 1:
+        raise ValueError("parts must be at least one")
+    return [array[p::parts] for p in range(parts)]
+
+
+def block_cyclic_ranges(n: int, parts: int, block: int) -> List[List[Tuple[int, int]]]:
+    """
+    (offset, count) descriptors of the block-cyclic layout. Blocks of `block`
+    elements are dealt round-robin; the final block holds the remainder.
+
+    Parameters:
+    - n: total number of elements
+    - parts: number of owners
+    - block: number of elements per block
+
+    Returns:
+    A list with, for each owner, the list of (offset, count) blocks it owns
+    """
+    if parts < 1:
+        raise ValueError("parts must be at least one")
+    if block < 1:
+        raise ValueError("block must be at least one")
+    ranges = [[] for _ in range(parts)]
+    for i, offset in enumerate(range(0, n, block)):
+        ranges[i % parts].append((offset, min(block, n - offset)))
+    return ranges
+
+
+def block_cyclic_partition(
+    array: np.ndarray, parts: int, block: int
+) -> List[List[np.ndarray]]:
+    """
+    Splits an array into the block-cyclic layout, returning views of the input.
+
+    Parameters:
+    - array: the array to split
+    - parts: number of owners
+    - block: number of elements per block
+
+    Returns:
+    A list with, for each owner, the list of block views it owns
+    """
+    return [
+        [array[offset : offset + count] for offset, count in owned]
+        for owned in block_cyclic_ranges(len(array), parts, block)
+    ]
@@ -0,0 +1,157 @@
+"""
+Reduction to one process through a passive-target RMA window.
+
+Reducing with `Win.Accumulate` the straightforward way takes two lock epochs and a
+barrier: every process locks the root, accumulates and unlocks, all of them wait in
+`comm.Barrier()`, and then lock the root again to `Get` the result. The window is
+also allocated on every process although only the root is ever a target.
+
+`RMAReducer` needs a single epoch. Only root exposes memory: `count` elements for
+the result and one arrival counter behind them. Inside one `Lock_all` epoch a
+process may `accumulate` as many contributions as it likes, e.g. one partial sum per
+chunk of work as the chunks finish. `complete` flushes them and then adds one to the
+counter; root polls the counter with `Fetch_and_op` until every process has arrived
+and reads the result. The other processes never wait for anybody.
+
+Example:
+    >>> reducer = RMAReducer(MPI.COMM_WORLD, count=2)
+    >>> reducer.start()
+    >>> for chunk in range(3):
+    ...     reducer.accumulate(np.array([1.0, chunk]))
+    >>> result = reducer.complete()
+    >>> (result / MPI.COMM_WORLD.Get_size()).tolist()
+    [3.0, 3.0]
+    >>> reducer.free()
+
+Date: 10/18/2026
+Author: Djamil Lakhdar-Hamina
+
+"""
+
+from typing import Optional, Type
+
+import numpy as np
+from mpi4py import MPI
+from mpi4py.util import dtlib
+
+
+class RMAReducer:
+    """
+    Element-wise reduction of contributions from all processes of comm into a
+    window on root, in one passive-target epoch per round.
+    """
+
+    def __init__(
+        self,
+        comm: "MPI.Comm",
+        count: int = 1,
+        dtype: Type = np.float64,
+        root: int = 0,
+        op: "MPI.Op" = MPI.SUM,
+    ):
+        """
+        Collective over comm.
+
+        Parameters:
+        - comm: the communicator
+        - count: the number of elements reduced
+        - dtype: their NumPy dtype
+        - root: the process that holds the result
+        - op: a predefined reduction operation (MPI does not allow user-defined
+          operations in RMA), the window starts out as zeros
+        """
+        self.comm = comm
+        self.count = count
+        self.root = root
+        self.op = op
+        self.dtype = np.dtype(dtype)
+        self.datatype = dtlib.from_numpy_dtype(self.dtype)
+        itemsize = self.dtype.itemsize
+        # the result and, behind it, the number of processes that have completed
+        size = (count + 1) * itemsize if comm.Get_rank() == root else 0
+        self.win = MPI.Win.Allocate(size, disp_unit=itemsize, comm=comm)
+        self.reset()
+        self._one = np.ones(1, dtype=self.dtype)
+        self._arrived = np.zeros(1, dtype=self.dtype)
+
+    def reset(self) -> None:
+        """
+        Zeroes the window for a new round. Collective over comm.
+        """
+        if self.comm.Get_rank() == self.root:
+            self.win.Lock(self.root, MPI.LOCK_EXCLUSIVE)
+            np.frombuffer(self.win.tomemory(), dtype=self.dtype)[:] = 0
+            self.win.Unlock(self.root)
+        self.comm.Barrier()
+
+    def start(self) -> None:
+        """
+        Opens the epoch in which contributions can be accumulated.
+        """
+        self.win.Lock_all(MPI.MODE_NOCHECK)
+
+    def accumulate(self, values: np.ndarray, offset: int = 0, op=None) -> None:
+        """
+        Adds a contribution to the result; the call returns as soon as the values
+        may be reused, it does not wait for root.
+
+        Parameters:
+        - values: the contribution, of the reducer's dtype
+        - offset: the first element of the result it applies to
+        - op: overrides the reducer's operation for this contribution, e.g.
+          MPI.REPLACE to put values into a slot of their own
+        """
+        values = np.ascontiguousarray(values, dtype=self.dtype)
+        if offset < 0 or offset + values.size > self.count:
+            raise ValueError("contribution does not fit the result")
+        self.win.Accumulate(
+            [values, self.datatype],
+            self.root,
+            target=(offset, values.size, self.datatype),
+            op=self.op if op is None else op,
+        )
+
+    def complete(self) -> Optional[np.ndarray]:
+        """
+        Ends this process's contributions and closes the epoch. On root it waits
+        until all processes have completed.
+
+        Returns:
+        The reduced result on root, None elsewhere
+        """
+        counter = (self.count, 1, self.datatype)
+        # the contributions have to land before the arrival they are counted by
+        self.win.Flush(self.root)
+        self.win.Accumulate(
+            [self._one, self.datatype], self.root, target=counter, op=MPI.SUM
+        )
+        self.win.Flush(self.root)
+        result = None
+        if self.comm.Get_rank() == self.root:
+            size = self.comm.Get_size()
+            while True:
+                self.win.Fetch_and_op(
+                    [self._one, self.datatype],
+                    [self._arrived, self.datatype],
+                    self.root,
+                    target_disp=self.count,
+                    op=MPI.NO_OP,
+                )
+                self.win.Flush(self.root)
+                if self._arrived[0] >= size:
+                    break
+            result = np.empty(self.count, dtype=self.dtype)
+            self.win.Get(
+                [result, self.datatype],
+                self.root,
+                target=(0, self.count, self.datatype),
+            )
+            self.win.Flush(self.root)
+        self.win.Unlock_all()
+        return result
+
+    def free(self) -> None:
+        """
+        Releases the window. Collective over comm.
+        """
+        self.win.Free()
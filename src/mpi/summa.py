@@ -0,0 +1,247 @@
+"""
+Distributed matrix multiplication C = A B with SUMMA on a 2D process grid.
+
+The processes form a pr x pc Cartesian grid (`MPI.Compute_dims`, `Create_cart`,
+as in the communicators/cartesian_comm.py example) and every matrix is split into
+pr x pc blocks, block (i, j) living on the process with coordinates (i, j). The
+inner dimension is cut into lcm(pr, pc) panels; for each panel the column of A
+blocks that owns it broadcasts its slice along the grid rows and the row of B
+blocks broadcasts along the grid columns, over sub-communicators from
+`cart.Sub`, and every process adds the product of the two panels to its block of
+C. The broadcast of the next panel is started before the current one is
+multiplied, so communication overlaps the local matmul.
+
+A process only ever holds its blocks of A, B and C and two panels of each, O(n^2 / p)
+memory. Sizes that do not divide evenly are padded with zeros up to whole blocks;
+`padded_shape` gives the padded dimensions and `gather_blocks` crops them off again.
+
+Example:
+    >>> A, B = np.arange(6.0).reshape(2, 3), np.ones((3, 2))
+    >>> summa_matmul(A, B, MPI.COMM_SELF).tolist()
+    [[3.0, 3.0], [12.0, 12.0]]
+
+Date: 10/18/2026
+Author: Djamil Lakhdar-Hamina
+
+"""
+
+from math import lcm
+from typing import NamedTuple, Optional, Tuple
+
+import numpy as np
+from mpi4py import MPI
+
+
+class Grid(NamedTuple):
+    """
+    A 2D process grid, `row` connects the processes of one grid row and `col` those
+    of one grid column.
+    """
+
+    cart: "MPI.Cartcomm"
+    row: "MPI.Cartcomm"
+    col: "MPI.Cartcomm"
+    dims: Tuple[int, int]
+    coords: Tuple[int, int]
+
+
+def create_grid(comm: "MPI.Comm") -> Grid:
+    """
+    Arranges the processes of comm in a grid as close to square as possible.
+    Collective over comm.
+
+    Parameters:
+    - comm: the communicator
+
+    Returns:
+    The grid; its ranks are those of comm, laid out row by row
+    """
+    dims = MPI.Compute_dims(comm.Get_size(), 2)
+    # without reordering cart rank r sits at (r // pc, r % pc), which is the order
+    # scatter_blocks packs the blocks in
+    cart = comm.Create_cart(dims=dims, periods=[False, False], reorder=False)
+    row = cart.Sub([False, True])
+    col = cart.Sub([True, False])
+    coords = cart.Get_coords(cart.Get_rank())
+    return Grid(cart, row, col, tuple(dims), tuple(coords))
+
+
+def free_grid(grid: Grid) -> None:
+    """
+    Frees the communicators of a grid. Collective over the grid.
+    """
+    grid.row.Free()
+    grid.col.Free()
+    grid.cart.Free()
+
+
+def padded_shape(m: int, k: int, n: int, dims: Tuple[int, int]) -> Tuple[int, int, int]:
+    """
+    The dimensions of (m x k) (k x n) padded to whole blocks on a grid.
+
+    Parameters:
+    - m, k, n: the dimensions of the product
+    - dims: the grid (pr, pc)
+
+    Returns:
+    (M, K, N): M a multiple of pr, N of pc and K of both, so K splits into
+    lcm(pr, pc) panels
+
+    >>> padded_shape(10, 10, 10, (2, 3))
+    (10, 12, 12)
+    """
+
+    def up(x: int, multiple: int) -> int:
+        return -(-x // multiple) * multiple
+
+    pr, pc = dims
+    return up(m, pr), up(k, lcm(pr, pc)), up(n, pc)
+
+
+def scatter_blocks(
+    matrix: Optional[np.ndarray],
+    grid: Grid,
+    shape: Tuple[int, int],
+    dtype=np.float64,
+    root: int = 0,
+) -> np.ndarray:
+    """
+    Distributes a matrix held by root in blocks over the grid, padding it with zeros
+    to shape. Collective over the grid.
+
+    Parameters:
+    - matrix: the matrix on root, ignored elsewhere
+    - grid: from `create_grid`
+    - shape: the padded shape, divisible by the grid dims
+    - dtype: the dtype of the blocks
+    - root: the rank of the grid holding the matrix
+
+    Returns:
+    This process's block, of shape (shape[0] // pr, shape[1] // pc)
+    """
+    (pr, pc), (rows, cols) = grid.dims, shape
+    mb, nb = rows // pr, cols // pc
+    packed = None
+    if grid.cart.Get_rank() == root:
+        padded = np.zeros(shape, dtype=dtype)
+        padded[: matrix.shape[0], : matrix.shape[1]] = matrix
+        # (pr, mb, pc, nb) -> (pr, pc, mb, nb): block (i, j) becomes contiguous and
+        # goes to rank i * pc + j
+        packed = np.ascontiguousarray(padded.reshape(pr, mb, pc, nb).swapaxes(1, 2))
+    block = np.empty((mb, nb), dtype=dtype)
+    grid.cart.Scatter(packed, block, root=root)
+    return block
+
+
+def gather_blocks(
+    block: np.ndarray, grid: Grid, shape: Tuple[int, int], root: int = 0
+) -> Optional[np.ndarray]:
+    """
+    The inverse of `scatter_blocks`. Collective over the grid.
+
+    Parameters:
+    - block: this process's block
+    - grid: from `create_grid`
+    - shape: the shape of the matrix without its padding
+    - root: the rank of the grid receiving the matrix
+
+    Returns:
+    The matrix on root, None elsewhere
+    """
+    (pr, pc), (mb, nb) = grid.dims, block.shape
+    packed = None
+    if grid.cart.Get_rank() == root:
+        packed = np.empty((pr, pc, mb, nb), dtype=block.dtype)
+    grid.cart.Gather(np.ascontiguousarray(block), packed, root=root)
+    if packed is None:
+        return None
+    matrix = packed.swapaxes(1, 2).reshape(pr * mb, pc * nb)
+    return np.ascontiguousarray(matrix[: shape[0], : shape[1]])
+
+
+def summa(A: np.ndarray, B: np.ndarray, grid: Grid) -> np.ndarray:
+    """
+    This process's block of C = A B, from its blocks of A and B. Collective over the
+    grid.
+
+    Parameters:
+    - A: the block (i, j) of A, of shape (M // pr, K // pc)
+    - B: the block (i, j) of B, of shape (K // pr, N // pc)
+    - grid: from `create_grid`
+
+    Returns:
+    The block (i, j) of C, of shape (M // pr, N // pc)
+    """
+    (pr, pc), (i, j) = grid.dims, grid.coords
+    mb, ka = A.shape
+    kb, nb = B.shape
+    if ka * pc != kb * pr:
+        raise ValueError("inner dimensions of the blocks do not match")
+    panels = lcm(pr, pc)
+    width = ka * pc // panels
+    if width * panels != ka * pc:
+        raise ValueError("inner dimension is not padded to whole panels")
+    # panels per block of A along a grid row and of B along a grid column
+    per_a, per_b = panels // pc, panels // pr
+
+    dtype = np.result_type(A, B)
+    C = np.zeros((mb, nb), dtype=dtype)
+    a_panels = np.empty((2, mb, width), dtype=A.dtype)
+    b_panels = np.empty((2, width, nb), dtype=B.dtype)
+
+    def start(t: int):
+        buffer = t % 2
+        owner_col, owner_row = t // per_a, t // per_b
+        if owner_col == j:
+            offset = (t % per_a) * width
+            a_panels[buffer] = A[:, offset : offset + width]
+        if owner_row == i:
+            offset = (t % per_b) * width
+            b_panels[buffer] = B[offset : offset + width]
+        return [
+            grid.row.Ibcast(a_panels[buffer], root=owner_col),
+            grid.col.Ibcast(b_panels[buffer], root=owner_row),
+        ]
+
+    requests = start(0)
+    for t in range(panels):
+        MPI.Request.Waitall(requests)
+        if t + 1 < panels:
+            requests = start(t + 1)
+        C += a_panels[t % 2] @ b_panels[t % 2]
+    return C
+
+
+def summa_matmul(
+    A: Optional[np.ndarray],
+    B: Optional[np.ndarray],
+    comm: "MPI.Comm",
+    root: int = 0,
+) -> Optional[np.ndarray]:
+    """
+    C = A B for matrices held by root, computed by all processes of comm.
+    Collective over comm.
+
+    Parameters:
+    - A: an (m x k) matrix on root, ignored elsewhere
+    - B: a (k x n) matrix on root, ignored elsewhere
+    - comm: the communicator
+    - root: the process holding A and B
+
+    Returns:
+    The (m x n) product on root, None elsewhere
+    """
+    shapes = None
+    if comm.Get_rank() == root:
+        if A.shape[1] != B.shape[0]:
+            raise ValueError("dimensions of matrices invalid")
+        shapes = (A.shape, B.shape, np.result_type(A, B))
+    (m, k), (_, n), dtype = comm.bcast(shapes, root=root)
+
+    grid = create_grid(comm)
+    M, K, N = padded_shape(m, k, n, grid.dims)
+    A_block = scatter_blocks(A, grid, (M, K), dtype, root)
+    B_block = scatter_blocks(B, grid, (K, N), dtype, root)
+    C = gather_blocks(summa(A_block, B_block, grid), grid, (m, n), root)
+    free_grid(grid)
+    return C
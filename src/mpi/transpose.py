@@ -0,0 +1,429 @@
+"""
+Transpose of a matrix distributed by rows.
+
+An (m x n) matrix A is spread over the processes of a communicator in the block
+layout of `vhpc.mpi.partition`: each process owns a contiguous run of rows. Its
+transpose, an (n x m) matrix, comes back in the same layout, so every process ends
+up with a run of rows of A^T, i.e. a run of columns of A. No process ever holds more
+than its own rows of A and of A^T.
+
+Process r sends the columns of its rows that process s will own, and s writes them
+as rows. Both sides are described by derived datatypes, so MPI reads the columns out
+of the rows of A and scatters them into the columns of the result itself, without
+temporary packing buffers:
+
+- send, one column of the local rows: `Create_vector(rows, 1, n)` resized to one
+  element, so consecutive columns start one element apart;
+- receive, the piece of the local rows of A^T a peer contributes:
+  `Create_vector(rows_of_AT, rows_of_peer, m)`.
+
+When the process count divides m and n every peer exchanges the same pieces and a
+single `Alltoall` does the transpose; otherwise the pieces differ by peer and
+`Alltoallw`, which takes a datatype per peer, is used.
+
+The transpose of a local array, `local_transpose`, runs one of the kernels in
+LOCAL_TRANSPOSE_KERNELS. Copying a row into a column at a time reads memory in
+order but writes it with a stride of a whole row, a cache miss per element once the
+array outgrows the cache. The kernels work on tiles instead, small enough that the
+rows read and the rows written both stay in cache:
+
+- "numpy": splits the larger dimension in halves until the pieces are at most TILE
+  on a side (cache-oblivious, every level of the hierarchy sees pieces that fit),
+  and copies each piece with a NumPy slice assignment;
+- "numba": compiled loops over TILE x TILE tiles, if Numba is installed;
+- "auto" (the default): "numpy".
+
+`transpose_inplace` transposes a square array in its own memory, swapping pairs of
+tiles across the diagonal through one tile of scratch space. All of them keep the
+dtype of their input.
+
+`transpose_file` transposes a matrix stored row-major in a binary file into another
+file without any process loading it in full. The matrix is cut into square blocks
+that are dealt round-robin to the processes, one block per process and pass; a
+process reads its block through a `Create_subarray` file view, transposes it in
+memory and writes it through the subarray view of its transposed location in the
+destination. Memory per process is one block (the partial blocks at the right
+and bottom edges are transposed out of place, into a second buffer no larger than
+one block) whatever the size of the matrix.
+
+Example:
+    >>> A = np.arange(6.0).reshape(2, 3)
+    >>> transpose(A, A.shape, MPI.COMM_SELF).tolist()
+    [[0.0, 3.0], [1.0, 4.0], [2.0, 5.0]]
+    >>> B = np.arange(9, dtype=np.int8).reshape(3, 3)
+    >>> bool((local_transpose(A) == A.T).all()), transpose_inplace(B).tolist()
+    (True, [[0, 3, 6], [1, 4, 7], [2, 5, 8]])
+
+Date: 10/18/2026
+Author: Djamil Lakhdar-Hamina
+
+"""
+
+from functools import lru_cache
+from math import isqrt
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+from mpi4py import MPI
+from mpi4py.util import dtlib
+
+from vhpc.mpi.distribution import block_layout
+
+# the tile edge of the local kernels: a 64 x 64 tile of doubles is 32 KiB, so the
+# tile read and the tile written fit in L2 together, and one row of each in L1
+TILE = 64
+
+# the memory a process of transpose_file uses for its block, 64 MiB
+DEFAULT_BLOCK_BYTES = 64 << 20
+
+
+def _check_out(a: np.ndarray, out: Optional[np.ndarray]) -> np.ndarray:
+    shape = a.shape[::-1]
+    if out is None:
+        return np.empty(shape, dtype=a.dtype)
+    if out.shape != shape or out.dtype != a.dtype:
+        raise ValueError(f"out must be a {shape} array of {a.dtype}")
+    if np.shares_memory(a, out):
+        raise ValueError("out overlaps the input, use transpose_inplace")
+    return out
+
+
+def transpose_blocked(
+    a: np.ndarray, out: Optional[np.ndarray] = None, tile: int = TILE
+) -> np.ndarray:
+    """
+    The transpose of a 2d array, halving its larger dimension until the pieces are
+    at most tile on a side and copying them one by one.
+
+    Parameters:
+    - a: the array
+    - out: an array for the result, of the transposed shape and a's dtype,
+      allocated when None
+    - tile: the largest edge copied in one piece
+
+    Returns:
+    out, holding a^T
+    """
+    out = _check_out(a, out)
+    # an explicit stack of (row, column, rows, columns) pieces instead of recursion
+    pieces = [(0, 0, *a.shape)]
+    while pieces:
+        i, j, m, n = pieces.pop()
+        if m <= tile and n <= tile:
+            out[j : j + n, i : i + m] = a[i : i + m, j : j + n].T
+        elif m >= n:
+            half = m // 2
+            pieces += [(i + half, j, m - half, n), (i, j, half, n)]
+        else:
+            half = n // 2
+            pieces += [(i, j + half, m, n - half), (i, j, m, half)]
+    return out
+
+
+@lru_cache(maxsize=None)
+def _numba_kernels() -> Tuple[Callable, Callable]:
+    try:
+        import numba
+    except ImportError:
+        raise ImportError("the numba kernel needs numba: pip install vhpc[jit]")
+
+    @numba.njit(parallel=True, cache=True)
+    def out_of_place(a, out, tile):
+        m, n = a.shape
+        for t in numba.prange((m + tile - 1) // tile):
+            i0 = t * tile
+            for j0 in range(0, n, tile):
+                # the innermost loop writes along a row of out
+                for j in range(j0, min(j0 + tile, n)):
+                    for i in range(i0, min(i0 + tile, m)):
+                        out[j, i] = a[i, j]
+
+    @numba.njit(parallel=True, cache=True)
+    def in_place(a, tile):
+        n = a.shape[0]
+        # tile rows i0 only swap with tiles at or right of the diagonal
+        for t in numba.prange((n + tile - 1) // tile):
+            i0 = t * tile
+            for j0 in range(i0, n, tile):
+                for i in range(i0, min(i0 + tile, n)):
+                    for j in range(max(j0, i + 1), min(j0 + tile, n)):
+                        a[i, j], a[j, i] = a[j, i], a[i, j]
+
+    return out_of_place, in_place
+
+
+def transpose_numba(
+    a: np.ndarray, out: Optional[np.ndarray] = None, tile: int = TILE
+) -> np.ndarray:
+    """
+    The transpose of a 2d array by compiled loops over tile x tile tiles, tile rows
+    in parallel.
+
+    Parameters:
+    - a: the array
+    - out: an array for the result, of the transposed shape and a's dtype,
+      allocated when None
+    - tile: the tile edge
+
+    Returns:
+    out, holding a^T
+    """
+    out = _check_out(a, out)
+    _numba_kernels()[0](a, out, tile)
+    return out
+
+
+LOCAL_TRANSPOSE_KERNELS: Dict[str, Callable[..., np.ndarray]] = {
+    "numpy": transpose_blocked,
+    "numba": transpose_numba,
+}
+
+
+def local_transpose(
+    a: np.ndarray, out: Optional[np.ndarray] = None, kernel: str = "auto"
+) -> np.ndarray:
+    """
+    The transpose of a 2d array as a new C-contiguous array (a.T is only a view).
+
+    Parameters:
+    - a: the array
+    - out: an array for the result, of the transposed shape and a's dtype,
+      allocated when None
+    - kernel: one of LOCAL_TRANSPOSE_KERNELS or "auto"
+
+    Returns:
+    out, holding a^T, of a's dtype
+    """
+    if a.ndim != 2:
+        raise ValueError("only 2d arrays can be transposed")
+    if kernel == "auto":
+        kernel = "numpy"
+    try:
+        f = LOCAL_TRANSPOSE_KERNELS[kernel]
+    except KeyError:
+        raise ValueError(
+            f"kernel must be 'auto' or one of {list(LOCAL_TRANSPOSE_KERNELS)}"
+        )
+    return f(a, out)
+
+
+def transpose_inplace(
+    a: np.ndarray, kernel: str = "auto", tile: int = TILE
+) -> np.ndarray:
+    """
+    Transposes a square 2d array in its own memory.
+
+    Parameters:
+    - a: a writable (n x n) array
+    - kernel: one of LOCAL_TRANSPOSE_KERNELS or "auto"
+    - tile: the tile edge
+
+    Returns:
+    a, now holding its transpose
+    """
+    if a.ndim != 2 or a.shape[0] != a.shape[1]:
+        raise ValueError("only square arrays can be transposed in place")
+    if kernel == "numba":
+        _numba_kernels()[1](a, tile)
+        return a
+    if kernel not in ("auto", "numpy"):
+        raise ValueError(
+            f"kernel must be 'auto' or one of {list(LOCAL_TRANSPOSE_KERNELS)}"
+        )
+    n = a.shape[0]
+    scratch = np.empty((tile, tile), dtype=a.dtype)
+    for i0 in range(0, n, tile):
+        i1 = min(i0 + tile, n)
+        diagonal = scratch[: i1 - i0, : i1 - i0]
+        np.copyto(diagonal, a[i0:i1, i0:i1].T)
+        a[i0:i1, i0:i1] = diagonal
+        for j0 in range(i1, n, tile):
+            j1 = min(j0 + tile, n)
+            upper, lower = a[i0:i1, j0:j1], a[j0:j1, i0:i1]
+            swap = scratch[: j1 - j0, : i1 - i0]
+            np.copyto(swap, upper.T)
+            upper[...] = lower.T
+            lower[...] = swap
+    return a
+
+
+def _column(rows: int, n: int, datatype: "MPI.Datatype") -> "MPI.Datatype":
+    """
+    One column of a (rows x n) array, with the extent of one element.
+    """
+    column = datatype.Create_vector(rows, 1, n)
+    resized = column.Create_resized(0, datatype.Get_extent()[1])
+    column.Free()
+    return resized
+
+
+def _start(
+    local: np.ndarray,
+    shape: Tuple[int, int],
+    comm: "MPI.Comm",
+    out: Optional[np.ndarray],
+    nonblocking: bool,
+) -> Tuple[np.ndarray, Optional["MPI.Request"]]:
+    m, n = shape
+    size, rank = comm.Get_size(), comm.Get_rank()
+    row_counts, row_displs = block_layout(m, comm)
+    col_counts, col_displs = block_layout(n, comm)
+    rows, cols = int(row_counts[rank]), int(col_counts[rank])
+    if local.shape != (rows, n):
+        raise ValueError(f"expected the local rows of shape ({rows}, {n})")
+    local = np.ascontiguousarray(local)
+    if out is None:
+        out = np.empty((cols, m), dtype=local.dtype)
+    elif out.shape != (cols, m) or out.dtype != local.dtype:
+        raise ValueError(f"out must be a ({cols}, {m}) array of {local.dtype}")
+    elif not out.flags.c_contiguous:
+        raise ValueError("out must be C-contiguous")
+
+    datatype = dtlib.from_numpy_dtype(local.dtype)
+    itemsize = local.dtype.itemsize
+    column = _column(rows, n, datatype).Commit()
+    types: List["MPI.Datatype"] = [column]
+    if m % size == 0 and n % size == 0:
+        # every peer sends rows x cols and receives them as cols rows of rows
+        piece = datatype.Create_vector(cols, rows, m)
+        recvtype = piece.Create_resized(0, rows * itemsize).Commit()
+        piece.Free()
+        types.append(recvtype)
+        sendspec = [local, cols, column]
+        recvspec = [out, 1, recvtype]
+        collective = comm.Ialltoall if nonblocking else comm.Alltoall
+    else:
+        recvtypes = [datatype.Create_vector(cols, int(c), m) for c in row_counts]
+        for recvtype in recvtypes:
+            recvtype.Commit()
+        types.extend(recvtypes)
+        sendspec = [local, col_counts, col_displs * itemsize, [column] * size]
+        recvspec = [out, [1] * size, row_displs * itemsize, recvtypes]
+        collective = comm.Ialltoallw if nonblocking else comm.Alltoallw
+    request = collective(sendspec, recvspec)
+    # MPI only releases a datatype once the communication using it has completed
+    for t in types:
+        t.Free()
+    return out, request
+
+
+def transpose(
+    local: np.ndarray,
+    shape: Tuple[int, int],
+    comm: "MPI.Comm",
+    out: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """
+    The transpose of a matrix distributed by rows, distributed by rows.
+    Collective over comm.
+
+    Parameters:
+    - local: the calling process's rows of the (m x n) matrix in the block layout
+      of `vhpc.mpi.distribution.block_layout(m, comm)`
+    - shape: (m, n), the shape of the whole matrix
+    - comm: the communicator the matrix is distributed over
+    - out: a C-contiguous array for the result, allocated when None
+
+    Returns:
+    The calling process's rows of the (n x m) transpose, in the block layout of
+    `block_layout(n, comm)`
+    """
+    out, _ = _start(local, shape, comm, out, nonblocking=False)
+    return out
+
+
+def itranspose(
+    local: np.ndarray,
+    shape: Tuple[int, int],
+    comm: "MPI.Comm",
+    out: Optional[np.ndarray] = None,
+) -> Tuple[np.ndarray, "MPI.Request"]:
+    """
+    Starts `transpose` with `Ialltoall`/`Ialltoallw` and returns at once; neither
+    local nor out may be touched before the request completes.
+
+    Parameters:
+    - local: the calling process's rows of the (m x n) matrix
+    - shape: (m, n), the shape of the whole matrix
+    - comm: the communicator the matrix is distributed over
+    - out: a C-contiguous array for the result, allocated when None
+
+    Returns:
+    A tuple (out, request), out holds the calling process's rows of the transpose
+    once the request has completed
+    """
+    return _start(local, shape, comm, out, nonblocking=True)
+
+
+def _file_view(
+    fh: "MPI.File",
+    etype: "MPI.Datatype",
+    sizes: Tuple[int, int],
+    subsizes: Tuple[int, int],
+    starts: Tuple[int, int],
+) -> None:
+    """
+    Sets the view of fh to the (subsizes) block at starts of a (sizes) row-major
+    matrix, or to the whole file for an empty block. Collective over the file.
+    """
+    if 0 in subsizes:
+        fh.Set_view(0, etype, etype)
+        return
+    filetype = etype.Create_subarray(sizes, subsizes, starts).Commit()
+    fh.Set_view(0, etype, filetype)
+    filetype.Free()
+
+
+def transpose_file(
+    source: str,
+    destination: str,
+    shape: Tuple[int, int],
+    dtype,
+    comm: "MPI.Comm",
+    block: Optional[int] = None,
+) -> None:
+    """
+    Transposes a matrix stored in a binary file into another, streaming it through
+    the processes block by block. Collective over comm.
+
+    Parameters:
+    - source: a file holding the (m x n) matrix in row-major order, without header
+    - destination: the file written, holding the (n x m) transpose the same way
+    - shape: (m, n), the shape of the matrix
+    - dtype: the NumPy dtype of its elements
+    - comm: the communicator sharing the work
+    - block: the edge of the square blocks a process holds at a time, the largest
+      that fits DEFAULT_BLOCK_BYTES when None
+    """
+    m, n = shape
+    dtype = np.dtype(dtype)
+    if block is None:
+        block = max(1, isqrt(DEFAULT_BLOCK_BYTES // dtype.itemsize))
+    etype = dtlib.from_numpy_dtype(dtype)
+    size, rank = comm.Get_size(), comm.Get_rank()
+    # blocks in the order of the destination's rows, so a pass writes neighbours
+    blocks = [(i0, j0) for j0 in range(0, n, block) for i0 in range(0, m, block)]
+
+    fin = MPI.File.Open(comm, source, MPI.MODE_RDONLY)
+    fout = MPI.File.Open(comm, destination, MPI.MODE_WRONLY | MPI.MODE_CREATE)
+    # a longer file left from an earlier run would keep its tail otherwise
+    fout.Set_size(m * n * dtype.itemsize)
+    buffer = np.empty(block * block, dtype=dtype)
+    for first in range(0, len(blocks), size):
+        # every process takes part in every pass, the last ones maybe with nothing
+        h = w = 0
+        i0 = j0 = 0
+        if first + rank < len(blocks):
+            i0, j0 = blocks[first + rank]
+            h, w = min(block, m - i0), min(block, n - j0)
+        a = buffer[: h * w].reshape(h, w)
+        _file_view(fin, etype, (m, n), (h, w), (i0, j0))
+        fin.Read_all([a, etype])
+        if h == w:
+            out = transpose_inplace(a)
+        else:
+            out = local_transpose(a, out=np.empty((w, h), dtype=dtype))
+        _file_view(fout, etype, (n, m), (w, h), (j0, i0))
+        fout.Write_at_all(0, [out, etype])
+    fin.Close()
+    fout.Close()
@@ -0,0 +1,108 @@
+import importlib.util
+from pathlib import Path
+
+import numpy as np
+import pytest
+from mpi4py import MPI
+
+PATH = (
+    Path(__file__).parents[1]
+    / "src/mpi/examples/communication/non-blocking/async_scatter_gather.py"
+)
+spec = importlib.util.spec_from_file_location("async_scatter_gather", PATH)
+async_scatter_gather = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(async_scatter_gather)
+
+
+@pytest.mark.parametrize(
+    "algorithm", ["linear", "binomial", "scatter_allgather", "auto"]
+)
+@pytest.mark.parametrize("buf_size", [1, 7, 64, 10_001])
+@pytest.mark.parametrize("root", [0, -1])
+def test_bcast_algorithms_match_bcast(algorithm, buf_size, root):
+    comm = MPI.COMM_WORLD
+    rank, size = comm.Get_rank(), comm.Get_size()
+    root %= size
+    data = np.random.default_rng(buf_size).random(buf_size)
+    buf = data.copy() if rank == root else None
+    result = async_scatter_gather.async_bcast(
+        buf, buf_size, float, comm, size, root, algorithm=algorithm
+    )
+    expected = comm.bcast(data if rank == root else None, root)
+    assert (result == expected).all()
+
+
+@pytest.mark.parametrize(
+    "nbytes, size, algorithm",
+    [
+        (12287, 8, "binomial"),
+        (12288, 8, "scatter_allgather"),
+        (12288, 7, "binomial"),
+        (1 << 20, 7, "binomial"),
+        (1 << 20, 64, "scatter_allgather"),
+        (8, 64, "binomial"),
+    ],
+)
+def test_auto_selection_thresholds(nbytes, size, algorithm):
+    assert async_scatter_gather.select_bcast_algorithm(nbytes, size) == algorithm
+
+
+def scatter_parts(counts, scale, rank):
+    if rank != 0:
+        return None
+    x = scale * np.arange(sum(counts), dtype=float)
+    return np.split(x, np.cumsum(counts)[:-1])
+
+
+@pytest.mark.parametrize("n, segments", [(0, 2), (5, 3), (103, 4)])
+def test_segmented_scatter_and_gather_with_uneven_counts(n, segments):
+    comm = MPI.COMM_WORLD
+    rank, size = comm.Get_rank(), comm.Get_size()
+    # counts of every size, zero included
+    counts = [n * (p % 3) // 2 + p for p in range(size)]
+    parts = scatter_parts(counts, 1.0, rank)
+    gather = async_scatter_gather.SegmentedGather(counts, float, segments=segments)
+    pieces = []
+    for offset, segment in async_scatter_gather.async_scatter_segments(
+        parts, counts, float, segments=segments
+    ):
+        assert offset == sum(len(piece) for piece in pieces)
+        pieces.append(segment.copy())
+        gather.send(-segment)
+    local = np.concatenate(pieces) if pieces else np.empty(0)
+    assert local.tolist() == comm.scatter(parts, root=0).tolist()
+    result = gather.wait()
+    if rank == 0:
+        assert result.tolist() == (-np.arange(sum(counts), dtype=float)).tolist()
+    else:
+        assert result is None
+
+
+def test_concurrent_scatters_with_separate_tags():
+    comm = MPI.COMM_WORLD
+    rank, size = comm.Get_rank(), comm.Get_size()
+    counts = [10 + p for p in range(size)]
+    streams = {
+        name: async_scatter_gather.async_scatter_segments(
+            scatter_parts(counts, scale, rank), counts, float, tag=tag
+        )
+        for name, scale, tag in [("x", 1.0, 0), ("y", -1.0, 4)]
+    }
+    # the root starts x first, the other processes start y first
+    order = ["x", "y"] if rank == 0 else ["y", "x"]
+    first = {name: next(streams[name]) for name in order}
+    x = np.concatenate([first["x"][1]] + [segment for _, segment in streams["x"]])
+    y = np.concatenate([first["y"][1]] + [segment for _, segment in streams["y"]])
+    assert (x == -y).all() and (x >= 0).all()
+
+
+def test_segment_count_mismatch():
+    counts = [6] * MPI.COMM_WORLD.Get_size()
+    gather = async_scatter_gather.SegmentedGather(counts, float, segments=3)
+    with pytest.raises(ValueError):
+        gather.send(np.zeros(3))
+    with pytest.raises(RuntimeError):
+        gather.wait()
+    for _ in range(3):
+        gather.send(np.zeros(2))
+    gather.wait()
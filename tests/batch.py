@@ -0,0 +1,80 @@
+import numpy as np
+import pytest
+from mpi4py import MPI
+
+from vhpc.mpi.batch import (
+    Job,
+    integrate_jobs,
+    job_segments,
+    left_sums,
+    parse_job,
+    read_jobs,
+    write_results,
+)
+from vhpc.mpi.integrand import create_function_on_process
+
+
+def direct(job):
+    f = create_function_on_process(job.expression)
+    delta_x = (job.b - job.a) / job.n
+    return np.sum(f(job.a + delta_x * np.arange(job.n))) * delta_x
+
+
+def test_parse_job_keeps_commas_in_the_expression():
+    assert parse_job("atan2(x, 1), -1, 2.5, 10") == Job("atan2(x, 1)", -1.0, 2.5, 10)
+    with pytest.raises(ValueError):
+        parse_job("x**2, 0, 1")
+    with pytest.raises(ValueError):
+        parse_job("x**2, 0, 1, 0")
+
+
+def test_job_segments_split_at_job_boundaries():
+    counts = np.array([3, 5, 2])
+    assert list(job_segments(counts, 0, 10)) == [(0, 0, 3), (1, 0, 5), (2, 0, 2)]
+    assert list(job_segments(counts, 2, 5)) == [(0, 2, 1), (1, 0, 4)]
+    assert list(job_segments(counts, 8, 2)) == [(2, 0, 2)]
+    assert list(job_segments(counts, 4, 0)) == []
+
+
+def test_left_sums_pack_small_pieces():
+    calls = []
+
+    def f(x):
+        calls.append(len(x))
+        return np.cos(x)
+
+    start = np.array([0.0, 1.0, -2.0])
+    delta_x = np.array([0.1, 0.01, 0.001])
+    first = np.array([0, 5, 100])
+    count = np.array([10, 20, 50])
+    sums = left_sums(f, start, delta_x, first, count, chunk_size=40)
+    assert calls == [40, 10, 30]
+    for k in range(3):
+        x = start[k] + delta_x[k] * np.arange(first[k], first[k] + count[k])
+        assert sums[k] == pytest.approx(np.sum(np.cos(x)) * delta_x[k], rel=1e-13)
+
+
+def test_integrate_jobs_matches_direct_sums():
+    jobs = [
+        Job("x**2", 0.0, 1.0, 1000),
+        Job("x if x > 0 else -x", -1.0, 1.0, 7),
+        Job("sin(x)", 0.0, 3.0, 100_000),
+        Job("x**2", -1.0, 0.0, 3),
+    ]
+    comm = MPI.COMM_WORLD
+    integrals = integrate_jobs(jobs, comm)
+    if comm.Get_rank() == 0:
+        expected = [direct(job) for job in jobs]
+        assert integrals == pytest.approx(expected, rel=1e-12)
+    else:
+        assert integrals is None
+
+
+def test_jobs_file_round_trip(tmp_path):
+    path = tmp_path / "jobs.txt"
+    path.write_text("# comment\nx**2, 0, 1, 4\n\n2 * x, 0, 1, 2\n")
+    jobs = read_jobs(path)
+    assert jobs == [Job("x**2", 0.0, 1.0, 4), Job("2 * x", 0.0, 1.0, 2)]
+    write_results(tmp_path / "out.txt", jobs, [0.21875, 0.5])
+    lines = (tmp_path / "out.txt").read_text().splitlines()
+    assert lines == ["x**2, 0.0, 1.0, 4, 0.21875", "2 * x, 0.0, 1.0, 2, 0.5"]
@@ -0,0 +1,69 @@
+import importlib.util
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+PATH = (
+    Path(__file__).parents[1]
+    / "src/mpi/examples/communication/non-blocking/transpose.py"
+)
+spec = importlib.util.spec_from_file_location("transpose", PATH)
+transpose = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(transpose)
+
+
+def loop_block_partition(matrix, r, c):
+    p, q = matrix.shape
+    return np.array(
+        [matrix[i : i + r, j : j + c] for i in range(0, p, r) for j in range(0, q, c)]
+    )
+
+
+@pytest.mark.parametrize(
+    "shape,block",
+    [((4, 4), 2), ((6, 4), (3, 2)), ((8, 12), (2, 3)), ((5, 7), (5, 7)), ((6, 2), 2)],
+)
+def test_round_trip(shape, block):
+    A = np.arange(np.prod(shape), dtype=np.float32).reshape(shape)
+    r, c = (block, block) if isinstance(block, int) else block
+    blocks = transpose.block_partition(A, block)
+    assert blocks.dtype == A.dtype
+    assert (blocks == loop_block_partition(A, r, c)).all()
+    assert (transpose.unblock(blocks, shape) == A).all()
+    assert (transpose.unblock(transpose.block_view(A, block), shape) == A).all()
+
+
+def test_views_do_not_copy():
+    A = np.arange(48).reshape(6, 8)
+    view = transpose.block_view(A, (3, 4))
+    assert np.shares_memory(view, A)
+    view[1, 0, 0, 0] = -1
+    assert A[3, 0] == -1
+    # a single column of blocks is already laid out block by block
+    column = np.arange(12).reshape(6, 2)
+    assert np.shares_memory(transpose.block_partition(column, 2), column)
+    blocks = transpose.block_partition(column, 2)
+    assert np.shares_memory(transpose.unblock(blocks, column.shape), column)
+
+
+def test_invalid_blocks():
+    with pytest.raises(ValueError):
+        transpose.block_partition(np.zeros((4, 4)), 3)
+    with pytest.raises(ValueError):
+        transpose.unblock(np.zeros((3, 2, 2)), 4)
+
+
+def test_large_views_and_blocks():
+    n, block = 8192, 512
+    # np.zeros maps its pages lazily, so neither the matrix nor its view touch them
+    A = np.zeros((n, n), dtype=np.float32)
+    view = transpose.block_view(A, block)
+    assert view.shape == (n // block, n // block, block, block)
+    assert np.shares_memory(view, A)
+
+    m = 512
+    A = np.random.default_rng(0).random((m, m))
+    blocks = transpose.block_partition(A, 16)
+    assert (blocks == loop_block_partition(A, 16, 16)).all()
+    assert (transpose.unblock(blocks, m) == A).all()
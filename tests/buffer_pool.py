@@ -0,0 +1,29 @@
+import numpy as np
+
+from vhpc.mpi.buffer_pool import BufferPool, allocate
+
+
+def test_released_buffers_are_reused_per_shape_and_dtype():
+    pool = BufferPool()
+    buf = pool.acquire((2, 3), np.float64)
+    pool.release(buf)
+    assert pool.acquire((2, 3), np.float32) is not buf
+    assert pool.acquire((3, 2), np.float64) is not buf
+    assert pool.acquire((2, 3), np.float64) is buf
+    assert pool.nbytes == 0
+
+
+def test_least_recently_used_buffers_are_evicted_first():
+    pool = BufferPool(capacity=2 * 8 * 10)
+    a, b = pool.acquire(10, "f8"), pool.acquire(10, "f8")
+    c = pool.acquire(10, "i8")
+    pool.release(c)
+    pool.release(a)
+    pool.release(b)  # over capacity: "i8" is the least recently used key
+    assert pool.nbytes == 160
+    assert pool.acquire(10, "i8") is not c
+    assert {id(pool.acquire(10, "f8")), id(pool.acquire(10, "f8"))} == {id(a), id(b)}
+
+
+def test_allocate_without_pool():
+    assert allocate(4, "f8").shape == (4,)
@@ -0,0 +1,73 @@
+import os
+
+import pytest
+from mpi4py import MPI
+
+from vhpc.mpi.batch import Job, integrate_jobs_cached
+from vhpc.mpi.cache import (
+    ResultCache,
+    cached_function_on_process,
+    integral_key,
+    normalized_expression,
+    riemann_rule,
+)
+
+
+def test_key_ignores_formatting_but_not_content():
+    key = integral_key("x**2", 0.0, 1.0, 1000)
+    assert key == integral_key(" (x ** 2) ", 0, 1, 1000)
+    assert key != integral_key("x**3", 0.0, 1.0, 1000)
+    assert key != integral_key("x**2", 0.0, 1.0, 1001)
+    assert key != integral_key("x**2", 0.0, 1.0, 1000, rule="left:neumaier")
+
+
+def test_rules_name_every_option():
+    assert riemann_rule() == "left:naive"
+    assert riemann_rule("neumaier", jit=True) == "left:jit:neumaier"
+
+
+def test_compiled_functions_are_shared():
+    assert normalized_expression("sin( x )*2") == "sin(x) * 2"
+    assert cached_function_on_process("x**2") is cached_function_on_process("x ** 2")
+
+
+def test_result_cache_round_trip(tmp_path):
+    cache = ResultCache(tmp_path)
+    assert cache.get("missing") is None
+    cache.put("k", 1.5, expression="x")
+    assert cache.get("k") == 1.5
+    (tmp_path / "broken.json").write_text("{")
+    assert cache.get("broken") is None
+    cache.clear()
+    assert cache.get("k") is None
+
+
+def test_eviction_drops_least_recently_used(tmp_path):
+    cache = ResultCache(tmp_path)
+    for i, key in enumerate("abc"):
+        cache.put(key, float(i))
+        os.utime(cache.path(key), (i, i))
+    entry_size = cache.path("a").stat().st_size
+    cache.get("a")  # refreshes a, so b is now the oldest
+    cache.capacity = 3 * entry_size
+    cache.put("d", 3.0)
+    assert [cache.get(key) for key in "abcd"] == [0.0, None, 2.0, 3.0]
+
+
+def test_batch_hits_are_answered_by_root(tmp_path):
+    comm = MPI.COMM_WORLD
+    path = comm.bcast(str(tmp_path), root=0)
+    cache = ResultCache(path)
+    jobs = [Job("x**2", 0.0, 1.0, 1000), Job("2 * x", 0.0, 1.0, 10)]
+    first = integrate_jobs_cached(jobs, comm, cache)
+    # the batch shares its entries with the programs' naive summation
+    naive = riemann_rule("naive")
+    if comm.Get_rank() == 0:
+        assert cache.get(integral_key("x**2", 0.0, 1.0, 1000, naive)) == first[0]
+        cache.put(integral_key("2 * x", 0.0, 1.0, 10, naive), -1.0)
+    second = integrate_jobs_cached(jobs, comm, cache)
+    if comm.Get_rank() == 0:
+        assert first.tolist() == pytest.approx([0.3328335, 0.9])
+        assert second.tolist() == [first[0], -1.0]
+    else:
+        assert first is None and second is None
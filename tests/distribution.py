@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+from mpi4py import MPI
+
+from vhpc.mpi.distribution import (
+    binomial_tree,
+    block_interval,
+    block_layout,
+    gatherv,
+    scatterv,
+)
+
+
+def test_scatterv_gatherv_round_trip():
+    comm = MPI.COMM_WORLD
+    x = np.arange(11.0) if comm.Get_rank() == 0 else None
+    local = scatterv(x, 11, float, comm)
+    counts, _ = block_layout(11, comm)
+    assert len(local) == counts[comm.Get_rank()]
+    result = gatherv(local, 11, comm)
+    if comm.Get_rank() == 0:
+        np.testing.assert_array_equal(result, x)
+
+
+def test_block_interval_lies_on_global_grid():
+    start, end, count = block_interval(0.0, 1.0, 10, MPI.COMM_SELF)
+    assert (start, end, count) == (0.0, 1.0, 10)
+
+
+@pytest.mark.parametrize("size", [1, 2, 5, 8, 13])
+@pytest.mark.parametrize("root", [0, 3])
+def test_binomial_tree_spans_every_process(size, root):
+    root %= size
+    trees = [binomial_tree(rank, size, root) for rank in range(size)]
+    assert trees[root][0] is None
+    for rank, (parent, children) in enumerate(trees):
+        for child in children:
+            assert trees[child][0] == rank
+        if rank != root:
+            assert rank in trees[parent][1]
+    # every process is reached in ceil(log2(size)) rounds
+    assert len(trees[root][1]) == (size - 1).bit_length()
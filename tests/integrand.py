@@ -0,0 +1,51 @@
+import math
+
+import numpy as np
+import pytest
+
+from vhpc.mpi.integrand import create_function_on_process
+
+X = np.linspace(-2.0, 3.0, 11)
+
+
+@pytest.mark.parametrize(
+    "expression", ["x**2 + 1", "math.exp(-x) * sin(x)", "abs(x) + pi", "np.cos(x)"]
+)
+def test_array_expressions_are_vectorized(expression):
+    f = create_function_on_process(expression)
+    assert f.vectorized
+    scalar = [create_function_on_process(expression)(float(x)) for x in X]
+    np.testing.assert_allclose(f(X), scalar)
+
+
+@pytest.mark.parametrize("expression", ["x if x > 0 else -x", "max(x, 0.5)"])
+def test_scalar_only_expressions_fall_back(expression):
+    f = create_function_on_process(expression)
+    assert not f.vectorized
+    np.testing.assert_allclose(f(X), [eval(expression, {"x": x}) for x in X])
+
+
+def test_constant_expression_broadcasts():
+    f = create_function_on_process("2 * pi")
+    np.testing.assert_allclose(f(X), np.full(X.shape, 2 * np.pi))
+
+
+@pytest.mark.parametrize("expression", ["math.log(x, 2)", "log(x, 10) + log(x)"])
+def test_log_with_a_base(expression):
+    positive = np.linspace(0.5, 8.0, 16)
+    f = create_function_on_process(expression)
+    assert f.vectorized
+    np.testing.assert_allclose(
+        f(positive),
+        [eval(expression, vars(math) | {"math": math, "x": x}) for x in positive],
+    )
+
+
+@pytest.mark.parametrize(
+    "expression, expected",
+    [("math.remainder(x, 3)", -1.0), ("math.isclose(x, 5 + 1e-10)", 1.0)],
+)
+def test_math_semantics_are_kept(expression, expected):
+    f = create_function_on_process(expression)
+    assert not f.vectorized
+    assert f(np.array([5.0])).tolist() == [expected]
@@ -0,0 +1,40 @@
+import math
+
+import pytest
+from mpi4py import MPI
+
+from vhpc.mpi.jit import (
+    expression_key,
+    riemann_kernel,
+    riemann_kernel_on_processes,
+    write_kernel_module,
+)
+
+numba = pytest.importorskip("numba")
+
+
+def test_expression_key_ignores_formatting():
+    assert expression_key("x**2+1") == expression_key(" x ** 2 + 1 ")
+    assert expression_key("x**2") != expression_key("x**3")
+
+
+def test_kernel_matches_left_riemann_sum(tmp_path, monkeypatch):
+    monkeypatch.setenv("VHPC_JIT_CACHE", str(tmp_path))
+    riemann_kernel.cache_clear()
+    kernel = riemann_kernel("sin(x) + x ** 2")
+    assert write_kernel_module("sin(x)+x**2").parent == tmp_path
+    delta_x = 1e-3
+    expected = sum(
+        (math.sin(i * delta_x) + (i * delta_x) ** 2) * delta_x for i in range(1000)
+    )
+    assert kernel(0.0, delta_x, 1000) == pytest.approx(expected, rel=1e-12)
+
+
+def test_compile_failure_on_root_raises_everywhere(tmp_path, monkeypatch):
+    comm = MPI.COMM_WORLD
+    monkeypatch.setenv("VHPC_JIT_CACHE", str(tmp_path))
+    # valid Python that Numba cannot type; the other processes must not wait for
+    # the kernel
+    with pytest.raises(Exception, match="undefined_function"):
+        riemann_kernel_on_processes("undefined_function(x)", comm)
+    comm.Barrier()
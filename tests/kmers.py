@@ -0,0 +1,123 @@
+import os
+import shutil
+import tempfile
+from collections import Counter
+
+import numpy as np
+import pytest
+from mpi4py import MPI
+
+from vhpc.mpi.kmers import (
+    MAX_K,
+    count_kmers,
+    count_kmers_file,
+    decode_kmer,
+    halo,
+    kmer_codes,
+    owners,
+    sort_reduce,
+    top_kmers,
+)
+from vhpc.mpi.packed import packed_range, write_packed
+from vhpc.mpi.partition import block_range
+
+
+def expected_counts(codes, k):
+    return Counter(kmer_codes(codes, k).tolist())
+
+
+def gathered_counts(kmers, counts, comm):
+    pairs = comm.allgather(list(zip(kmers.tolist(), counts.tolist())))
+    merged = [pair for part in pairs for pair in part]
+    # every k-mer is counted by one process only
+    assert len(merged) == len({kmer for kmer, _ in merged})
+    return Counter(dict(merged))
+
+
+@pytest.mark.parametrize("k", [1, 2, 3, 5, 7, 31, 32])
+def test_kmer_codes_match_rolling_encoding(k):
+    codes = np.random.default_rng(k).integers(0, 4, 100).astype(np.uint8)
+    expected = []
+    for i in range(codes.size - k + 1):
+        kmer = 0
+        for code in codes[i : i + k]:
+            kmer = (kmer << 2) | int(code)
+        expected.append(kmer)
+    assert kmer_codes(codes, k).tolist() == expected
+    assert kmer_codes(codes[: k - 1], k).size == 0
+    assert decode_kmer(expected[0], k) == "".join("ACGT"[c] for c in codes[:k])
+
+
+def test_invalid_k():
+    with pytest.raises(ValueError):
+        kmer_codes(np.zeros(10, dtype=np.uint8), MAX_K + 1)
+    with pytest.raises(ValueError):
+        kmer_codes(np.zeros(10, dtype=np.uint8), 0)
+
+
+def test_sort_reduce_and_owners():
+    kmers = np.array([5, 3, 5, 9, 3, 5], dtype=np.uint64)
+    counts = np.array([1, 2, 3, 4, 5, 6], dtype=np.int64)
+    reduced = sort_reduce(kmers, counts)
+    assert [r.tolist() for r in reduced] == [[3, 5, 9], [7, 10, 4]]
+    assert [r.tolist() for r in sort_reduce(kmers)] == [[3, 5, 9], [2, 3, 1]]
+    destination = owners(np.arange(10_000, dtype=np.uint64), 7)
+    assert destination.min() == 0 and destination.max() == 6
+    # consecutive k-mers are spread evenly
+    assert np.bincount(destination).min() > 1200
+
+
+@pytest.mark.parametrize("length", [0, 3, 10, 1000])
+def test_halo(length):
+    comm = MPI.COMM_WORLD
+    k = 5
+    sequence = np.random.default_rng(length).integers(0, 4, length).astype(np.uint8)
+    offset, count = block_range(length, comm.Get_size(), comm.Get_rank())
+    received = halo(sequence[offset : offset + count], k, comm)
+    end = offset + count
+    assert received.tolist() == sequence[end : end + k - 1].tolist()
+
+
+@pytest.mark.parametrize("length, k", [(0, 3), (6, 4), (1000, 1), (5000, 7)])
+@pytest.mark.parametrize("chunk_bases", [3, 1 << 20])
+def test_count_kmers(length, k, chunk_bases):
+    comm = MPI.COMM_WORLD
+    sequence = np.random.default_rng(length).integers(0, 4, length).astype(np.uint8)
+    offset, count = block_range(length, comm.Get_size(), comm.Get_rank())
+    kmers, counts = count_kmers(sequence[offset : offset + count], k, comm, chunk_bases)
+    assert (np.diff(kmers.astype(np.float64)) > 0).all()
+    assert (owners(kmers, comm.Get_size()) == comm.Get_rank()).all()
+    assert gathered_counts(kmers, counts, comm) == expected_counts(sequence, k)
+
+
+def test_top_kmers():
+    comm = MPI.COMM_WORLD
+    sequence = np.array([0, 0, 0, 1, 0, 0, 0, 1, 2, 3] * 20, dtype=np.uint8)
+    offset, count = block_range(sequence.size, comm.Get_size(), comm.Get_rank())
+    kmers, counts = count_kmers(sequence[offset : offset + count], 3, comm)
+    top = top_kmers(kmers, counts, 3, comm, root=0)
+    if comm.Get_rank() == 0:
+        expected = sorted(
+            expected_counts(sequence, 3).items(), key=lambda p: (-p[1], p[0])
+        )[:3]
+        assert top == expected
+        assert decode_kmer(top[0][0], 3) == "AAA"
+    else:
+        assert top is None
+
+
+def test_count_kmers_file():
+    comm = MPI.COMM_WORLD
+    directory = comm.bcast(tempfile.mkdtemp() if comm.Get_rank() == 0 else None)
+    filename = os.path.join(directory, "sequence.vhna")
+    length, k = 3001, 11
+    sequence = np.random.default_rng(2).integers(0, 4, length).astype(np.uint8)
+    offset, count = packed_range(length, comm)
+    write_packed(filename, sequence[offset : offset + count], offset, length, comm)
+
+    header, kmers, counts = count_kmers_file(filename, k, comm, chunk_bases=100)
+    assert header.length == length
+    assert gathered_counts(kmers, counts, comm) == expected_counts(sequence, k)
+    comm.Barrier()
+    if comm.Get_rank() == 0:
+        shutil.rmtree(directory)
@@ -0,0 +1,102 @@
+import random
+
+import pytest
+from mpi4py import MPI
+
+from vhpc.mpi.matrix import MATMUL_KERNELS, Matrix, matmul
+
+
+@pytest.fixture
+def A():
+    return Matrix([[1, 2, 3], [4, 5, 6]])
+
+
+def test_storage_is_flat_and_typed(A):
+    assert A.typecode == "q" and A.data.tolist() == [1, 2, 3, 4, 5, 6]
+    assert A.strides == (3, 1) and A.is_contiguous()
+    assert Matrix([[1, 2.5]]).typecode == "d"
+    with pytest.raises(AttributeError):
+        A.extra = 1
+    with pytest.raises(ValueError):
+        Matrix([[1, 2], [3]])
+
+
+def test_indexing(A):
+    assert A[0, 0] == 1 and A[1, -1] == 6
+    A[1, 0] = 40
+    assert A[1, 0] == 40
+    with pytest.raises(IndexError):
+        A[2, 0]
+    with pytest.raises(TypeError):
+        A[0]
+    assert A[0, :].tolist() == [[1, 2, 3]]
+    assert A[:, 1].tolist() == [[2], [5]]
+    assert A[:, ::2].tolist() == [[1, 3], [40, 6]]
+    assert A[::-1, 1:].tolist() == [[5, 6], [2, 3]]
+
+
+def test_slices_are_copy_on_write_views(A):
+    row, column, block = A[1, :], A[:, 1], A[::-1, ::-2]
+    assert all(view.data is A.data for view in (row, column, block, A.T()))
+    assert block.tolist() == [[6, 4], [3, 1]]
+    assert block.T()[0, :].tolist() == [[6, 3]]
+    column[1, 0] = 50
+    assert column.tolist() == [[2], [50]] and column.data is not A.data
+    assert A[1, 1] == 5 and row.tolist() == [[4, 5, 6]]
+    A[0, 0] = 10
+    assert A[0, 0] == 10 and block[1, 1] == 1 and A.T()[0, 0] == 10
+
+
+def test_arithmetic_on_views():
+    A = Matrix([[float(i * 4 + j) for j in range(4)] for i in range(4)])
+    B = A[1:, ::2]
+    expected = [
+        [sum(B[i, k] * B[j, k] for k in range(2)) for j in range(3)] for i in range(3)
+    ]
+    assert (B * B.T()).tolist() == expected
+    assert (B + B).tolist() == [[2 * x for x in row] for row in B.tolist()]
+    assert B.copy().is_contiguous() and not B.is_contiguous()
+
+
+def test_arithmetic(A):
+    B = Matrix([[1.0, 0.5], [0.0, 1.0], [2.0, 0.0]])
+    assert (A * B).tolist() == [[7.0, 2.5], [16.0, 7.0]]
+    assert A.T().tolist() == [[1, 4], [2, 5], [3, 6]]
+    assert (A + A).tolist() == [[2, 4, 6], [8, 10, 12]]
+    assert A == Matrix([[1.0, 2.0, 3.0], [4.0, 5.0, 6.0]])
+    assert not A == A.T().T() * Matrix([[1, 0, 0], [0, 1, 0], [0, 0, 2]])
+    assert str(A) == "Matrix: 2x3\n1 2 3\n4 5 6"
+
+
+def test_matrices_travel_as_buffers(A):
+    received = Matrix.zeros(2, 3, A.typecode)
+    MPI.COMM_SELF.Sendrecv(A, 0, recvbuf=received, source=0)
+    assert received == A
+    # receiving into a view must not write into the matrix it came from
+    row = A[0, :]
+    MPI.COMM_SELF.Sendrecv(A[1, :], 0, recvbuf=row, source=0)
+    assert row.tolist() == [[4, 5, 6]] and A[0, :].tolist() == [[1, 2, 3]]
+    transposed = Matrix.from_buffer(A.data, (3, 2), strides=(1, 3))
+    assert transposed.tolist() == A.T().tolist()
+    with pytest.raises(BufferError):
+        transposed.__buffer__(0)
+
+
+@pytest.mark.parametrize("kernel", list(MATMUL_KERNELS))
+@pytest.mark.parametrize("typecode", ["q", "d"])
+def test_matmul_kernels_agree(kernel, typecode):
+    if kernel == "numba":
+        pytest.importorskip("numba")
+    rng = random.Random(0)
+    A = Matrix([[rng.randint(-9, 9) for _ in range(70)] for _ in range(30)], typecode)
+    B = Matrix([[rng.randint(-9, 9) for _ in range(40)] for _ in range(70)], typecode)
+    expected = matmul(A, B, "naive")
+    product = matmul(A, B, kernel)
+    assert product == expected and product.typecode == typecode
+    # strided and reversed views go through the same kernels
+    assert matmul(B.T()[::-1, :], A.T(), kernel) == expected.T()[::-1, :]
+
+
+def test_unknown_kernel():
+    with pytest.raises(ValueError):
+        matmul(Matrix([[1]]), Matrix([[1]]), "strassen")
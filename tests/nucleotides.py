@@ -0,0 +1,76 @@
+import os
+import shutil
+import tempfile
+from collections import Counter
+
+import numpy as np
+import pytest
+from mpi4py import MPI
+
+from vhpc.mpi.nucleotides import SequenceCounter, count_file, letter_counts
+
+
+def reference_counts(text: bytes) -> Counter:
+    counts = Counter()
+    for line in text.split(b"\n"):
+        if not line.startswith(b">"):
+            counts.update(chr(b).upper() for b in line)
+    return counts
+
+
+def random_fasta(rng, records: int) -> bytes:
+    lines = []
+    for r in range(records):
+        lines.append(f">record {r} > acgu header".encode())
+        sequence = rng.choice(list(b"ACGUacguN"), rng.integers(0, 300)).astype(np.uint8)
+        lines += [bytes(sequence[i : i + 60]) for i in range(0, sequence.size, 60)]
+    return b"\n".join(lines) + b"\n"
+
+
+@pytest.fixture
+def directory():
+    comm = MPI.COMM_WORLD
+    path = comm.bcast(tempfile.mkdtemp() if comm.Get_rank() == 0 else None)
+    yield path
+    comm.Barrier()
+    if comm.Get_rank() == 0:
+        shutil.rmtree(path)
+
+
+@pytest.mark.parametrize("chunk_bytes", [1, 7, 64, 1 << 20])
+@pytest.mark.parametrize("records", [0, 1, 25])
+def test_count_file_matches_reference(directory, chunk_bytes, records):
+    comm = MPI.COMM_WORLD
+    filename = os.path.join(directory, "sequence.fasta")
+    text = random_fasta(np.random.default_rng(records), records)
+    if comm.Get_rank() == 0:
+        with open(filename, "wb") as file:
+            file.write(text)
+    comm.Barrier()
+    counts = count_file(filename, comm, chunk_bytes)
+    expected = reference_counts(text)
+    assert letter_counts(counts, "ACGUN") == {c: expected[c] for c in "ACGUN"}
+    assert counts[ord(">")] == 0
+
+
+def test_reduce_to_root(directory):
+    comm = MPI.COMM_WORLD
+    filename = os.path.join(directory, "sequence.txt")
+    if comm.Get_rank() == 0:
+        with open(filename, "wb") as file:
+            file.write(b"acgu" * 1000)
+    comm.Barrier()
+    root = comm.Get_size() - 1
+    counts = count_file(filename, comm, chunk_bytes=100, root=root)
+    if comm.Get_rank() == root:
+        assert letter_counts(counts) == dict.fromkeys("ACGU", 1000)
+    else:
+        assert counts is None
+
+
+def test_headers_split_across_chunks():
+    counter = SequenceCounter()
+    for chunk in [b"ac", b"g\n>he", b"ader ", b"gg>g", b"\nuu", b"\n>x\nc"]:
+        counter.update(np.frombuffer(chunk, dtype=np.uint8))
+    counts = counter.resolve(MPI.COMM_SELF)
+    assert letter_counts(counts) == {"A": 1, "C": 2, "G": 1, "U": 2}
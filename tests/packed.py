@@ -0,0 +1,113 @@
+import os
+import shutil
+import tempfile
+
+import numpy as np
+import pytest
+from mpi4py import MPI
+
+from vhpc.mpi.packed import (
+    HEADER_SIZE,
+    PackedHeader,
+    checksum,
+    count_packed,
+    count_packed_file,
+    encode,
+    pack,
+    pack_sequence,
+    packed_range,
+    packed_size,
+    read_packed,
+    unpack,
+    unpack_sequence,
+    write_packed,
+)
+
+
+@pytest.fixture
+def filename():
+    comm = MPI.COMM_WORLD
+    directory = comm.bcast(tempfile.mkdtemp() if comm.Get_rank() == 0 else None)
+    yield os.path.join(directory, "sequence.vhna")
+    comm.Barrier()
+    if comm.Get_rank() == 0:
+        shutil.rmtree(directory)
+
+
+@pytest.mark.parametrize("length", [0, 1, 3, 4, 5, 1001])
+def test_pack_round_trip_and_counts(length):
+    codes = np.random.default_rng(length).integers(0, 4, length).astype(np.uint8)
+    packed = pack(codes)
+    assert packed.dtype == np.uint8 and packed.size == packed_size(length)
+    assert (unpack(packed, length) == codes).all()
+    expected = np.bincount(codes, minlength=4).tolist()
+    assert count_packed(packed, length).tolist() == expected
+
+
+def test_sequences_and_alphabets():
+    assert unpack_sequence(pack_sequence("gattaca", "ACGT"), 7, "ACGT") == b"GATTACA"
+    assert pack_sequence("AAAA") == b"\x00" and pack_sequence("UUUU") == b"\xff"
+    with pytest.raises(ValueError):
+        encode(np.frombuffer(b"ACGT", dtype=np.uint8), "ACGU")
+    with pytest.raises(ValueError):
+        pack_sequence("ACGU", "ACG")
+
+
+def test_checksum_of_parts():
+    data = np.random.default_rng(0).integers(0, 256, 10_000).astype(np.uint8)
+    expected = sum((i + 1) * int(b) for i, b in enumerate(data)) % 2**32
+    assert checksum(data) == expected
+    assert (checksum(data[:3333]) + checksum(data[3333:], 3333)) % 2**32 == expected
+
+
+def test_header_round_trip():
+    header = PackedHeader(10**12, b"ACGT", 12345)
+    data = header.encode()
+    assert len(data) == HEADER_SIZE and PackedHeader.decode(data) == header
+    with pytest.raises(ValueError):
+        PackedHeader.decode(b"XXXX" + data[4:])
+
+
+@pytest.mark.parametrize("length", [0, 5, 4097])
+def test_write_read_and_count_file(filename, length):
+    comm = MPI.COMM_WORLD
+    sequence = np.random.default_rng(1).integers(0, 4, length).astype(np.uint8)
+    offset, count = packed_range(length, comm)
+    local = sequence[offset : offset + count]
+    # consecutive arrays of any size, not only multiples of four
+    pieces = np.array_split(local, 3)
+    header = write_packed(filename, pieces, offset, length, comm, "acgt", 16)
+    assert header.length == length and header.alphabet == b"ACGT"
+    assert os.path.getsize(filename) == HEADER_SIZE + packed_size(length)
+
+    read, read_offset, codes = read_packed(filename, comm)
+    assert read == header and read_offset == offset
+    assert (codes == local).all()
+
+    _, counts = count_packed_file(filename, comm, chunk_bytes=7)
+    assert counts.tolist() == np.bincount(sequence, minlength=4).tolist()
+
+
+def test_corruption_is_detected(filename):
+    comm = MPI.COMM_WORLD
+    length = 1000
+    offset, count = packed_range(length, comm)
+    write_packed(filename, np.ones(count, dtype=np.uint8), offset, length, comm)
+    if comm.Get_rank() == 0:
+        with open(filename, "r+b") as file:
+            file.seek(HEADER_SIZE + 100)
+            file.write(b"\x00")
+    comm.Barrier()
+    with pytest.raises(ValueError):
+        read_packed(filename, comm)
+    with pytest.raises(ValueError):
+        count_packed_file(filename, comm)
+    _, counts = count_packed_file(filename, comm, verify=False)
+    assert counts.tolist() == [4, 996, 0, 0]
+
+
+def test_missing_bases_are_an_error(filename):
+    comm = MPI.COMM_WORLD
+    offset, count = packed_range(100, comm)
+    with pytest.raises(ValueError):
+        write_packed(filename, np.zeros(count, dtype=np.uint8), offset, 101, comm)
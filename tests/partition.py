@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+
+from vhpc.mpi.partition import (
+    batched,
+    block_counts,
+    block_cyclic_partition,
+    block_cyclic_ranges,
+    block_partition,
+    block_range,
+    block_ranges,
+    cyclic_partition,
+    displacements,
+)
+
+
+@pytest.mark.parametrize("n,parts", [(10, 3), (12, 4), (3, 5), (0, 2), (1, 1)])
+def test_block_layout_covers_input(n, parts):
+    counts = block_counts(n, parts)
+    assert counts.sum() == n
+    assert counts.max() - counts.min() <= 1
+    assert block_ranges(n, parts) == [block_range(n, parts, p) for p in range(parts)]
+    assert displacements(counts).tolist() == [o for o, _ in block_ranges(n, parts)]
+
+
+def test_block_partition_returns_views():
+    x = np.arange(10.0)
+    parts = block_partition(x, 3)
+    assert all(np.shares_memory(part, x) for part in parts)
+    np.testing.assert_array_equal(np.concatenate(parts), x)
+
+
+def test_cyclic_partition_returns_views():
+    x = np.arange(10)
+    parts = cyclic_partition(x, 3)
+    assert all(np.shares_memory(part, x) for part in parts)
+    assert sorted(np.concatenate(parts).tolist()) == x.tolist()
+
+
+def test_block_cyclic_handles_remainder():
+    assert block_cyclic_ranges(10, 2, 3) == [[(0, 3), (6, 3)], [(3, 3), (9, 1)]]
+    x = np.arange(10)
+    parts = block_cyclic_partition(x, 2, 3)
+    assert [np.concatenate(p).tolist() for p in parts] == [
+        [0, 1, 2, 6, 7, 8],
+        [3, 4, 5, 9],
+    ]
+
+
+def test_batched():
+    assert list(batched(range(7), 3)) == [[0, 1, 2], [3, 4, 5], [6]]
+    x = np.arange(7)
+    assert all(np.shares_memory(b, x) for b in batched(x, 3))
+    with pytest.raises(ValueError):
+        list(batched(x, 0))
@@ -0,0 +1,71 @@
+import importlib.util
+from pathlib import Path
+
+import numpy as np
+import pytest
+from mpi4py import MPI
+
+PATH = (
+    Path(__file__).parents[1]
+    / "src/mpi/examples/communication/non-blocking/persistent_collectives.py"
+)
+spec = importlib.util.spec_from_file_location("persistent_collectives", PATH)
+persistent_collectives = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(persistent_collectives)
+
+
+def test_plan_is_abstract():
+    with pytest.raises(TypeError):
+        persistent_collectives.PersistentPlan(MPI.COMM_WORLD)
+
+
+@pytest.mark.parametrize("root", [0, 1])
+def test_bcast_plan_is_reused_and_rebound(root):
+    comm = MPI.COMM_WORLD
+    rank = comm.Get_rank()
+    root %= comm.Get_size()
+    plan = persistent_collectives.BcastPlan((5, 3), float, comm, root)
+    data = np.arange(15.0).reshape(5, 3)
+    buf = data.copy() if rank == root else None
+    result = plan.run(buf)
+    assert (result == comm.bcast(data if rank == root else None, root)).all()
+
+    # the same buffers keep the same requests
+    requests, bound = list(plan.requests), plan.bound
+    result = plan.run(data * 2 if rank == root else result)
+    if rank != root:
+        assert plan.requests == requests and plan.bound == bound
+    assert (result == data * 2).all()
+
+    # a buffer at another address gets new requests
+    moved = data * 3 if rank == root else np.empty((5, 3))
+    result = plan.run(moved)
+    assert result is moved and (result == data * 3).all()
+    assert plan.bound != bound
+    with pytest.raises(ValueError):
+        plan.run(np.empty((3, 5)).T)
+    plan.free()
+
+
+@pytest.mark.parametrize("n", [1, 7, 1000])
+def test_scatter_and_gather_plans(n):
+    comm = MPI.COMM_WORLD
+    rank = comm.Get_rank()
+    scatter = persistent_collectives.ScatterPlan((n, 2), np.int64, comm)
+    gather = persistent_collectives.GatherPlan((n, 2), np.int64, comm)
+    x = np.arange(2 * n, dtype=np.int64).reshape(n, 2) if rank == 0 else None
+    for iteration in range(3):
+        local = scatter.run(x)
+        assert local is scatter.recvbuf
+        expected = comm.scatter(
+            np.array_split(x, comm.Get_size()) if rank == 0 else None
+        )
+        assert (local == expected).all()
+        local += 1
+        x = gather.run(local)
+    if rank == 0:
+        assert (x == np.arange(2 * n).reshape(n, 2) + 3).all()
+    else:
+        assert x is None
+    scatter.free()
+    gather.free()
@@ -0,0 +1,57 @@
+import math
+
+import numpy as np
+import pytest
+from mpi4py import MPI
+
+from vhpc.mpi.integrand import create_function_on_process
+from vhpc.mpi.quadrature import (
+    GAUSS_WEIGHTS,
+    KRONROD_WEIGHTS,
+    adaptive_quadrature,
+    gauss_kronrod,
+    refine,
+)
+
+
+def test_rules_integrate_constants_exactly():
+    assert KRONROD_WEIGHTS.sum() == pytest.approx(2.0, abs=1e-15)
+    assert GAUSS_WEIGHTS.sum() == pytest.approx(2.0, abs=1e-15)
+
+
+def test_kronrod_is_exact_for_polynomials_of_degree_22():
+    integral, error = gauss_kronrod(lambda x: x**22, [0.0, -1.0], [1.0, 1.0])
+    assert integral == pytest.approx([1 / 23, 2 / 23], rel=1e-13)
+    assert np.all(error > 0)
+
+
+def test_refine_bisects():
+    halves = refine(np.cos, np.array([[0.0, 1.0], [2.0, 4.0]]))
+    assert halves[:, :2].tolist() == [[0, 0.5], [0.5, 1], [2, 3], [3, 4]]
+    exact = math.sin(1.0) + math.sin(4.0) - math.sin(2.0)
+    assert halves[:, 2].sum() == pytest.approx(exact, rel=1e-13)
+
+
+@pytest.mark.parametrize("batch", [1, 8])
+def test_adaptive_quadrature_resolves_a_spike(batch):
+    f = create_function_on_process("1 / ((x - 0.3) ** 2 + 1e-6)")
+    exact = 1e3 * (math.atan(700.0) + math.atan(300.0))
+    integral, error, intervals = adaptive_quadrature(f, 0.0, 1.0, 1e-8, batch=batch)
+    assert error <= 1e-8
+    assert integral == pytest.approx(exact, abs=1e-8)
+    assert intervals < 500
+
+
+def test_subdivision_budget():
+    f = create_function_on_process("sqrt(abs(x))")
+    _, error, intervals = adaptive_quadrature(f, -1.0, 1.0, 0.0, max_intervals=10)
+    assert intervals >= 10 and error > 0
+
+
+def test_adaptive_quadrature_on_all_processes():
+    comm = MPI.COMM_WORLD
+    integral, error, _ = adaptive_quadrature(np.sin, 0.0, math.pi, 1e-12, comm)
+    if comm.Get_rank() == 0:
+        assert integral == pytest.approx(2.0, abs=1e-12)
+    else:
+        assert integral is None
@@ -0,0 +1,56 @@
+import importlib.util
+from argparse import Namespace
+from pathlib import Path
+
+import numpy as np
+import pytest
+from mpi4py import MPI
+
+from vhpc.mpi.riemann import left_block_sums, riemann_sum_left
+
+PATH = (
+    Path(__file__).parents[1]
+    / "src/mpi/examples/communication/collective/numpy/numpy_riemann_sum_reduce.py"
+)
+spec = importlib.util.spec_from_file_location("numpy_riemann_sum_reduce", PATH)
+numpy_riemann_sum_reduce = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(numpy_riemann_sum_reduce)
+
+
+@pytest.mark.parametrize("count,block_size", [(0, 4), (1, 4), (10, 3), (1000, 64)])
+def test_streaming_sum_matches_materialised_sum(count, block_size):
+    delta_x = 0.5 / max(count, 1)
+    x = 0.25 + delta_x * np.arange(count)
+    expected = np.sum(np.cos(x)) * delta_x
+    result = riemann_sum_left(np.cos, 0.25, delta_x, count, block_size)
+    assert result == pytest.approx(expected, rel=1e-13, abs=1e-15)
+
+
+def test_block_sums_never_exceed_block_size():
+    seen = []
+    list(left_block_sums(lambda x: seen.append(len(x)) or x, 0.0, 1.0, 10, 4))
+    assert seen == [4, 4, 2]
+
+
+@pytest.mark.parametrize("summation", ["naive", "pairwise", "neumaier"])
+@pytest.mark.parametrize("n, expected", [(0, 0.0), (2, 0.125)])
+def test_fewer_partitions_than_processes(monkeypatch, summation, n, expected):
+    # with more than n processes some of them get no partition at all
+    answers = iter(["x**2", f"0 1 {n}"])
+    monkeypatch.setattr("builtins.input", lambda: next(answers))
+    monkeypatch.setattr(
+        "sys.argv", ["numpy_riemann_sum_reduce", "--summation", summation]
+    )
+    global_sum = numpy_riemann_sum_reduce.main()
+    if MPI.COMM_WORLD.Get_rank() == 0:
+        assert global_sum[0] == pytest.approx(expected)
+
+
+def test_cache_rule_names_every_option():
+    rules = {
+        numpy_riemann_sum_reduce.cache_rule(Namespace(jit=jit, summation=summation))
+        for jit in (False, True)
+        for summation in ("naive", "pairwise", "neumaier")
+    }
+    assert len(rules) == 6
+    assert "left:naive" in rules and "left:jit:neumaier" in rules
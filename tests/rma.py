@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+from mpi4py import MPI
+
+from vhpc.mpi.rma import RMAReducer
+
+
+@pytest.mark.parametrize("dtype", [np.float64, np.int64])
+def test_many_contributions_per_epoch(dtype):
+    comm = MPI.COMM_WORLD
+    rank, size = comm.Get_rank(), comm.Get_size()
+    reducer = RMAReducer(comm, count=3, dtype=dtype)
+    for _ in range(2):
+        reducer.start()
+        for chunk in range(4):
+            reducer.accumulate(np.full(3, rank + chunk, dtype=dtype))
+        reducer.accumulate(np.array([1], dtype=dtype), offset=2)
+        result = reducer.complete()
+        if rank == 0:
+            expected = 4 * size * (size - 1) // 2 + 6 * size
+            assert result.dtype == dtype
+            assert result.tolist() == [expected, expected, expected + size]
+        else:
+            assert result is None
+        reducer.reset()
+    reducer.free()
+
+
+def test_slots_and_other_operations():
+    comm = MPI.COMM_WORLD
+    rank, size = comm.Get_rank(), comm.Get_size()
+    root = size - 1
+    reducer = RMAReducer(comm, count=2 * size, root=root, op=MPI.MAX)
+    reducer.start()
+    # one operation per location within an epoch: REPLACE into the first size
+    # slots, one each, and MAX into the second size slots
+    reducer.accumulate(np.array([rank + 0.5]), offset=rank, op=MPI.REPLACE)
+    reducer.accumulate(np.full(size, rank + 1.0), offset=size)
+    result = reducer.complete()
+    if rank == root:
+        assert result.tolist() == [r + 0.5 for r in range(size)] + [float(size)] * size
+    with pytest.raises(ValueError):
+        reducer.accumulate(np.zeros(2), offset=2 * size - 1)
+    reducer.free()
@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+from mpi4py import MPI
+
+from vhpc.mpi.summa import (
+    create_grid,
+    free_grid,
+    gather_blocks,
+    padded_shape,
+    scatter_blocks,
+    summa,
+    summa_matmul,
+)
+
+
+@pytest.mark.parametrize("m, k, n", [(1, 1, 1), (7, 5, 3), (16, 16, 16), (9, 13, 11)])
+def test_summa_matches_matmul(m, k, n):
+    comm = MPI.COMM_WORLD
+    rng = np.random.default_rng(m * k * n)
+    A, B = rng.random((m, k)), rng.random((k, n))
+    C = summa_matmul(A, B, comm)
+    if comm.Get_rank() == 0:
+        assert C.shape == (m, n)
+        np.testing.assert_allclose(C, A @ B)
+    else:
+        assert C is None
+
+
+def test_integer_matrices_stay_integer():
+    A = np.arange(12).reshape(3, 4)
+    C = summa_matmul(A, A.T, MPI.COMM_WORLD)
+    if MPI.COMM_WORLD.Get_rank() == 0:
+        assert C.dtype == A.dtype
+        assert (C == A @ A.T).all()
+
+
+def test_blocks_round_trip_and_stay_small():
+    comm = MPI.COMM_WORLD
+    grid = create_grid(comm)
+    pr, pc = grid.dims
+    assert pr * pc == comm.Get_size()
+    M, K, N = padded_shape(10, 6, 10, grid.dims)
+    A = np.arange(60.0).reshape(10, 6)
+    block = scatter_blocks(A, grid, (M, K))
+    assert block.shape == (M // pr, K // pc)
+    assert (gather_blocks(block, grid, A.shape) == A).all() or comm.Get_rank() != 0
+    with pytest.raises(ValueError):
+        summa(block, np.zeros((K // pr + 1, N // pc)), grid)
+    free_grid(grid)
+
+
+def test_padded_shape():
+    assert padded_shape(10, 10, 10, (1, 1)) == (10, 10, 10)
+    assert padded_shape(5, 7, 3, (2, 4)) == (6, 8, 4)
+    assert padded_shape(5, 7, 3, (2, 3)) == (6, 12, 3)
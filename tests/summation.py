@@ -0,0 +1,65 @@
+import math
+
+import numpy as np
+import pytest
+from mpi4py import MPI
+
+from vhpc.mpi.riemann import riemann_sum_left, riemann_sum_left_pair
+from vhpc.mpi.summation import (
+    PAIR,
+    neumaier_combine,
+    neumaier_op,
+    neumaier_sum,
+    pairwise_sum,
+    resolve,
+    two_sum,
+)
+
+
+def test_two_sum_is_error_free():
+    s, e = two_sum(1.0, 1e-17)
+    assert (s, e) == (1.0, 1e-17)
+
+
+@pytest.mark.parametrize("n", [0, 1, 2, 7, 64, 1000])
+def test_pairwise_and_neumaier_match_fsum(n):
+    values = np.random.default_rng(n).standard_normal(n) * 1e6
+    exact = math.fsum(values)
+    assert resolve(neumaier_sum(values)) == exact
+    assert pairwise_sum(values) == pytest.approx(exact, rel=1e-12, abs=1e-6)
+
+
+def test_neumaier_recovers_cancelled_terms():
+    values = [1.0, 1e100, 1.0, -1e100]
+    assert sum(values) == 0.0
+    assert resolve(neumaier_sum(values)) == 2.0
+
+
+def test_combine_adds_pairs_without_losing_low_order_bits():
+    a = np.array([[1e100, 1.0], [3.0, 0.0]])
+    b = np.array([[-1e100, 1.0], [4.0, 0.5]])
+    neumaier_combine(a, b, PAIR)
+    assert [resolve(pair) for pair in b] == [2.0, 7.5]
+
+
+def test_reduce_with_neumaier_op():
+    comm = MPI.COMM_WORLD
+    local = np.array(neumaier_sum([1.0, 1e100, 1.0, -1e100]))
+    total = np.empty(2)
+    comm.Allreduce([local, PAIR], [total, PAIR], op=neumaier_op())
+    assert resolve(total) == 2.0 * comm.Get_size()
+
+
+@pytest.mark.parametrize("summation", ["naive", "pairwise", "neumaier"])
+def test_riemann_summation_modes(summation):
+    delta_x = 1.0 / 100_000
+    expected = math.fsum(np.cos(delta_x * np.arange(100_000))) * delta_x
+    result = riemann_sum_left(np.cos, 0.0, delta_x, 100_000, 64, summation)
+    assert result == pytest.approx(expected, rel=1e-13)
+    total, compensation = riemann_sum_left_pair(np.cos, 0.0, delta_x, 100_000, 64)
+    assert resolve((total, compensation)) == pytest.approx(expected, rel=1e-15)
+
+
+def test_unknown_summation_mode():
+    with pytest.raises(ValueError):
+        riemann_sum_left(np.cos, 0.0, 1.0, 10, summation="kahan")
@@ -0,0 +1,119 @@
+import os
+import shutil
+import tempfile
+
+import numpy as np
+import pytest
+from mpi4py import MPI
+
+from vhpc.mpi.distribution import block_layout
+from vhpc.mpi.transpose import (
+    LOCAL_TRANSPOSE_KERNELS,
+    itranspose,
+    local_transpose,
+    transpose,
+    transpose_file,
+    transpose_inplace,
+)
+
+
+def local_rows(A, comm):
+    counts, displs = block_layout(A.shape[0], comm)
+    rank = comm.Get_rank()
+    return A[displs[rank] : displs[rank] + counts[rank]]
+
+
+@pytest.mark.parametrize(
+    "shape", [(1, 1), (12, 12), (12, 24), (7, 5), (2, 9), (0, 3), (30, 1)]
+)
+@pytest.mark.parametrize("dtype", [np.float64, np.int32])
+def test_transpose_is_distributed_by_rows(shape, dtype):
+    comm = MPI.COMM_WORLD
+    A = np.arange(np.prod(shape), dtype=dtype).reshape(shape)
+    result = transpose(local_rows(A, comm), shape, comm)
+    assert result.dtype == A.dtype
+    assert (result == local_rows(A.T, comm)).all()
+
+
+def test_nonblocking_into_out():
+    comm = MPI.COMM_WORLD
+    A = np.random.default_rng(0).random((10, 6))
+    expected = local_rows(A.T, comm)
+    out = np.empty(expected.shape)
+    result, request = itranspose(local_rows(A, comm), A.shape, comm, out)
+    request.Wait()
+    assert result is out
+    assert (out == expected).all()
+    # transposing twice gives the rows back
+    assert (transpose(out, (6, 10), comm) == local_rows(A, comm)).all()
+
+
+def test_invalid_arguments():
+    comm = MPI.COMM_WORLD
+    A = np.zeros((comm.Get_size(), 4))
+    with pytest.raises(ValueError):
+        transpose(local_rows(A, comm), (comm.Get_size(), 5), comm)
+    with pytest.raises(ValueError):
+        transpose(local_rows(A, comm), A.shape, comm, out=np.empty((3, 3)))
+
+
+@pytest.mark.parametrize("kernel", list(LOCAL_TRANSPOSE_KERNELS))
+@pytest.mark.parametrize("shape", [(1, 1), (3, 70), (129, 64), (200, 200)])
+@pytest.mark.parametrize("dtype", [np.float32, np.int64, np.complex128])
+def test_local_kernels(kernel, shape, dtype):
+    pytest.importorskip(kernel)
+    a = np.arange(np.prod(shape)).astype(dtype).reshape(shape)
+    result = local_transpose(a, kernel=kernel)
+    assert result.dtype == a.dtype and result.flags.c_contiguous
+    assert (result == a.T).all()
+    # strided views and small tiles
+    view = a[::2, ::-3]
+    kernel_function = LOCAL_TRANSPOSE_KERNELS[kernel]
+    assert (kernel_function(view, tile=4) == view.T).all()
+
+
+@pytest.mark.parametrize("kernel", list(LOCAL_TRANSPOSE_KERNELS))
+@pytest.mark.parametrize("n,tile", [(1, 64), (7, 3), (64, 64), (130, 64), (100, 16)])
+def test_transpose_inplace(kernel, n, tile):
+    pytest.importorskip(kernel)
+    a = np.arange(n * n, dtype=np.int32).reshape(n, n)
+    expected = a.T.copy()
+    assert transpose_inplace(a, kernel, tile) is a
+    assert (a == expected).all()
+
+
+def test_local_transpose_errors():
+    a = np.zeros((3, 4))
+    with pytest.raises(ValueError):
+        transpose_inplace(a)
+    with pytest.raises(ValueError):
+        local_transpose(a, out=np.empty((3, 4)))
+    with pytest.raises(ValueError):
+        local_transpose(a, out=np.empty((4, 3), dtype=np.float32))
+    with pytest.raises(ValueError):
+        local_transpose(a, kernel="unknown")
+    square = np.zeros((4, 4))
+    with pytest.raises(ValueError):
+        local_transpose(square, out=square)
+
+
+@pytest.mark.parametrize(
+    "shape,block", [((8, 8), 4), ((7, 11), 3), ((5, 5), None), ((1, 9), 2), ((0, 4), 2)]
+)
+def test_transpose_file(shape, block):
+    comm = MPI.COMM_WORLD
+    directory = comm.bcast(tempfile.mkdtemp() if comm.Get_rank() == 0 else None)
+    source = os.path.join(directory, "A.bin")
+    destination = os.path.join(directory, "AT.bin")
+    A = np.arange(np.prod(shape), dtype=np.int32).reshape(shape)
+    if comm.Get_rank() == 0:
+        A.tofile(source)
+        # a longer file from an earlier run is truncated
+        np.ones(100, dtype=np.int32).tofile(destination)
+    comm.Barrier()
+    transpose_file(source, destination, shape, A.dtype, comm, block)
+    if comm.Get_rank() == 0:
+        AT = np.fromfile(destination, dtype=np.int32)
+        assert (AT == A.T.ravel()).all()
+        shutil.rmtree(directory)
+    comm.Barrier()